@@ -2,10 +2,7 @@ from __future__ import annotations
 
 from typing import Dict, List
 
-from faker import Faker
-
-from players.models import Player
-from players.utils import generate_player_stats
+from players.generation import PlayerSpec, bulk_create_players
 
 from .country_locales import country_locales
 
@@ -44,26 +41,6 @@ def generate_initial_players(club) -> None:
         {"position": "Center Forward", "class": 4},
     ]
 
-    country_code = getattr(club.country, "code", None) or str(club.country)
-    locale = get_locale_from_country_code(country_code)
-    fake = Faker(locale)
-
-    for info in positions:
-        while True:
-            first_name = fake.first_name_male()
-            last_name = fake.last_name_male() if hasattr(fake, "last_name_male") else fake.last_name()
-            if not Player.objects.filter(first_name=first_name, last_name=last_name).exists():
-                break
-
-        stats = generate_player_stats(info["position"], info["class"])
-
-        Player.objects.create(
-            club=club,
-            first_name=first_name,
-            last_name=last_name,
-            nationality=club.country,
-            age=17,
-            position=info["position"],
-            player_class=info["class"],
-            **stats,
-        )
+    bulk_create_players(
+        [PlayerSpec(club=club, position=info["position"], player_class=info["class"]) for info in positions]
+    )
@@ -19,6 +19,7 @@ from .models import Club
 from .forms import ClubForm
 from .services import generate_initial_players, get_locale_from_country_code
 from players.models import Player
+from players.names import NameAllocationError, create_player_with_unique_name
 from players.utils import generate_player_stats
 from players.constants import PLAYER_PRICES
 from tournaments.models import Championship, League
@@ -121,7 +122,7 @@ class ClubDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         from players.constants import PLAYER_PRICES
-        context['players'] = Player.objects.filter(club=self.object)
+        context['players'] = Player.objects.filter(club=self.object).order_by(*Player.NAME_ORDERING)
         context['player_prices'] = PLAYER_PRICES
 
         championship = Championship.objects.filter(
@@ -185,42 +186,24 @@ def create_player(request, pk):
         fake = Faker(locale)
         _trace("faker_ready", locale=locale)
 
-        attempts = 0
-        max_attempts = 100
-        while attempts < max_attempts:
-            first_name = (
-                fake.first_name_male()
-                if hasattr(fake, "first_name_male")
-                else fake.first_name()
-            )
-            last_name = (
-                fake.last_name_male()
-                if hasattr(fake, "last_name_male")
-                else fake.last_name()
-            )
-            if not Player.objects.filter(first_name=first_name, last_name=last_name).exists():
-                break
-            attempts += 1
-
-        if attempts >= max_attempts:
-            _trace("name_failed")
-            messages.error(request, "Failed to create unique name for player")
-            return redirect('clubs:club_detail', pk=pk)
-
         stats = generate_player_stats(position, player_class)
         _trace("stats_generated", sample_strength=stats.get("strength"))
 
         player_age = 17 if player_class in [1, 2, 3, 4] else random.randint(17, 35)
-        player = Player.objects.create(
-            club=club,
-            first_name=first_name,
-            last_name=last_name,
-            nationality=club.country,
-            age=player_age,
-            position=position,
-            player_class=player_class,
-            **stats
-        )
+        try:
+            player = create_player_with_unique_name(
+                fake,
+                club=club,
+                nationality=club.country,
+                age=player_age,
+                position=position,
+                player_class=player_class,
+                **stats
+            )
+        except NameAllocationError:
+            _trace("name_failed")
+            messages.error(request, "Failed to create unique name for player")
+            return redirect('clubs:club_detail', pk=pk)
         _trace("player_created", player_id=getattr(player, "id", None))
 
         if settings.OPENAI_API_KEY and getattr(settings, "OPENAI_ENABLE_AVATAR_GENERATION", True):
@@ -276,7 +259,7 @@ def get_players(request, pk):
     if not request.user.is_authenticated:
         return JsonResponse({"error": "Authentication required"}, status=401)
 
-    players = Player.objects.filter(club=club)
+    players = Player.objects.filter(club=club).order_by(*Player.NAME_ORDERING)
     data = []
     for p in players:
         avatar_url = getattr(p, "avatar_url", None)
@@ -0,0 +1,167 @@
+"""
+Keyset (cursor) pagination for the JSON list APIs.
+
+``Paginator`` runs ``COUNT(*)`` over the filtered set on every request
+and reads a page with ``OFFSET``, so deep pages get slower with their
+number.  ``keyset_page`` instead continues after the last row of the
+previous page: the ordering keys of that row are encoded in an opaque
+cursor and the next page is ``WHERE (key, id) > (last key, last id)``
+``LIMIT page_size + 1`` -- one indexed range read, whatever the depth.
+
+The ordering must end with a unique field (``id``).  Nullable keys are
+ordered ``NULLS LAST`` and handled in the range condition; non-null keys
+keep the plain ordering so their indexes can serve it.
+
+``approximate_count`` gives an optional total from the planner's row
+estimate on PostgreSQL (an exact ``COUNT(*)`` elsewhere).
+"""
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+
+
+class CursorError(ValueError):
+    """A cursor that cannot be decoded or belongs to another ordering."""
+
+
+def _key_field(model, path: str):
+    field = None
+    for part in path.split("__"):
+        field = model._meta.get_field(part)
+        model = field.related_model
+    return field
+
+
+def _parse_ordering(model, ordering: Sequence[str]) -> List[Tuple[str, bool, Any]]:
+    keys = []
+    for key in ordering:
+        descending = key.startswith("-")
+        path = key.lstrip("-")
+        keys.append((path, descending, _key_field(model, path)))
+    return keys
+
+
+def _order_by(keys) -> list:
+    expressions = []
+    for path, descending, field in keys:
+        if field.null:
+            expression = F(path).desc(nulls_last=True) if descending else F(path).asc(nulls_last=True)
+        else:
+            expression = F(path).desc() if descending else F(path).asc()
+        expressions.append(expression)
+    return expressions
+
+
+def _row_value(obj, path: str):
+    for part in path.split("__"):
+        obj = getattr(obj, part) if obj is not None else None
+    return getattr(obj, "pk", obj)
+
+
+def encode_cursor(ordering: Sequence[str], values: Sequence[Any]) -> str:
+    payload = json.dumps(
+        {"o": list(ordering), "v": [None if value is None else str(value) for value in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, ordering: Sequence[str], keys) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        raw_values = payload["v"]
+        if payload["o"] != list(ordering) or len(raw_values) != len(keys):
+            raise CursorError("Cursor does not match the ordering")
+        return [
+            None if raw is None else field.to_python(raw)
+            for raw, (_, _, field) in zip(raw_values, keys)
+        ]
+    except CursorError:
+        raise
+    except (ValueError, TypeError, KeyError, ValidationError) as exc:
+        raise CursorError("Invalid cursor") from exc
+
+
+def _after(keys, values) -> Q:
+    """Rows that come after ``values`` in the ordering of ``keys``."""
+    condition = Q()
+    equal = Q()
+    for (path, descending, field), value in zip(keys, values):
+        if value is None:
+            # NULLS LAST: only other NULL rows follow
+            step = Q(pk__in=[])
+            same = Q(**{f"{path}__isnull": True})
+        else:
+            step = Q(**{f"{path}__{'lt' if descending else 'gt'}": value})
+            if field.null:
+                step |= Q(**{f"{path}__isnull": True})
+            same = Q(**{path: value})
+        condition |= equal & step
+        equal &= same
+    return condition
+
+
+def keyset_page(
+    queryset: QuerySet, ordering: Sequence[str], page_size: int, cursor: Optional[str] = None
+) -> Tuple[list, Optional[str]]:
+    """
+    Rows of the page after ``cursor`` (the first page when ``None``) and
+    the cursor of the next page (``None`` on the last page).  Raises
+    ``CursorError`` for a malformed cursor or one made for another
+    ordering.
+    """
+    keys = _parse_ordering(queryset.model, ordering)
+    queryset = queryset.order_by(*_order_by(keys))
+    if cursor:
+        queryset = queryset.filter(_after(keys, decode_cursor(cursor, ordering, keys)))
+
+    rows = list(queryset[:page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, cursor_for(rows[-1], ordering)
+
+
+def cursor_for(obj, ordering: Sequence[str]) -> str:
+    """Cursor that continues after ``obj``."""
+    return encode_cursor(ordering, [_row_value(obj, key.lstrip("-")) for key in ordering])
+
+
+def approximate_count(queryset: QuerySet) -> int:
+    """
+    Row estimate of the PostgreSQL planner for ``queryset`` (no scan of
+    the rows); an exact count on other databases.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def keyset_payload(request, queryset: QuerySet, ordering: Sequence[str], page_size: int, serialize) -> dict:
+    """
+    Response body of a cursor-mode list request: ``results``,
+    ``next_cursor`` and ``page_size``, plus ``count`` (approximate) when
+    the request asks for ``include_total``.  Raises ``CursorError``.
+    """
+    rows, next_cursor = keyset_page(queryset, ordering, page_size, request.GET.get("cursor") or None)
+    payload = {
+        "results": [serialize(row) for row in rows],
+        "next_cursor": next_cursor,
+        "page_size": page_size,
+    }
+    if request.GET.get("include_total", "").lower() in {"1", "true", "yes"}:
+        payload["count"] = approximate_count(queryset)
+        payload["count_is_approximate"] = connections[queryset.db].vendor == "postgresql"
+    return payload
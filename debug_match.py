@@ -45,7 +45,7 @@ def debug_simulate_action():
     
     # Setup basic lineups
     def setup_lineup(club, is_home):
-        players = list(club.player_set.all()[:11])
+        players = list(club.player_set.order_by('id')[:11])
         lineup_ids = [str(p.id) for p in players]
         if is_home:
             match.home_lineup = ','.join(lineup_ids)
@@ -116,8 +116,8 @@ def create_test_match():
         home_team = Club.objects.first()
         away_team = Club.objects.exclude(id=home_team.id).first()
         
-        home_players = list(home_team.player_set.all()[:11])
-        away_players = list(away_team.player_set.all()[:11])
+        home_players = list(home_team.player_set.order_by('id')[:11])
+        away_players = list(away_team.player_set.order_by('id')[:11])
         
         if len(home_players) < 11:
             all_players = list(Player.objects.all())
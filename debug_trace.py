@@ -36,8 +36,8 @@ def debug_with_trace():
     )
     
     # Setup string lineups
-    players_home = list(home_club.player_set.all()[:11])
-    players_away = list(away_club.player_set.all()[:11])
+    players_home = list(home_club.player_set.order_by('id')[:11])
+    players_away = list(away_club.player_set.order_by('id')[:11])
     
     match.home_lineup = ','.join([str(p.id) for p in players_home])
     match.away_lineup = ','.join([str(p.id) for p in players_away])
@@ -13,6 +13,7 @@ from django.utils.dateparse import parse_datetime
 from django.views.decorators.http import require_http_methods
 
 from clubs.models import Club
+from core.pagination import CursorError, cursor_for, keyset_payload
 from matches.match_preparation import PreMatchPreparation
 from matches.engines.markov_v1 import engine_stub as simulate_one_action
 from players.models import Player
@@ -156,6 +157,9 @@ def match_list_api(request):
       - processed: true/false
       - ordering: 'datetime' | '-datetime'
       - page, page_size
+      - cursor: keyset pagination instead of pages (empty for the first
+        page, then ``next_cursor``); include_total=1 adds an approximate
+        count
     """
     qs = Match.objects.select_related(
         "home_team",
@@ -182,13 +186,20 @@ def match_list_api(request):
     ordering = request.GET.get("ordering", "-datetime")
     if ordering not in {"datetime", "-datetime"}:
         ordering = "-datetime"
-    qs = qs.order_by(ordering)
+    keys = (ordering, "id")
 
     page_number = _coerce_int(request.GET.get("page"), 1) or 1
     page_size = _coerce_int(request.GET.get("page_size"), 10) or 10
     page_size = max(1, min(page_size, 100))
 
-    paginator = Paginator(qs, page_size)
+    if "cursor" in request.GET:
+        try:
+            payload = keyset_payload(request, qs, keys, page_size, _serialize_match)
+        except CursorError as exc:
+            return JsonResponse({"detail": str(exc)}, status=400)
+        return JsonResponse(payload, json_dumps_params={"ensure_ascii": False})
+
+    paginator = Paginator(qs.order_by(*keys), page_size)
     page_obj = paginator.get_page(page_number)
 
     return JsonResponse(
@@ -198,6 +209,7 @@ def match_list_api(request):
             "total_pages": paginator.num_pages,
             "page": page_obj.number,
             "page_size": page_obj.paginator.per_page,
+            "next_cursor": cursor_for(page_obj[-1], keys) if page_obj.has_next() else None,
         },
         json_dumps_params={"ensure_ascii": False},
     )
@@ -144,6 +144,22 @@ class MatchConsumer(AsyncWebsocketConsumer):
             print(f"Error in match_update for match {self.match_id}: {e}")
             traceback.print_exc()
 
+    # Realtime broadcast timeline (matches.dispatch) messages are relayed as-is.
+    async def _relay(self, event):
+        await self.send(text_data=json.dumps({
+            'type': event['type'],
+            'data': event.get('data', {}),
+        }, cls=DjangoJSONEncoder))
+
+    async def commentary_line(self, event):
+        await self._relay(event)
+
+    async def score_update(self, event):
+        await self._relay(event)
+
+    async def possession_update(self, event):
+        await self._relay(event)
+
     # ------------------------------------------------------------------
     # ╨Ф╨Р╨Ы╨м╨и╨Х ╨Ъ╨Ю╨Ф ╨С╨Х╨Ч ╨Ш╨Ч╨Ь╨Х╨Э╨Х╨Э╨Ш╨Щ
     # ------------------------------------------------------------------
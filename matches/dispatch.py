@@ -1,5 +1,8 @@
+import itertools
 import logging
-from typing import Optional
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
 
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
@@ -10,6 +13,15 @@ from matches.models import MatchBroadcastEvent
 logger = logging.getLogger(__name__)
 
 
+def _messages_for_payload(payload: dict) -> List[dict]:
+    messages = [{"type": "commentary_line", "data": payload}]
+    if payload.get("score_update"):
+        messages.append({"type": "score_update", "data": payload["score_update"]})
+    if payload.get("possession_update"):
+        messages.append({"type": "possession_update", "data": payload["possession_update"]})
+    return messages
+
+
 class TimelineDispatcher:
     """
     Periodically polls pending broadcast events and sends them through Channels.
@@ -21,6 +33,17 @@ class TimelineDispatcher:
         if self.channel_layer is None:
             logger.warning("Channel layer is not configured; dispatcher will not send events.")
 
+    @property
+    def group_name(self) -> str:
+        return f"match_{self.match_id}"
+
+    def load_events(self, events: Iterable[MatchBroadcastEvent]) -> int:
+        """
+        Hook for dispatchers that keep the schedule in memory. The polling
+        dispatcher re-reads the database on every call, so nothing is kept.
+        """
+        return 0
+
     def dispatch_ready(self, *, now=None, batch_size: int = 20) -> int:
         """
         Send all pending events whose scheduled_at is in the past.
@@ -37,31 +60,36 @@ class TimelineDispatcher:
                 scheduled_at__lte=now,
             ).order_by("scheduled_at", "idx_in_minute")[:batch_size]
         )
+        return self._send_batch(pending, now)
 
-        if not pending:
+    def _send_batch(self, events: List[MatchBroadcastEvent], now) -> int:
+        """
+        Sends the events in order within one event-loop hop, then flips them to
+        sent with a single UPDATE.
+        """
+        if not events:
             return 0
-
-        sent_count = 0
-        for event in pending:
-            payload = event.payload_json or {}
-            commentary_message = {"type": "commentary_line", "data": payload}
-            async_to_sync(self.channel_layer.group_send)(f"match_{self.match_id}", commentary_message)
-            if payload.get("score_update"):
-                score_message = {"type": "score_update", "data": payload["score_update"]}
-                async_to_sync(self.channel_layer.group_send)(f"match_{self.match_id}", score_message)
-            if payload.get("possession_update"):
-                possession_message = {"type": "possession_update", "data": payload["possession_update"]}
-                async_to_sync(self.channel_layer.group_send)(f"match_{self.match_id}", possession_message)
-            event.mark_sent(now)
-            sent_count += 1
+        messages = []
+        for event in events:
+            messages.extend(_messages_for_payload(event.payload_json or {}))
+        async_to_sync(self._group_send_all)(messages)
+        MatchBroadcastEvent.objects.filter(
+            pk__in=[event.pk for event in events],
+            status=MatchBroadcastEvent.STATUS_PENDING,
+        ).update(status=MatchBroadcastEvent.STATUS_SENT, sent_at=now, updated_at=now)
+        for event in events:
             logger.debug(
                 "Dispatched commentary event match=%s minute=%s idx=%s payload=%s",
                 self.match_id,
                 event.game_minute,
                 event.idx_in_minute,
-                payload.get("kind"),
+                (event.payload_json or {}).get("kind"),
             )
-        return sent_count
+        return len(events)
+
+    async def _group_send_all(self, messages: List[dict]) -> None:
+        for message in messages:
+            await self.channel_layer.group_send(self.group_name, message)
 
     def has_pending(self) -> bool:
         return MatchBroadcastEvent.objects.filter(
@@ -75,3 +103,115 @@ class TimelineDispatcher:
         """
         return self.dispatch_ready(now=now)
 
+
+class TimerWheel:
+    """
+    Hashed timer wheel: items are bucketed into ``resolution``-second slots
+    keyed by their fire time, so popping due items only touches occupied
+    slots up to ``now``.
+    """
+
+    def __init__(self, resolution: float = 0.25):
+        self.resolution = resolution
+        self._slots: Dict[int, list] = defaultdict(list)
+        self._seq = itertools.count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _slot(self, when: datetime) -> int:
+        return int(when.timestamp() // self.resolution)
+
+    def add(self, when: datetime, item) -> None:
+        self._slots[self._slot(when)].append((when, next(self._seq), item))
+        self._size += 1
+
+    def next_due(self) -> Optional[datetime]:
+        if not self._slots:
+            return None
+        return min(entry[0] for entry in self._slots[min(self._slots)])
+
+    def pop_due(self, now: datetime) -> list:
+        current = self._slot(now)
+        due = []
+        for slot in sorted(s for s in self._slots if s <= current):
+            entries = self._slots.pop(slot)
+            ready = [entry for entry in entries if entry[0] <= now]
+            later = [entry for entry in entries if entry[0] > now]
+            if later:
+                self._slots[slot] = later
+            due.extend(ready)
+        self._size -= len(due)
+        due.sort(key=lambda entry: (entry[0], entry[1]))
+        return [entry[2] for entry in due]
+
+
+class WheelTimelineDispatcher(TimelineDispatcher):
+    """
+    Dispatcher that loads a minute's scheduled events once and fires them from
+    an in-memory timer wheel. The database stays the durable record: sent
+    status is written back per batch and ``resend_due`` reloads whatever is
+    still pending after a restart.
+    """
+
+    def __init__(self, match_id: int, *, channel_layer=None, resolution: float = 0.25):
+        super().__init__(match_id, channel_layer=channel_layer)
+        self.wheel = TimerWheel(resolution=resolution)
+        self._loaded_ids = set()
+
+    def load_events(self, events: Iterable[MatchBroadcastEvent]) -> int:
+        loaded = 0
+        for event in events:
+            if event.pk in self._loaded_ids or event.status != MatchBroadcastEvent.STATUS_PENDING:
+                continue
+            self.wheel.add(event.scheduled_at, event)
+            self._loaded_ids.add(event.pk)
+            loaded += 1
+        return loaded
+
+    def load_minute(self, minute: int) -> int:
+        return self.load_events(
+            MatchBroadcastEvent.objects.filter(
+                match_id=self.match_id,
+                game_minute=minute,
+                status=MatchBroadcastEvent.STATUS_PENDING,
+            )
+        )
+
+    def next_due(self) -> Optional[datetime]:
+        return self.wheel.next_due()
+
+    def dispatch_ready(self, *, now=None, batch_size: int = 20) -> int:
+        if self.channel_layer is None:
+            return 0
+        now = now or timezone.now()
+        due = self.wheel.pop_due(now)
+        sent = 0
+        step = max(batch_size, 1)
+        for start in range(0, len(due), step):
+            batch = due[start:start + step]
+            try:
+                sent += self._send_batch(batch, now)
+            except Exception:
+                # The failed batch and the ones after it go back on the wheel
+                # (their ids stay loaded), so the next pass retries them
+                for event in due[start:]:
+                    self.wheel.add(event.scheduled_at, event)
+                raise
+            self._loaded_ids.difference_update(event.pk for event in batch)
+        return sent
+
+    def has_pending(self) -> bool:
+        return len(self.wheel) > 0
+
+    def resend_due(self, *, now=None) -> int:
+        now = now or timezone.now()
+        self.load_events(
+            MatchBroadcastEvent.objects.filter(
+                match_id=self.match_id,
+                status=MatchBroadcastEvent.STATUS_PENDING,
+                scheduled_at__lte=now,
+            )
+        )
+        return self.dispatch_ready(now=now)
@@ -0,0 +1,53 @@
+"""Whole-match Markov simulation for offline runs.
+
+``simulate_markov_match`` plays a match minute by minute with
+``simulate_markov_minute`` and returns only the final numbers.  Like the
+runtime it imports nothing from Django, so it runs in process-pool
+workers without a database connection or app registry; the job and the
+result are plain dicts and pickle cheaply.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from .markov_runtime import simulate_markov_minute
+
+
+def simulate_markov_match(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Plays a full match.  ``job`` holds ``match_id``, ``seed``, ``home_name``,
+    ``away_name`` and optionally ``rosters`` (as built by
+    ``matches.roster.build_match_rosters``).
+    """
+    token = None
+    shots = fouls = possessions = 0
+    while True:
+        result = simulate_markov_minute(
+            seed=job["seed"],
+            token=token,
+            home_name=job.get("home_name", "Home"),
+            away_name=job.get("away_name", "Away"),
+            rosters=job.get("rosters"),
+        )
+        summary = result["minute_summary"]
+        counts = summary.get("counts", {})
+        shots += counts.get("shot", 0)
+        fouls += counts.get("foul", 0)
+        possessions += 1
+        token = summary["token"]
+        if summary["minute"] >= result["regulation_minutes"]:
+            break
+
+    totals = summary["score_total"]
+    return {
+        "match_id": job["match_id"],
+        "seed": job["seed"],
+        "home_score": totals["home"],
+        "away_score": totals["away"],
+        "shots": shots,
+        "fouls": fouls,
+        "possessions": possessions,
+        "minutes": summary["minute"],
+        "token": token,
+        "coefficients": summary.get("coefficients"),
+    }
@@ -0,0 +1,238 @@
+"""
+Spectator load benchmark for ``MatchConsumer``.
+
+N simulated clients connect through Channels' ``WebsocketCommunicator`` and
+receive a replay of realistic minute broadcasts: Markov minutes turned into
+timeline items (``commentary_line`` / ``score_update`` /
+``possession_update``) plus the per-minute ``match_update``.  Every message
+carries its send time, so the report gives connect latency, delivery
+latency percentiles and delivered messages per second.
+"""
+import asyncio
+import contextlib
+import copy
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.utils import timezone
+
+from matches.dispatch import _messages_for_payload
+from matches.engines.markov_runtime import simulate_markov_minute
+from matches.models import Match
+from matches.realtime_clock import get_realtime_config
+from matches.roster import get_match_rosters
+from matches.routing import websocket_urlpatterns
+from matches.timeline import build_minute_timeline
+
+IN_MEMORY_CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+BENCH_SENT_KEY = "bench_sent"
+BENCH_END_KEY = "bench_end"
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile; ``None`` for an empty sample."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass
+class SpectatorReport:
+    clients: int
+    expected_per_client: int
+    elapsed: float = 0.0
+    connect_ms: List[float] = field(default_factory=list)
+    latencies_ms: List[float] = field(default_factory=list)
+    failed_connects: int = 0
+
+    @property
+    def connected(self) -> int:
+        return len(self.connect_ms)
+
+    @property
+    def delivered(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def expected(self) -> int:
+        return self.connected * self.expected_per_client
+
+    @property
+    def lost(self) -> int:
+        return max(self.expected - self.delivered, 0)
+
+    @property
+    def msgs_per_sec(self) -> float:
+        return self.delivered / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "clients": self.clients,
+            "connected": self.connected,
+            "failed_connects": self.failed_connects,
+            "connect_p50_ms": percentile(self.connect_ms, 50),
+            "connect_p99_ms": percentile(self.connect_ms, 99),
+            "delivery_p50_ms": percentile(self.latencies_ms, 50),
+            "delivery_p99_ms": percentile(self.latencies_ms, 99),
+            "expected": self.expected,
+            "delivered": self.delivered,
+            "lost": self.lost,
+            "elapsed_s": round(self.elapsed, 3),
+            "msgs_per_sec": round(self.msgs_per_sec, 1),
+        }
+
+
+def minute_broadcasts(match: Match, minutes: int, seconds_per_minute: float) -> List[Tuple[float, dict]]:
+    """
+    ``(offset_seconds, channel message)`` pairs for ``minutes`` replayed game
+    minutes, built offline from the match's roster without touching its state.
+    """
+    config = get_realtime_config(enabled=True, seconds_per_game_minute=max(int(seconds_per_minute), 1))
+    scale = seconds_per_minute / config.seconds_per_game_minute
+    rosters = get_match_rosters(match)
+    replay = copy.copy(match)
+    token = match.markov_token
+    epoch = timezone.now()
+
+    plan: List[Tuple[float, dict]] = []
+    for index in range(minutes):
+        result = simulate_markov_minute(
+            seed=int(match.markov_seed or match.id),
+            token=token,
+            home_name=match.home_team.name,
+            away_name=match.away_team.name,
+            rosters=rosters,
+        )
+        summary = result["minute_summary"]
+        token = summary["token"]
+        replay.current_minute = summary["minute"]
+        minute_offset = index * seconds_per_minute
+        items = build_minute_timeline(
+            replay,
+            summary,
+            rosters=rosters,
+            config=config,
+            minute_start=epoch,
+            tick_seconds=result["tick_seconds"],
+        )
+        for item in items:
+            offset = minute_offset + (item.scheduled_at - epoch).total_seconds() * scale
+            for message in _messages_for_payload(item.payload):
+                plan.append((offset, message))
+        totals = summary.get("score_total", {})
+        plan.append(
+            (
+                minute_offset + seconds_per_minute,
+                {
+                    "type": "match_update",
+                    "data": {
+                        "match_id": match.id,
+                        "minute": summary["minute"],
+                        "status": "in_progress",
+                        "home_score": totals.get("home", 0),
+                        "away_score": totals.get("away", 0),
+                        "events": [],
+                    },
+                },
+            )
+        )
+    plan.sort(key=lambda entry: entry[0])
+    return plan
+
+
+async def _spectator(
+    application, path: str, report: SpectatorReport, ready, gate: asyncio.Semaphore, *, timeout: float
+) -> None:
+    communicator = WebsocketCommunicator(application, path)
+    async with gate:
+        started = time.perf_counter()
+        try:
+            connected, _ = await communicator.connect(timeout=timeout)
+            if connected:
+                # The consumer answers every connect with the full match state.
+                await communicator.receive_json_from(timeout=timeout)
+        except asyncio.TimeoutError:
+            connected = False
+    if not connected:
+        report.failed_connects += 1
+        ready()
+        await communicator.disconnect()
+        return
+    report.connect_ms.append((time.perf_counter() - started) * 1000.0)
+    ready()
+
+    try:
+        while True:
+            message = await communicator.receive_json_from(timeout=timeout)
+            data = message.get("data") or {}
+            if data.get(BENCH_END_KEY):
+                break
+            sent = data.get(BENCH_SENT_KEY)
+            if sent is not None:
+                report.latencies_ms.append((time.perf_counter() - sent) * 1000.0)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        await communicator.disconnect()
+
+
+async def run_spectator_benchmark(
+    match_id: int,
+    plan: List[Tuple[float, dict]],
+    *,
+    clients: int,
+    connect_concurrency: int = 50,
+    timeout: float = 5.0,
+) -> SpectatorReport:
+    """Connects ``clients`` spectators, replays ``plan`` to the match group and measures."""
+    application = URLRouter(websocket_urlpatterns)
+    path = f"/ws/match/{match_id}/"
+    group = f"match_{match_id}"
+    layer = get_channel_layer()
+    report = SpectatorReport(clients=clients, expected_per_client=len(plan))
+
+    all_ready = asyncio.Event()
+    pending = {"count": clients}
+    gate = asyncio.Semaphore(max(connect_concurrency, 1))
+
+    def ready():
+        pending["count"] -= 1
+        if pending["count"] <= 0:
+            all_ready.set()
+
+    tasks = [
+        asyncio.ensure_future(_spectator(application, path, report, ready, gate, timeout=timeout))
+        for _ in range(clients)
+    ]
+    if clients:
+        await all_ready.wait()
+
+    started = time.perf_counter()
+    for offset, message in plan:
+        delay = started + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        message = dict(message)
+        message["data"] = dict(message.get("data") or {}, **{BENCH_SENT_KEY: time.perf_counter()})
+        await layer.group_send(group, message)
+    await layer.group_send(group, {"type": "commentary_line", "data": {BENCH_END_KEY: True}})
+    await asyncio.gather(*tasks)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+@contextlib.contextmanager
+def quiet_stdout():
+    """MatchConsumer prints per message; keep that out of the benchmark output."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
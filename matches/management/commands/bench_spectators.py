@@ -0,0 +1,120 @@
+import json
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from matches.loadtest import (
+    IN_MEMORY_CHANNEL_LAYERS,
+    minute_broadcasts,
+    quiet_stdout,
+    run_spectator_benchmark,
+)
+from matches.models import Match
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test MatchConsumer: connect N simulated spectators to one match, replay "
+        "realistic minute broadcasts and report connect/delivery latency and msgs/sec. "
+        "With --max-p99-ms / --min-msgs-per-sec / --max-lost it exits non-zero on regression."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--match", type=int, help="Match to watch (default: latest match).")
+        parser.add_argument("--clients", type=int, default=100, help="Number of simulated spectators.")
+        parser.add_argument("--minutes", type=int, default=3, help="Game minutes to replay.")
+        parser.add_argument(
+            "--speed",
+            type=float,
+            default=2.0,
+            help="Real seconds per replayed game minute.",
+        )
+        parser.add_argument(
+            "--layer",
+            choices=("memory", "settings"),
+            default="memory",
+            help="memory: in-process channel layer; settings: CHANNEL_LAYERS from settings (e.g. local Redis).",
+        )
+        parser.add_argument("--connect-concurrency", type=int, default=50, help="Parallel connects.")
+        parser.add_argument("--timeout", type=float, default=5.0, help="Per-receive timeout in seconds.")
+        parser.add_argument("--max-p99-ms", type=float, help="Fail if delivery p99 exceeds this.")
+        parser.add_argument("--min-msgs-per-sec", type=float, help="Fail if throughput falls below this.")
+        parser.add_argument("--max-lost", type=int, help="Fail if more messages than this are lost.")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        match = self._get_match(options.get("match"))
+        clients = max(int(options["clients"]), 1)
+        speed = max(float(options["speed"]), 0.1)
+        plan = minute_broadcasts(match, max(int(options["minutes"]), 1), speed)
+
+        settings_override = (
+            override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS)
+            if options["layer"] == "memory"
+            else override_settings()
+        )
+        with settings_override, quiet_stdout():
+            report = async_to_sync(run_spectator_benchmark)(
+                match.id,
+                plan,
+                clients=clients,
+                connect_concurrency=int(options["connect_concurrency"]),
+                timeout=max(float(options["timeout"]), speed),
+            )
+
+        result = report.as_dict()
+        if options["json"]:
+            self.stdout.write(json.dumps(result))
+        else:
+            self._print_report(match, result)
+
+        failures = self._gate_failures(result, options)
+        if failures:
+            raise CommandError("Spectator benchmark regression: " + "; ".join(failures))
+
+    def _get_match(self, match_id):
+        qs = Match.objects.select_related("home_team", "away_team")
+        if match_id:
+            try:
+                return qs.get(pk=match_id)
+            except Match.DoesNotExist as exc:
+                raise CommandError(f"Match {match_id} not found") from exc
+        match = qs.order_by("-id").first()
+        if match is None:
+            raise CommandError("No matches in the database; pass --match or create one first.")
+        return match
+
+    def _print_report(self, match, result):
+        def ms(value):
+            return "-" if value is None else f"{value:.1f} ms"
+
+        self.stdout.write(f"Match #{match.id}: {match.home_team.name} vs {match.away_team.name}")
+        self.stdout.write(f"  clients:        {result['connected']}/{result['clients']} connected")
+        self.stdout.write(
+            f"  connect:        p50 {ms(result['connect_p50_ms'])}, p99 {ms(result['connect_p99_ms'])}"
+        )
+        self.stdout.write(
+            f"  delivery:       p50 {ms(result['delivery_p50_ms'])}, p99 {ms(result['delivery_p99_ms'])}"
+        )
+        self.stdout.write(
+            f"  messages:       {result['delivered']}/{result['expected']} delivered, {result['lost']} lost"
+        )
+        self.stdout.write(f"  throughput:     {result['msgs_per_sec']} msgs/sec over {result['elapsed_s']} s")
+
+    @staticmethod
+    def _gate_failures(result, options):
+        failures = []
+        if result["failed_connects"]:
+            failures.append(f"{result['failed_connects']} clients failed to connect")
+        max_p99 = options.get("max_p99_ms")
+        p99 = result["delivery_p99_ms"]
+        if max_p99 is not None and (p99 is None or p99 > max_p99):
+            failures.append(f"delivery p99 {p99} ms > {max_p99} ms")
+        min_rate = options.get("min_msgs_per_sec")
+        if min_rate is not None and result["msgs_per_sec"] < min_rate:
+            failures.append(f"{result['msgs_per_sec']} msgs/sec < {min_rate}")
+        max_lost = options.get("max_lost")
+        if max_lost is not None and result["lost"] > max_lost:
+            failures.append(f"{result['lost']} messages lost > {max_lost}")
+        return failures
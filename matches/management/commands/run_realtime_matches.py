@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from matches.dispatch import TimelineDispatcher, WheelTimelineDispatcher
+from matches.realtime_clock import get_realtime_config
+from matches.realtime_runner import RealtimeRunner
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the realtime broadcast for every live match of a shard in one event loop. "
+        "Start one process per shard (match_id % shard-count == shard-index)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--shard-index", type=int, default=0, help="Shard served by this process.")
+        parser.add_argument("--shard-count", type=int, default=1, help="Total number of runner processes.")
+        parser.add_argument(
+            "--speed",
+            type=int,
+            help="Override seconds per in-game minute (e.g. 10 for accelerated tests).",
+        )
+        parser.add_argument(
+            "--dispatch",
+            choices=("wheel", "poll"),
+            default="wheel",
+            help="wheel: fire each minute's events from memory; poll: query pending events when due.",
+        )
+        parser.add_argument(
+            "--refresh",
+            type=float,
+            default=5.0,
+            help="Seconds between scans for newly started or finished matches.",
+        )
+        parser.add_argument(
+            "--max-actions",
+            type=int,
+            default=8,
+            help="Maximum simulation actions per minute when generating timeline.",
+        )
+
+    def handle(self, *args, **options):
+        shard_index = int(options["shard_index"])
+        shard_count = int(options["shard_count"])
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise CommandError(f"Invalid shard {shard_index}/{shard_count}")
+
+        config = get_realtime_config()
+        if not config.enabled:
+            self.stdout.write(self.style.WARNING("Realtime mode disabled in settings."))
+        if options.get("speed"):
+            config = config.with_overrides(seconds_per_game_minute=int(options["speed"]))
+
+        runner = RealtimeRunner(
+            config,
+            shard_index=shard_index,
+            shard_count=shard_count,
+            max_actions=max(1, int(options["max_actions"])),
+            refresh_interval=max(0.5, float(options["refresh"])),
+            dispatcher_factory=(
+                WheelTimelineDispatcher if options["dispatch"] == "wheel" else TimelineDispatcher
+            ),
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Starting realtime runner shard {shard_index}/{shard_count} "
+                f"(seconds_per_minute={config.seconds_per_game_minute})"
+            )
+        )
+        asyncio.run(self._run(runner))
+
+    async def _run(self, runner: RealtimeRunner):
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except (NotImplementedError, RuntimeError):  # pragma: no cover - Windows
+                pass
+        await runner.run(stop_event)
+        logger.info("Realtime runner shard %s/%s stopped", runner.shard_index, runner.shard_count)
@@ -0,0 +1,207 @@
+"""
+Applies one Markov engine minute to a locked match.
+
+Shared by the ``simulate_active_matches`` Celery task and the realtime
+broadcast timeline so both advance the same engine state and write the same
+``MatchEvent`` rows.  Player names and ids come from the cached roster
+snapshot; no player rows are read per minute.
+"""
+import logging
+from typing import List, Optional, Tuple
+
+from django.utils import timezone
+
+from matches.engines.markov_runtime import MarkovMinuteResult, simulate_markov_minute
+from matches.models import Match, MatchEvent
+from matches.roster import Rosters, get_match_rosters, roster_names
+
+logger = logging.getLogger(__name__)
+
+
+ZONE_HINT_TO_FIELD = {
+    "DEF": "DEF-C",
+    "MID": "MID-C",
+    "FINAL": "AM-C",
+}
+ZONE_TEXT = {
+    "DEF": "the defensive third",
+    "MID": "midfield",
+    "FINAL": "the final third",
+}
+
+
+def map_zone_from_markov(zone_hint: Optional[str], fallback: str) -> str:
+    if not zone_hint:
+        return fallback or "MID-C"
+    return ZONE_HINT_TO_FIELD.get(zone_hint.upper(), fallback or "MID-C")
+
+
+def possession_indicator_from_markov(possession: Optional[str]) -> int:
+    if possession == "home":
+        return 1
+    if possession == "away":
+        return 2
+    return 0
+
+
+def team_display(match: Match, side: Optional[str]) -> str:
+    if side == "home":
+        return match.home_team.name
+    if side == "away":
+        return match.away_team.name
+    return "Unknown team"
+
+
+def zone_text(zone: Optional[str]) -> str:
+    if not zone:
+        return "midfield"
+    return ZONE_TEXT.get(zone.upper(), zone.lower())
+
+
+def map_markov_event_to_match_event(
+    match: Match,
+    raw_event: dict,
+    known_player_ids=None,
+) -> Optional[dict]:
+    label = (raw_event.get("label") or "").upper()
+    frm = (raw_event.get("from") or "").upper()
+    turnover = bool(raw_event.get("turnover"))
+    zone_label = zone_text(raw_event.get("zone"))
+
+    # If an individual player (actor) is part of the event, we use them
+    raw_actor_name = raw_event.get("actor_name")
+    raw_actor_id = raw_event.get("actor_id")
+
+    # Fallback to team name if no player
+    team_actor = team_display(match, raw_event.get("prev_possession") or raw_event.get("possession"))
+    actor_display = raw_actor_name if raw_actor_name else team_actor
+
+    result = {}
+    if raw_actor_id and (known_player_ids is None or raw_actor_id in known_player_ids):
+        result["player_id"] = raw_actor_id
+
+    if label == "SHOT:GOAL":
+        if raw_actor_name:
+            description = f"Goal! {raw_actor_name} scores for {team_actor} from {zone_label}!"
+        else:
+            description = f"Goal! {team_actor} score from {zone_label}."
+        result.update({"event_type": "goal", "description": description})
+        return result
+
+    if label in {"SHOT:MISS", "SHOT:BLOCK"}:
+        description = f"{actor_display} takes a shot from {zone_label} but misses the target."
+        result.update({"event_type": "shot_miss", "description": description})
+        return result
+
+    if frm == "FOUL":
+        description = f"Foul by {actor_display} in {zone_label}."
+        result.update({"event_type": "foul", "description": description})
+        return result
+
+    if turnover:
+        winner_side = raw_event.get("possession")
+        winner_team = team_display(match, winner_side)
+        description = f"Turnover! {winner_team} gain possession in {zone_label}."
+        result.update({"event_type": "interception", "description": description})
+        return result
+
+    # Generic open-play labels for observability (PASS/RETAIN/RECYCLE)
+    if label.startswith("PASS:") or label in {"RETAIN", "RECYCLE", "TURNOVER"}:
+        verb = "recycle possession" if label in {"RETAIN", "RECYCLE"} else "move the ball"
+        description = f"{actor_display} {verb} in {zone_label}."
+        result.update({"event_type": "info", "description": description})
+        return result
+    return None
+
+
+def play_markov_minute(
+    match: Match,
+    *,
+    rosters: Optional[Rosters] = None,
+) -> Tuple[MarkovMinuteResult, List[MatchEvent]]:
+    """
+    Simulates the next Markov minute of ``match`` (locked by the caller),
+    saves the new engine state and score, and stores the minute's events.
+    Returns the engine result and the created events.
+    """
+    if rosters is None:
+        rosters = get_match_rosters(match)
+    known_player_ids = set(roster_names(rosters))
+
+    seed_value = int(match.markov_seed or match.id)
+    result = simulate_markov_minute(
+        seed=seed_value,
+        token=match.markov_token,
+        home_name=match.home_team.name,
+        away_name=match.away_team.name,
+        rosters=rosters,
+    )
+    minute_summary = result["minute_summary"]
+    counts = minute_summary.get("counts", {})
+    totals = minute_summary.get("score_total", {})
+
+    pass_events = 0
+
+    match.markov_seed = seed_value
+    match.markov_token = minute_summary.get("token")
+    match.markov_coefficients = minute_summary.get("coefficients")
+    match.markov_last_summary = minute_summary
+    match.home_score = totals.get("home", match.home_score)
+    match.away_score = totals.get("away", match.away_score)
+    match.st_shoots += counts.get("shot", 0)
+    match.st_fouls += counts.get("foul", 0)
+    match.st_possessions += 1
+    match.possession_indicator = possession_indicator_from_markov(
+        minute_summary.get("possession_end")
+    )
+    match.current_zone = map_zone_from_markov(
+        minute_summary.get("zone_end"),
+        match.current_zone,
+    )
+    match.last_minute_update = timezone.now()
+
+    reg_minutes = result.get("regulation_minutes", 90)
+    minute_number = minute_summary.get("minute", match.current_minute)
+    match.waiting_for_next_minute = True
+    if minute_number >= reg_minutes:
+        match.status = 'finished'
+        match.waiting_for_next_minute = False
+        match.current_minute = reg_minutes
+
+    events: List[MatchEvent] = []
+
+    # 1. Global narrative (e.g. Kick-off)
+    for line in minute_summary.get("pure_narrative") or []:
+        events.append(
+            MatchEvent(match=match, minute=minute_number, event_type="info", description=line)
+        )
+
+    # 2. Tick events (one per tick max)
+    for raw_event in minute_summary.get("events") or []:
+        mapped = map_markov_event_to_match_event(match, raw_event, known_player_ids)
+        if mapped:
+            events.append(
+                MatchEvent(
+                    match=match,
+                    minute=minute_number,
+                    event_type=mapped.get("event_type", "info"),
+                    description=mapped.get("description", ""),
+                    player_id=mapped.get("player_id"),
+                )
+            )
+            if mapped.get("stat") == "pass":
+                pass_events += 1
+        elif raw_event.get("narrative"):
+            events.append(
+                MatchEvent(
+                    match=match,
+                    minute=minute_number,
+                    event_type="info",
+                    description=raw_event["narrative"],
+                )
+            )
+
+    match.st_passes += pass_events
+    match.save()
+    created = MatchEvent.objects.bulk_create(events) if events else []
+    return result, created
@@ -122,9 +122,10 @@ class PreMatchPreparation:
 
     def auto_select_lineup(self, team: Club) -> dict:
         """
-        Автоматически формирует состав команды (4-4-2).
+        Автоматически формирует состав команды (4-4-2)
+        из лучших по рейтингу игроков каждой линии.
         """
-        players = team.player_set.all()
+        players = team.player_set.order_by('-overall_rating', 'id')
         lineup = {}
 
         # Сначала вратарь
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-19 10:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0016_match_markov_state_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchBroadcastEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_minute', models.PositiveIntegerField(db_index=True)),
+                ('idx_in_minute', models.PositiveIntegerField()),
+                ('payload_json', models.JSONField()),
+                ('scheduled_at', models.DateTimeField(db_index=True)),
+                ('sent_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('skipped', 'Skipped')], db_index=True, default='pending', max_length=8)),
+                ('idempotency_key', models.CharField(max_length=64, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcast_events', to='matches.match')),
+            ],
+            options={
+                'ordering': ('match', 'game_minute', 'idx_in_minute'),
+                'indexes': [models.Index(fields=['match', 'game_minute', 'status'], name='matches_mat_match_i_348213_idx'), models.Index(fields=['match', 'scheduled_at'], name='matches_mat_match_s_348214_idx')],
+                'unique_together': {('match', 'game_minute', 'idx_in_minute')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0017_matchbroadcastevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('status', 'scheduled')), fields=['datetime'], name='match_scheduled_due_idx'),
+        ),
+    ]
@@ -149,6 +149,14 @@ class Match(models.Model):
         verbose_name = "Match"
         verbose_name_plural = "Matches"
         ordering = ['-datetime'] # ╨б╨╛╤А╤В╨╕╤А╨╛╨▓╨║╨░ ╨┐╨╛ ╨┤╨░╤В╨╡ ╨┐╨╛ ╤Г╨╝╨╛╨╗╤З╨░╨╜╨╕╤О
+        indexes = [
+            # Due kickoffs: status='scheduled' AND datetime <= now (start_scheduled_matches)
+            models.Index(
+                fields=['datetime'],
+                condition=models.Q(status='scheduled'),
+                name='match_scheduled_due_idx',
+            ),
+        ]
 
 
 class MatchEvent(models.Model):
@@ -211,6 +219,52 @@ class MatchEvent(models.Model):
         ]
 
 
+class MatchBroadcastEvent(models.Model):
+    """
+    Scheduled micro-event of the realtime broadcast timeline for one game minute.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_SKIPPED = 'skipped'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_SKIPPED, 'Skipped'),
+    ]
+
+    match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name='broadcast_events')
+    game_minute = models.PositiveIntegerField(db_index=True)
+    idx_in_minute = models.PositiveIntegerField()
+    payload_json = models.JSONField()
+    scheduled_at = models.DateTimeField(db_index=True)
+    sent_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    status = models.CharField(
+        max_length=8,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        db_index=True,
+    )
+    idempotency_key = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ('match', 'game_minute', 'idx_in_minute')
+        unique_together = ('match', 'game_minute', 'idx_in_minute')
+        indexes = [
+            models.Index(fields=['match', 'game_minute', 'status'], name='matches_mat_match_i_348213_idx'),
+            models.Index(fields=['match', 'scheduled_at'], name='matches_mat_match_s_348214_idx'),
+        ]
+
+    def __str__(self):
+        return f"M{self.match_id}-Min{self.game_minute}#{self.idx_in_minute} ({self.status})"
+
+    def mark_sent(self, when=None):
+        self.status = self.STATUS_SENT
+        self.sent_at = when or timezone.now()
+        self.save(update_fields=['status', 'sent_at', 'updated_at'])
+
+
 class PlayerRivalry(models.Model):
     """
     ╨Ь╨╛╨┤╨╡╨╗╤М ╨┤╨╗╤П ╨╛╤В╤Б╨╗╨╡╨╢╨╕╨▓╨░╨╜╨╕╤П ╤Б╨╛╨┐╨╡╤А╨╜╨╕╤З╨╡╤Б╤В╨▓╨░ ╨╝╨╡╨╢╨┤╤Г ╨╕╨│╤А╨╛╨║╨░╨╝╨╕
@@ -13,6 +13,8 @@ from django.conf import settings
 import logging
 import random
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -1171,3 +1173,181 @@ class PersonalityDecisionEngine:
         except Exception as e:
             logger.warning(f"Error getting influencing trait for player {player.id}: {e}")
             return (None, None)
+
+
+# --- Precomputed modifier vectors ---------------------------------------------
+#
+# PersonalityModifier re-reads settings, the traits dict and renormalises traits
+# on every call.  For a match the traits are fixed at kickoff, so every output
+# of get_foul/pass/shot/decision_modifier and get_morale_influence is computed
+# once per player for each discrete context variant and stored as a flat
+# vector in the roster snapshot (see matches.roster).  RosterPersonality reads
+# those vectors per tick; values are identical to PersonalityModifier's.
+
+PERSONALITY_TRAITS = (
+    'aggression', 'confidence', 'risk_taking', 'patience', 'teamwork',
+    'leadership', 'ambition', 'charisma', 'endurance',
+)
+PERSONALITY_SLOTS = (
+    'foul',
+    'pass_accuracy',
+    'pass_preference_short',
+    'pass_preference_long',
+    'pass_preference_through',
+    'pass_risk',
+    'shot_accuracy',
+    'shot_accuracy_late',
+    'shot_accuracy_penalty',
+    'shot_accuracy_penalty_late',
+    'shot_frequency',
+    'shot_frequency_long',
+    'shot_power_late',
+    'decision_pass',
+    'decision_shoot',
+    'decision_dribble',
+    'decision_tackle',
+    'morale_self',
+    'morale_team',
+)
+SLOT = {name: idx for idx, name in enumerate(PERSONALITY_SLOTS)}
+# Shots after this minute get the endurance bonus
+LATE_GAME_MINUTE = 75
+MODIFIER_CAP = 0.25
+MORALE_CAP = 0.15
+
+
+def _trait_arrays(traits_list):
+    """
+    (normalised, present) arrays of shape (players x PERSONALITY_TRAITS).
+    ``present`` mirrors the ``if trait:`` checks of PersonalityModifier.
+    """
+    raw = np.zeros((len(traits_list), len(PERSONALITY_TRAITS)))
+    known = np.zeros(raw.shape, dtype=bool)
+    for row, traits in enumerate(traits_list):
+        if not isinstance(traits, dict):
+            continue
+        for col, name in enumerate(PERSONALITY_TRAITS):
+            value = traits.get(name)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                raw[row, col] = value
+                known[row, col] = True
+    normalised = np.where(known, np.clip((raw - 10.5) / 38.0, -MODIFIER_CAP, MODIFIER_CAP), 0.0)
+    return normalised, known & (raw != 0)
+
+
+def personality_modifier_vectors(traits_list) -> np.ndarray:
+    """
+    Modifier vectors (players x PERSONALITY_SLOTS) for a list of
+    ``personality_traits`` dicts, independent of USE_PERSONALITY_ENGINE.
+    """
+    influences = PersonalityModifier.TRAIT_INFLUENCES
+    normalised, present = _trait_arrays(traits_list)
+    n = {name: normalised[:, col] for col, name in enumerate(PERSONALITY_TRAITS)}
+    p = {name: np.where(present[:, col], normalised[:, col], 0.0) for col, name in enumerate(PERSONALITY_TRAITS)}
+
+    def cap(values, limit=MODIFIER_CAP):
+        return np.clip(values, -limit, limit)
+
+    team_pref = p['teamwork'] * influences['teamwork']['pass_preference']
+    shot_acc = p['confidence'] * influences['confidence']['shot_accuracy']
+    penalty_acc = shot_acc + p['confidence'] * influences['confidence']['penalties']
+    late_bonus = p['endurance'] * influences['endurance']['late_game_performance']
+    shot_freq = p['ambition'] * influences['ambition']['shot_attempts']
+
+    vectors = np.zeros((len(traits_list), len(PERSONALITY_SLOTS)))
+    columns = {
+        'foul': cap(n['aggression'] * influences['aggression']['fouls']
+                    + n['patience'] * influences['patience']['foul_reduction']),
+        'pass_accuracy': cap(p['patience'] * influences['patience']['pass_accuracy']),
+        'pass_preference_short': cap(team_pref),
+        'pass_preference_long': cap(team_pref + p['risk_taking'] * influences['risk_taking']['long_passes']),
+        'pass_preference_through': cap(team_pref + p['risk_taking'] * influences['risk_taking']['through_balls']),
+        'pass_risk': cap(p['risk_taking']),
+        'shot_accuracy': cap(shot_acc),
+        'shot_accuracy_late': cap(shot_acc + late_bonus),
+        'shot_accuracy_penalty': cap(penalty_acc),
+        'shot_accuracy_penalty_late': cap(penalty_acc + late_bonus),
+        'shot_frequency': cap(shot_freq),
+        'shot_frequency_long': cap(shot_freq + p['risk_taking'] * influences['risk_taking']['long_shots']),
+        'shot_power_late': cap(late_bonus * 0.5),
+        'decision_pass': cap(team_pref + p['patience'] * 0.08),
+        'decision_shoot': cap(shot_freq + p['confidence'] * 0.06),
+        'decision_dribble': cap(p['risk_taking'] * influences['risk_taking']['solo_runs']
+                                + p['confidence'] * influences['confidence']['dribbling']),
+        'decision_tackle': cap(p['aggression'] * influences['aggression']['tackles']),
+        'morale_self': cap(p['confidence'] * 0.08, MORALE_CAP),
+        'morale_team': cap(p['leadership'] * influences['leadership']['team_morale']
+                           + p['charisma'] * 0.03, MORALE_CAP),
+    }
+    for name, values in columns.items():
+        vectors[:, SLOT[name]] = values
+    return vectors
+
+
+def personality_modifier_vector(traits) -> list:
+    return personality_modifier_vectors([traits])[0].tolist()
+
+
+class RosterPersonality:
+    """
+    Fast path of PersonalityModifier for roster entries: reads the vector
+    stored under ``entry["personality"]`` at kickoff.  Entries without one
+    (engine disabled at kickoff) get neutral modifiers.
+    """
+
+    @staticmethod
+    def _vector(entry):
+        return entry.get('personality') if entry else None
+
+    @staticmethod
+    def get_foul_modifier(entry):
+        vector = RosterPersonality._vector(entry)
+        return vector[SLOT['foul']] if vector else 0.0
+
+    @staticmethod
+    def get_pass_modifier(entry, context=None):
+        vector = RosterPersonality._vector(entry)
+        if not vector:
+            return {'accuracy': 0.0, 'preference': 0.0, 'risk': 0.0}
+        pass_type = (context or {}).get('pass_type', 'short')
+        if pass_type == 'long':
+            preference = vector[SLOT['pass_preference_long']]
+        elif pass_type == 'through':
+            preference = vector[SLOT['pass_preference_through']]
+        else:
+            preference = vector[SLOT['pass_preference_short']]
+        return {
+            'accuracy': vector[SLOT['pass_accuracy']],
+            'preference': preference,
+            'risk': vector[SLOT['pass_risk']],
+        }
+
+    @staticmethod
+    def get_shot_modifier(entry, context=None):
+        vector = RosterPersonality._vector(entry)
+        if not vector:
+            return {'accuracy': 0.0, 'frequency': 0.0, 'power': 0.0}
+        context = context or {}
+        shot_type = context.get('shot_type', 'close')
+        late = context.get('match_minute', 45) > LATE_GAME_MINUTE
+        accuracy = 'shot_accuracy_penalty' if shot_type == 'penalty' else 'shot_accuracy'
+        return {
+            'accuracy': vector[SLOT[accuracy + '_late' if late else accuracy]],
+            'frequency': vector[SLOT['shot_frequency_long' if shot_type == 'long' else 'shot_frequency']],
+            'power': vector[SLOT['shot_power_late']] if late else 0.0,
+        }
+
+    @staticmethod
+    def get_decision_modifier(entry, action_type, context=None):
+        vector = RosterPersonality._vector(entry)
+        slot = SLOT.get(f'decision_{action_type}')
+        if not vector or slot is None:
+            return 0.0
+        return vector[slot]
+
+    @staticmethod
+    def get_morale_influence(entry, team_performance=None):
+        vector = RosterPersonality._vector(entry)
+        if not vector:
+            return {'self_morale': 0.0, 'team_morale': 0.0}
+        return {'self_morale': vector[SLOT['morale_self']], 'team_morale': vector[SLOT['morale_team']]}
@@ -0,0 +1,307 @@
+"""
+Multi-match realtime broadcast runner.
+
+A single asyncio event loop owns every live match of a shard.  Each match keeps
+one wake-up time in a heap: the next pending broadcast item or the end of its
+current game minute, whichever comes first.  The database is only touched when
+something is due for a match; idle matches cost nothing between wake-ups.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models.functions import Mod
+from django.utils import timezone
+
+from matches.dispatch import TimelineDispatcher, WheelTimelineDispatcher
+from matches.models import Match, MatchBroadcastEvent
+from matches.realtime_clock import MatchClock, RealtimeConfig
+from matches.timeline import build_and_store_minute_timeline
+from matches.utils import advance_match_minute
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("in_progress", "paused")
+
+
+@dataclass
+class MinuteState:
+    """What the runner knows about the current broadcast minute of one match."""
+
+    match_id: int
+    active: bool
+    minute: int = 0
+    deadline: Optional[datetime] = None
+    pending_at: List[datetime] = field(default_factory=list)
+    pending_events: List[MatchBroadcastEvent] = field(default_factory=list, repr=False)
+    advanced: bool = False
+
+    @property
+    def opened(self) -> bool:
+        return self.deadline is not None
+
+    def next_wake(self) -> Optional[datetime]:
+        candidates = [t for t in (self.pending_at[:1] + [self.deadline]) if t is not None]
+        return min(candidates) if candidates else None
+
+
+def open_minute(
+    match_id: int,
+    config: RealtimeConfig,
+    *,
+    max_actions: int = 8,
+    now=None,
+) -> MinuteState:
+    """
+    Make sure the current minute of a match has a broadcast timeline.
+    Builds it when missing and returns the minute deadline plus pending send times.
+    """
+    now = now or timezone.now()
+    minute_to_build: Optional[int] = None
+
+    with transaction.atomic():
+        match = Match.objects.select_for_update().get(pk=match_id)
+        if match.status not in ACTIVE_STATUSES:
+            logger.info("Match %s not in active state (%s).", match_id, match.status)
+            return MinuteState(match_id=match_id, active=False, minute=match.current_minute)
+
+        clock = MatchClock(match, config=config)
+        minute_start = clock.ensure_started(now)
+        current_minute = match.current_minute
+        timeline_exists = MatchBroadcastEvent.objects.filter(
+            match=match,
+            game_minute=current_minute,
+        ).exists()
+
+        if not timeline_exists and match.realtime_last_broadcast_minute < current_minute:
+            # Mark timeline as building to prevent parallel tasks.
+            match.minute_building = True
+            match.waiting_for_next_minute = True
+            match.realtime_started_at = minute_start
+            match.save(
+                update_fields=["minute_building", "waiting_for_next_minute", "realtime_started_at"]
+            )
+            minute_to_build = current_minute
+
+    if minute_to_build is not None:
+        logger.debug("Building timeline for match %s minute %s", match_id, minute_to_build)
+        build_and_store_minute_timeline(
+            match_id,
+            config=config,
+            minute_start=minute_start,
+            max_actions=max_actions,
+        )
+
+    pending_events = list(
+        MatchBroadcastEvent.objects.filter(
+            match_id=match_id,
+            game_minute=current_minute,
+            status=MatchBroadcastEvent.STATUS_PENDING,
+        ).order_by("scheduled_at", "idx_in_minute")
+    )
+    return MinuteState(
+        match_id=match_id,
+        active=True,
+        minute=current_minute,
+        deadline=minute_start + timedelta(seconds=config.seconds_per_game_minute),
+        pending_at=[event.scheduled_at for event in pending_events],
+        pending_events=pending_events,
+    )
+
+
+def close_minute(match_id: int, config: RealtimeConfig, *, now=None) -> MinuteState:
+    """
+    Advance the match clock once the minute deadline has passed and every
+    broadcast item of the minute has been sent.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        match = Match.objects.select_for_update().get(pk=match_id)
+        current_minute = match.current_minute
+        clock = MatchClock(match, config=config)
+        deadline = clock.deadline()
+        pending_exists = MatchBroadcastEvent.objects.filter(
+            match=match,
+            game_minute=current_minute,
+            status=MatchBroadcastEvent.STATUS_PENDING,
+        ).exists()
+
+        advanced = False
+        if deadline and now >= deadline and not pending_exists:
+            logger.debug("Advancing match %s from minute %s", match_id, current_minute)
+            advance_match_minute(match, to_minute=current_minute + 1)
+            clock.advance_minute_anchor(now)
+            match.waiting_for_next_minute = False
+            match.save(update_fields=["realtime_started_at", "waiting_for_next_minute"])
+            advanced = True
+
+        return MinuteState(
+            match_id=match_id,
+            active=match.status in ACTIVE_STATUSES,
+            minute=match.current_minute,
+            deadline=clock.deadline(),
+            advanced=advanced,
+        )
+
+
+class RealtimeRunner:
+    """
+    Drives the realtime broadcast of every active match in one shard.
+
+    Matches are assigned to shards by ``match_id % shard_count``, so several
+    runner processes can split the live matches without coordination.
+    """
+
+    def __init__(
+        self,
+        config: RealtimeConfig,
+        *,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        max_actions: int = 8,
+        refresh_interval: float = 5.0,
+        error_backoff: float = 2.0,
+        min_wake_interval: float = 0.05,
+        dispatcher_factory=WheelTimelineDispatcher,
+    ):
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError(f"Invalid shard {shard_index}/{shard_count}")
+        self.config = config
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.max_actions = max_actions
+        self.refresh_interval = refresh_interval
+        self.error_backoff = timedelta(seconds=error_backoff)
+        self.min_wake_interval = timedelta(seconds=min_wake_interval)
+        self.dispatcher_factory = dispatcher_factory
+
+        self.states: Dict[int, MinuteState] = {}
+        self._dispatchers: Dict[int, TimelineDispatcher] = {}
+        self._heap: List[tuple] = []
+        self._wake_at: Dict[int, datetime] = {}
+        self._counter = itertools.count()
+        self._next_refresh: Optional[datetime] = None
+
+    # --- shard membership ---------------------------------------------
+
+    def owns(self, match_id: int) -> bool:
+        return match_id % self.shard_count == self.shard_index
+
+    def active_match_ids(self) -> List[int]:
+        qs = Match.objects.filter(status__in=ACTIVE_STATUSES)
+        if self.shard_count > 1:
+            qs = qs.annotate(shard=Mod("id", self.shard_count)).filter(shard=self.shard_index)
+        return list(qs.order_by().values_list("id", flat=True))
+
+    def refresh(self, now: datetime) -> None:
+        """Pick up newly started matches of this shard and drop finished ones."""
+        active_ids = set(self.active_match_ids())
+        for match_id in set(self.states) - active_ids:
+            self.forget(match_id)
+        for match_id in active_ids - set(self.states):
+            logger.info("Runner shard %s/%s took match %s", self.shard_index, self.shard_count, match_id)
+            self.states[match_id] = MinuteState(match_id=match_id, active=True)
+            self._schedule(match_id, now)
+        self._next_refresh = now + timedelta(seconds=self.refresh_interval)
+
+    def forget(self, match_id: int) -> None:
+        self.states.pop(match_id, None)
+        self._dispatchers.pop(match_id, None)
+        self._wake_at.pop(match_id, None)
+
+    # --- heap ------------------------------------------------------------
+
+    def _schedule(self, match_id: int, wake_at: datetime) -> None:
+        self._wake_at[match_id] = wake_at
+        heapq.heappush(self._heap, (wake_at, next(self._counter), match_id))
+
+    def _pop_due(self, now: datetime) -> List[int]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            wake_at, _, match_id = heapq.heappop(self._heap)
+            # Entries superseded by a later reschedule are skipped lazily.
+            if self._wake_at.get(match_id) != wake_at:
+                continue
+            del self._wake_at[match_id]
+            due.append(match_id)
+        return due
+
+    def seconds_until_next(self, now: datetime) -> float:
+        targets = [self._next_refresh] if self._next_refresh else []
+        if self._heap:
+            targets.append(self._heap[0][0])
+        if not targets:
+            return self.refresh_interval
+        delay = (min(targets) - now).total_seconds()
+        return min(max(delay, 0.0), self.refresh_interval)
+
+    # --- per-match work ------------------------------------------------------
+
+    def _dispatcher(self, match_id: int) -> TimelineDispatcher:
+        dispatcher = self._dispatchers.get(match_id)
+        if dispatcher is None:
+            dispatcher = self._dispatchers[match_id] = self.dispatcher_factory(match_id)
+        return dispatcher
+
+    def _open(self, match_id: int, now: datetime) -> MinuteState:
+        state = open_minute(match_id, self.config, max_actions=self.max_actions, now=now)
+        if state.active:
+            # In-memory dispatchers take the schedule here instead of polling for it.
+            self._dispatcher(match_id).load_events(state.pending_events)
+        return state
+
+    def service(self, match_id: int, now: datetime) -> MinuteState:
+        """Run whatever is due for one match and return its refreshed state."""
+        state = self.states[match_id]
+        if not state.opened:
+            return self._open(match_id, now)
+
+        if state.pending_at and state.pending_at[0] <= now:
+            self._dispatcher(match_id).dispatch_ready(now=now, batch_size=len(state.pending_at))
+            state.pending_at = [ts for ts in state.pending_at if ts > now]
+
+        if not state.pending_at and now >= state.deadline:
+            closed = close_minute(match_id, self.config, now=now)
+            if not closed.active:
+                return closed
+            # Either the next minute starts now or items are still pending in
+            # the database; reopening reloads both.
+            return self._open(match_id, now)
+        return state
+
+    def tick(self, now: Optional[datetime] = None) -> int:
+        """Service every match whose wake-up time has come. Returns how many ran."""
+        now = now or timezone.now()
+        if self._next_refresh is None or now >= self._next_refresh:
+            self.refresh(now)
+
+        serviced = 0
+        for match_id in self._pop_due(now):
+            if match_id not in self.states:
+                continue
+            try:
+                state = self.service(match_id, now)
+            except Exception:
+                logger.exception("Realtime step failed for match %s", match_id)
+                self._schedule(match_id, now + self.error_backoff)
+                continue
+            serviced += 1
+            if not state.active:
+                logger.info("Match %s left the realtime runner (minute %s)", match_id, state.minute)
+                self.forget(match_id)
+                continue
+            self.states[match_id] = state
+            wake_at = state.next_wake() or now + self.error_backoff
+            self._schedule(match_id, max(wake_at, now + self.min_wake_interval))
+        return serviced
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        while stop_event is None or not stop_event.is_set():
+            await sync_to_async(self.tick)()
+            await asyncio.sleep(self.seconds_until_next(timezone.now()))
@@ -0,0 +1,228 @@
+"""
+Roster snapshots for the Markov engine.
+
+Lineups are fixed once a match kicks off, so the per-side roster
+(``{"home": {"GK": [...], "DEF": [...], ...}, "away": {...}}``) is built with
+a single player query and cached for the rest of the match.  The cache key
+includes a fingerprint of both lineups, so a changed lineup simply misses.
+"""
+import hashlib
+import json
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from django.core.cache import cache
+
+from matches.personality_engine import PersonalityModifier, personality_modifier_vectors
+from matches.utils import extract_player_id
+from players.attribute_matrix import LINES
+from players.models import Player, get_player_line
+
+logger = logging.getLogger(__name__)
+
+ROSTER_CACHE_TIMEOUT = 3 * 60 * 60
+
+# Minimal stat set we pass to the runtime so ticks can use real attributes.
+# Neutral defaults stay in engine; adding keys here is backward safe.
+ROSTER_STAT_FIELDS = [
+    # Core
+    "overall_rating",
+    "pace",
+    "stamina",
+    "morale",
+    # Build-up and passing
+    "passing",
+    "vision",
+    "dribbling",
+    "work_rate",
+    "flair",
+    # Final third / finishing
+    "finishing",
+    "long_range",
+    "accuracy",
+    "heading",
+    # Defense / press
+    "tackling",
+    "marking",
+    "positioning",
+    "strength",
+    # Keeper
+    "reflexes",
+    "handling",
+    "aerial",
+    "command",
+    "distribution",
+    "one_on_one",
+    "rebound_control",
+    "shot_reading",
+    # Crossing/width
+    "crossing",
+    # Optional/soft fields (may be None -> neutral defaults in engine)
+    "ball_control",
+    "balance",
+    "aggression",
+]
+
+# Fields that actually exist on Player and are needed to avoid extra DB hits.
+ROSTER_FETCH_FIELDS = [
+    "id",
+    "last_name",
+    "position",
+    "experience",
+    "overall_rating",
+    "strength",
+    "stamina",
+    "pace",
+    "positioning",
+    "reflexes",
+    "handling",
+    "aerial",
+    "command",
+    "distribution",
+    "one_on_one",
+    "rebound_control",
+    "shot_reading",
+    "marking",
+    "tackling",
+    "work_rate",
+    "passing",
+    "crossing",
+    "dribbling",
+    "flair",
+    "heading",
+    "finishing",
+    "long_range",
+    "vision",
+    "accuracy",
+    "morale",
+    "personality_traits",
+]
+
+SIDES = ("home", "away")
+
+Rosters = Dict[str, Dict[str, List[dict]]]
+
+
+def lineup_player_ids(lineup) -> List[int]:
+    """Player ids of a lineup dict (``{'1': {'playerId': ...}}`` or ``{'1': 101}``)."""
+    if not isinstance(lineup, dict):
+        return []
+    ids = []
+    for slot_value in lineup.values():
+        pid = extract_player_id(slot_value)
+        if pid and str(pid).isdigit():
+            ids.append(int(pid))
+    return ids
+
+
+def _lineup_fingerprint(match) -> str:
+    raw = json.dumps([match.home_lineup, match.away_lineup], sort_keys=True, default=str)
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def roster_cache_key(match) -> str:
+    return f"match_roster:{match.pk}:{_lineup_fingerprint(match)}"
+
+
+def roster_entry(player: Player, personality=None) -> dict:
+    """
+    Roster entry of one player; ``personality`` is the precomputed modifier
+    vector read per tick through ``RosterPersonality``.
+    """
+    stats = {"overall": player.overall_rating}
+    for field in ROSTER_STAT_FIELDS:
+        # Already exposed as "overall"
+        if field == "overall_rating":
+            continue
+        stats[field] = getattr(player, field, None)
+    entry = {
+        "id": player.id,
+        "name": player.last_name,
+        "stats": stats,
+    }
+    if personality is not None:
+        entry["personality"] = personality
+    return entry
+
+
+def matrix_roster_entry(matrix, row: int, with_personality: bool = False) -> dict:
+    """``roster_entry`` read from a ``PlayerAttributeMatrix`` row."""
+    values = matrix.stats(row)
+    stats = {"overall": values["overall_rating"]}
+    for field in ROSTER_STAT_FIELDS:
+        if field == "overall_rating":
+            continue
+        stats[field] = values.get(field)
+    entry = {
+        "id": int(matrix.ids[row]),
+        "name": str(matrix.names[row]),
+        "stats": stats,
+    }
+    if with_personality:
+        entry["personality"] = matrix.personality[row].tolist()
+    return entry
+
+
+def build_match_rosters(match, matrix=None) -> Rosters:
+    """
+    Builds both sides' rosters with one player query, or with none when a
+    ``PlayerAttributeMatrix`` holding every lineup player is given.
+    With the personality engine enabled, entries carry their players'
+    personality modifier vectors, computed here once per match.
+    """
+    rosters: Rosters = {side: {} for side in SIDES}
+    side_by_player = {}
+    for side in SIDES:
+        for pid in lineup_player_ids(getattr(match, f"{side}_lineup")):
+            side_by_player.setdefault(pid, side)
+    if not side_by_player:
+        return rosters
+    with_personality = PersonalityModifier._is_personality_enabled()
+
+    if matrix is not None and all(pid in matrix for pid in side_by_player):
+        lines = matrix.lines()
+        for pid, row in zip(side_by_player, matrix.rows(side_by_player).tolist()):
+            line = LINES[lines[row]]
+            rosters[side_by_player[pid]].setdefault(line, []).append(
+                matrix_roster_entry(matrix, row, with_personality)
+            )
+        return rosters
+
+    # No SQL sort: entries follow lineup slot order, sorted in memory.
+    slot_order = {pid: idx for idx, pid in enumerate(side_by_player)}
+    players = Player.objects.only(*ROSTER_FETCH_FIELDS).filter(id__in=list(side_by_player)).order_by()
+    players = sorted(players, key=lambda p: slot_order[p.id])
+    vectors = personality_modifier_vectors([p.personality_traits for p in players]) if with_personality else None
+    for idx, player in enumerate(players):
+        line = get_player_line(player)
+        personality = vectors[idx].tolist() if vectors is not None else None
+        rosters[side_by_player[player.id]].setdefault(line, []).append(roster_entry(player, personality))
+    return rosters
+
+
+def get_match_rosters(match) -> Rosters:
+    """Cached roster snapshot of a match; built on first use after kickoff."""
+    key = roster_cache_key(match)
+    rosters = cache.get(key)
+    if rosters is None:
+        rosters = build_match_rosters(match)
+        cache.set(key, rosters, ROSTER_CACHE_TIMEOUT)
+        logger.debug("Cached roster snapshot for match %s", match.pk)
+    return rosters
+
+
+def roster_players(rosters: Optional[Rosters], side: str) -> List[dict]:
+    """Flat list of roster entries for one side, goalkeepers last."""
+    lines = (rosters or {}).get(side) or {}
+    ordered: List[dict] = []
+    for line in ("FWD", "MID", "DEF", "GK"):
+        ordered.extend(lines.get(line, []))
+    return ordered
+
+
+def roster_names(rosters: Optional[Rosters], sides: Iterable[str] = SIDES) -> Dict[int, str]:
+    return {
+        entry["id"]: entry["name"]
+        for side in sides
+        for entry in roster_players(rosters, side)
+    }
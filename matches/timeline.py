@@ -1,27 +1,41 @@
+"""
+Realtime broadcast timeline for one game minute.
+
+The Markov engine already splits a minute into ``TICKS_PER_MINUTE`` ticks of
+``tick_seconds`` game time and stamps each event with its tick.  The timeline
+places every tick event at the matching point of the real-time minute window,
+so the broadcast replays the simulated minute instead of inventing one.  Names
+come from the cached roster snapshot; building a timeline reads no players.
+"""
 import logging
 import random
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import Iterable, List, Optional, Sequence
+from typing import List, Optional, Sequence, Set
 
 from django.db import transaction
 from django.utils import timezone
 
-from matches.models import Match, MatchBroadcastEvent, MatchEvent
+from matches.engines.markov_runtime import TICKS_PER_MINUTE, MarkovMinuteSummary
+from matches.markov_minute import map_markov_event_to_match_event, map_zone_from_markov, play_markov_minute
+from matches.models import Match, MatchBroadcastEvent
 from matches.realtime_clock import RealtimeConfig, get_realtime_config
-from matches.utils import extract_player_id
+from matches.roster import Rosters, get_match_rosters, roster_names, roster_players
 
 logger = logging.getLogger(__name__)
 
-RAW_EVENT_KEYS = (
-    "event",
-    "additional_event",
-    "second_additional_event",
-    "third_additional_event",
-)
-
 BROADCAST_KIND_DEFAULT = "micro_pass"
-PAUSE_SHORT_RANGE = (1, 3)
+DEFAULT_TICK_SECONDS = 60 // TICKS_PER_MINUTE
+# Where inside its tick window an event may land (fraction of the tick).
+TICK_POSITION_RANGE = (0.2, 0.8)
+
+EVENT_KIND_MAP = {
+    "goal": "goal",
+    "shot_miss": "shot_miss",
+    "interception": "interception",
+    "foul": "lost_chance",
+    "info": "micro_pass",
+}
 
 
 @dataclass
@@ -32,111 +46,27 @@ class BroadcastItem:
     idempotency_key: str
 
 
-def _store_match_event(match: Match, payload: Optional[dict]) -> Optional[MatchEvent]:
-    if not payload:
-        return None
-    allowed_fields = {
-        "match",
-        "minute",
-        "event_type",
-        "player",
-        "related_player",
-        "description",
-        "personality_reason",
-    }
-    data = {key: value for key, value in payload.items() if key in allowed_fields}
-    data.setdefault("match", match)
-    data.setdefault("minute", match.current_minute)
-    return MatchEvent.objects.create(**data)
-
-
-def _simulate_minute_actions(match: Match, max_actions: int) -> List[MatchEvent]:
-    from matches.match_simulation import simulate_one_action
-
-    created: List[MatchEvent] = []
-    steps = 0
-    while steps < max_actions:
-        steps += 1
-        result = simulate_one_action(match)
-        for key in RAW_EVENT_KEYS:
-            stored = _store_match_event(match, result.get(key))
-            if stored:
-                created.append(stored)
-        match.save()
-        if not result.get("continue", True):
-            break
-    return created
-
-
-def ensure_minute_events(match: Match, *, max_actions: int = 8) -> List[MatchEvent]:
-    existing = list(
-        match.events.filter(minute=match.current_minute).select_related("player", "related_player")
-    )
-    if existing:
-        return existing
-    logger.debug(
-        "No MatchEvent records found for match %s minute %s, simulating minute.",
-        match.id,
-        match.current_minute,
-    )
-    return _simulate_minute_actions(match, max_actions=max_actions)
-
-
-def _team_players_from_lineup(match: Match, team) -> List:
-    lineup_attr = "home_lineup" if team.id == match.home_team_id else "away_lineup"
-    lineup = getattr(match, lineup_attr)
-    player_ids: List[int] = []
-    if isinstance(lineup, dict):
-        for slot_value in lineup.values():
-            pid = extract_player_id(slot_value)
-            if pid:
-                try:
-                    player_ids.append(int(pid))
-                except ValueError:
-                    continue
-    elif isinstance(lineup, str):
-        for chunk in lineup.split(","):
-            chunk = chunk.strip()
-            if chunk.isdigit():
-                player_ids.append(int(chunk))
-    if player_ids:
-        players = list(team.player_set.filter(id__in=player_ids))
-        if players:
-            return players
-    return list(team.player_set.all())
-
-
-def _pick_players(team_players: Sequence, count: int = 2) -> List:
+def _side_team_id(match: Match, side: Optional[str]) -> Optional[int]:
+    if side == "home":
+        return match.home_team_id
+    if side == "away":
+        return match.away_team_id
+    return None
+
+
+def _pick_players(team_players: Sequence[dict], count: int = 2, *, rng=random) -> List[dict]:
     if not team_players:
         return []
     if len(team_players) <= count:
         return list(team_players)
-    return random.sample(list(team_players), count)
+    return rng.sample(list(team_players), count)
 
 
-def _goal_side_team(match: Match, events: Sequence[MatchEvent]):
-    for event in reversed(events):
-        if event.player_id:
-            return event.player.club if hasattr(event.player, "club") else None
-    return None
-
-
-def _team_in_possession(match: Match, minute_events: Sequence[MatchEvent]):
-    if match.possession_indicator == 1:
-        return match.home_team
-    if match.possession_indicator == 2:
-        return match.away_team
-    last_team = _goal_side_team(match, minute_events)
-    if last_team:
-        return last_team
-    return match.home_team
-
-
-def _build_pass_text(passer, receiver, extra: Optional[str] = None) -> str:
+def _build_pass_text(passer: Optional[str], receiver: Optional[str], extra: Optional[str] = None) -> str:
     if passer and receiver:
-        base = f"{passer.last_name} keeps it simple for {receiver.last_name}"
+        base = f"{passer} keeps it simple for {receiver}"
     elif passer:
-        base = f"{passer.last_name} keeps the ball moving and looks up"
+        base = f"{passer} keeps the ball moving and looks up"
     else:
         base = "The attack slows for a heartbeat, searching for space"
     if extra:
@@ -144,216 +74,282 @@ def _build_pass_text(passer, receiver, extra: Optional[str] = None) -> str:
     return base
 
 
-def _convert_event_to_micro(event: MatchEvent, match: Match, config: RealtimeConfig) -> dict:
-    kind_map = {
-        "goal": "goal",
-        "shot_miss": "shot_miss",
-        "pass": "micro_pass",
-        "dribble": "micro_pass",
-        "interception": "interception",
-        "counterattack": "micro_pass",
-        "foul": "lost_chance",
-        "match_end": "lost_chance",
-        "match_start": "micro_pass",
-    }
-    kind = kind_map.get(event.event_type, BROADCAST_KIND_DEFAULT)
-    description = event.description or ""
-    text = description or f"{event.get_event_type_display()}!"
-    if kind == "micro_pass" and not description:
-        extra = None
-        if event.related_player:
-            extra = f"{event.related_player.last_name} is already on the move"
-        text = _build_pass_text(event.player, event.related_player, extra=extra)
-
-    score_update = None
-    if event.event_type == "goal":
-        score_update = {
-            "home": match.home_score,
-            "away": match.away_score,
-            "minute": event.minute,
-        }
-    payload = {
+def _pick_receiver(rosters: Optional[Rosters], side: Optional[str], actor_id, *, rng) -> Optional[dict]:
+    mates = [entry for entry in roster_players(rosters, side) if entry["id"] != actor_id]
+    picked = _pick_players(mates, 1, rng=rng)
+    return picked[0] if picked else None
+
+
+def _tick_payload(
+    match: Match,
+    minute: int,
+    raw_event: dict,
+    *,
+    rosters: Optional[Rosters],
+    known_player_ids: Set[int],
+    rng,
+) -> Optional[dict]:
+    mapped = map_markov_event_to_match_event(match, raw_event, known_player_ids)
+    narrative = raw_event.get("narrative")
+    if not mapped and not narrative:
+        return None
+
+    event_type = (mapped or {}).get("event_type", "info")
+    kind = EVENT_KIND_MAP.get(event_type, BROADCAST_KIND_DEFAULT)
+    turnover = bool(raw_event.get("turnover"))
+    side = raw_event.get("possession") if turnover else (
+        raw_event.get("prev_possession") or raw_event.get("possession")
+    )
+    actor_id = (mapped or {}).get("player_id")
+    players = [actor_id] if actor_id else []
+
+    text = narrative or (mapped or {}).get("description", "")
+    if kind == "micro_pass" and not narrative:
+        receiver = _pick_receiver(rosters, side, actor_id, rng=rng)
+        if receiver:
+            players.append(receiver["id"])
+        text = _build_pass_text(
+            raw_event.get("actor_name"),
+            receiver["name"] if receiver else None,
+        )
+
+    return {
         "display_text": text,
         "kind": kind,
-        "game_minute": event.minute,
-        "team_id": event.player.club_id if event.player_id else None,
-        "players": [pid for pid in [event.player_id, event.related_player_id] if pid],
-        "zone_hint": getattr(match, "current_zone", None),
+        "game_minute": minute,
+        "tick": raw_event.get("tick"),
+        "team_id": _side_team_id(match, side),
+        "players": players,
+        "zone_hint": map_zone_from_markov(raw_event.get("zone"), match.current_zone),
     }
-    if event.personality_reason:
-        payload["note"] = event.personality_reason
-    if score_update:
-        payload["score_update"] = score_update
-    return payload
 
 
-def _build_filler_events(match: Match, team, num_events: int, used_players: Optional[Sequence] = None):
-    players = _team_players_from_lineup(match, team)
+def _build_filler_events(
+    match: Match,
+    minute: int,
+    side: Optional[str],
+    rosters: Optional[Rosters],
+    num_events: int,
+    *,
+    used_player_ids: Optional[Set[int]] = None,
+    rng=random,
+) -> List[dict]:
+    players = roster_players(rosters, side)
+    exclude = set(used_player_ids or ())
     fillers = []
-    exclude = set(p.id for p in used_players or [] if p)
     for _ in range(num_events):
-        pair = _pick_players([p for p in players if p.id not in exclude], 2)
+        pair = _pick_players([p for p in players if p["id"] not in exclude], 2, rng=rng)
         passer = pair[0] if pair else None
         receiver = pair[1] if len(pair) > 1 else None
-        exclude.update({p.id for p in pair})
-        text = _build_pass_text(passer, receiver)
+        exclude.update(p["id"] for p in pair)
         fillers.append(
             {
-                "display_text": text,
+                "display_text": _build_pass_text(
+                    passer["name"] if passer else None,
+                    receiver["name"] if receiver else None,
+                ),
                 "kind": "micro_pass",
-                "team_id": team.id if team else None,
-                "players": [pid for pid in [getattr(passer, "id", None), getattr(receiver, "id", None)] if pid],
-                "game_minute": match.current_minute,
+                "game_minute": minute,
+                "team_id": _side_team_id(match, side),
+                "players": [p["id"] for p in pair],
                 "zone_hint": getattr(match, "current_zone", None),
             }
         )
     return fillers
 
 
-def _closing_event(match: Match, team) -> dict:
-    team_name = team.name if team else "Team"
-    return {
-        "display_text": f"{team_name} slow things down and recycle through midfield",
-        "kind": "lost_chance",
-        "team_id": team.id if team else None,
-        "players": [],
-        "game_minute": match.current_minute,
-        "zone_hint": "MID-C",
-    }
-
-
-def _schedule_events(match: Match, minute: int, minute_start, events: Sequence[dict], config: RealtimeConfig) -> List[BroadcastItem]:
-    if not events:
-        return []
-    seconds_pm = max(config.seconds_per_game_minute, 5)
-    max_duration = min(seconds_pm - 1, 50.0)
-    if max_duration < 10:
-        max_duration = seconds_pm - 0.5
-    min_duration = min(35.0, max_duration * 0.7)
-    if min_duration < 5.0:
-        min_duration = max_duration * 0.5
-    if min_duration <= 0:
-        min_duration = max_duration * 0.5
-    target_duration = random.uniform(min_duration, max_duration) if max_duration > 0 else seconds_pm - 1
-    start_offset = min(5.0, max(1.5, target_duration * 0.15))
-    offset = random.uniform(1.0, start_offset)
-    pause_min, pause_max = config.micro_event_pause_range
+def _schedule_ticks(
+    match: Match,
+    minute: int,
+    minute_start,
+    entries: Sequence[tuple],
+    config: RealtimeConfig,
+    *,
+    tick_seconds: int,
+    rng,
+) -> List[BroadcastItem]:
+    """
+    ``entries`` are ``(tick, payload)`` pairs in tick order; tick 0 is the
+    start of the minute.  Game seconds are scaled onto the real-time window.
+    """
+    seconds_pm = max(config.seconds_per_game_minute, 1)
+    scale = seconds_pm / float(TICKS_PER_MINUTE * tick_seconds)
     jitter_seconds = config.jitter_ms / 1000.0
-
-    scheduled_items: List[BroadcastItem] = []
-    for idx, payload in enumerate(events, start=1):
-        jitter = random.uniform(-jitter_seconds, jitter_seconds)
-        scheduled_at = minute_start + timedelta(seconds=max(0.0, offset + jitter))
-        # Clamp to minute window
-        window_end = minute_start + timedelta(seconds=seconds_pm - 0.25)
-        if scheduled_at > window_end:
-            scheduled_at = window_end
-        idempotency_key = f"{match.id}:{minute}:{idx}"
-        scheduled_items.append(
+    window_end = seconds_pm - 0.25
+    low, high = TICK_POSITION_RANGE
+
+    items: List[BroadcastItem] = []
+    previous = 0.0
+    for idx, (tick, payload) in enumerate(entries, start=1):
+        if tick <= 0:
+            game_offset = rng.uniform(0.0, low) * tick_seconds
+        else:
+            game_offset = (tick - 1 + rng.uniform(low, high)) * tick_seconds
+        offset = game_offset * scale + rng.uniform(-jitter_seconds, jitter_seconds)
+        # Keep tick order and stay inside the minute window.
+        offset = min(max(offset, previous, 0.0), window_end)
+        previous = offset
+        items.append(
             BroadcastItem(
                 idx=idx,
-                scheduled_at=scheduled_at,
+                scheduled_at=minute_start + timedelta(seconds=offset),
                 payload=payload,
-                idempotency_key=idempotency_key,
+                idempotency_key=f"{match.id}:{minute}:{idx}",
             )
         )
-        if idx == len(events):
-            break
-        pause = random.uniform(pause_min, pause_max)
-        # Shorter pause towards the end
-        if idx >= len(events) - 2:
-            pause = random.uniform(PAUSE_SHORT_RANGE[0], PAUSE_SHORT_RANGE[1])
-        offset = min(offset + pause, target_duration)
-    return scheduled_items
+    return items
 
 
 def build_minute_timeline(
     match: Match,
+    minute_summary: MarkovMinuteSummary,
     *,
+    rosters: Optional[Rosters] = None,
     config: Optional[RealtimeConfig] = None,
-    minute_events: Optional[Sequence[MatchEvent]] = None,
     minute_start=None,
+    tick_seconds: int = DEFAULT_TICK_SECONDS,
+    max_items: Optional[int] = None,
+    minute: Optional[int] = None,
 ) -> List[BroadcastItem]:
     """
-    Build micro-broadcast items for the current match minute.
-    The caller is responsible for persisting (idempotently) and committing the transaction.
+    Turn a Markov minute summary into scheduled broadcast items for the
+    current (or given) match minute. The caller persists them and commits.
     """
-
     config = config or get_realtime_config()
-    if not minute_start:
-        minute_start = timezone.now()
-
-    events = list(minute_events) if minute_events is not None else ensure_minute_events(match)
-    team = _team_in_possession(match, events)
-    used_players = [event.player for event in events if event.player_id]
-
-    filler_needed = max(config.min_events_per_minute - len(events) - 1, 1)
-    filler_events = _build_filler_events(match, team, max(filler_needed, 1), used_players=used_players)
+    minute_start = minute_start or timezone.now()
+    minute = match.current_minute if minute is None else minute
+    rng = random.Random(f"{match.id}:{minute}")
+    known_player_ids = set(roster_names(rosters))
 
-    converted = [_convert_event_to_micro(event, match, config) for event in events]
-    if not converted:
-        converted.append(
+    entries: List[tuple] = [
+        (
+            0,
             {
-                "display_text": "Teams probe without carving out a clear chance.",
-                "kind": "lost_chance",
-                "team_id": team.id if team else None,
+                "display_text": line,
+                "kind": "info",
+                "game_minute": minute,
+                "tick": 0,
+                "team_id": None,
                 "players": [],
-                "game_minute": match.current_minute,
                 "zone_hint": getattr(match, "current_zone", None),
-            }
+            },
         )
+        for line in minute_summary.get("pure_narrative") or []
+    ]
 
-    closing = _closing_event(match, team)
-
-    combined: List[dict] = []
-    combined.extend(filler_events)
-    combined.extend(converted)
-    combined.append(closing)
+    totals = minute_summary.get("score_total") or {}
+    scored = minute_summary.get("score") or {}
+    running = {side: totals.get(side, 0) - scored.get(side, 0) for side in ("home", "away")}
 
-    if len(combined) > config.max_events_per_minute:
-        # Preserve final event and closing remark.
-        core = combined[: config.max_events_per_minute - 1]
-        core.append(combined[-1])
-        combined = core
-
-    if len(combined) < config.min_events_per_minute:
-        additional = _build_filler_events(
+    for raw_event in minute_summary.get("events") or []:
+        payload = _tick_payload(
             match,
-            team,
-            config.min_events_per_minute - len(combined),
-            used_players=used_players,
+            minute,
+            raw_event,
+            rosters=rosters,
+            known_player_ids=known_player_ids,
+            rng=rng,
         )
-        combined = combined + additional
+        if payload is None:
+            continue
+        if payload["kind"] == "goal":
+            scorer = raw_event.get("prev_possession") or raw_event.get("possession")
+            if scorer in running:
+                running[scorer] += 1
+            payload["score_update"] = {
+                "home": running["home"],
+                "away": running["away"],
+                "minute": minute,
+            }
+        if raw_event.get("turnover"):
+            payload["possession_update"] = {
+                "side": raw_event.get("possession"),
+                "team_id": _side_team_id(match, raw_event.get("possession")),
+                "minute": minute,
+            }
+        entries.append((int(raw_event.get("tick") or 0), payload))
+
+    limit = config.max_events_per_minute
+    if max_items:
+        limit = min(limit, max_items)
+    if len(entries) > limit:
+        # Drop plain passes first; goals, shots and turnovers carry the minute.
+        droppable = [i for i, (_, payload) in enumerate(entries) if payload["kind"] == "micro_pass"]
+        drop = set(droppable[: len(entries) - limit])
+        entries = [entry for i, entry in enumerate(entries) if i not in drop][:limit]
+
+    if len(entries) < config.min_events_per_minute:
+        side = minute_summary.get("possession_end")
+        used = {pid for _, payload in entries for pid in payload["players"]}
+        busy = {tick for tick, _ in entries}
+        free_ticks = [t for t in range(1, TICKS_PER_MINUTE + 1) if t not in busy] or [TICKS_PER_MINUTE]
+        fillers = _build_filler_events(
+            match,
+            minute,
+            side,
+            rosters,
+            config.min_events_per_minute - len(entries),
+            used_player_ids=used,
+            rng=rng,
+        )
+        for i, payload in enumerate(fillers):
+            tick = free_ticks[min(i, len(free_ticks) - 1)]
+            payload["tick"] = tick
+            entries.append((tick, payload))
+        entries.sort(key=lambda entry: entry[0])
 
-    return _schedule_events(match, match.current_minute, minute_start, combined, config)
+    return _schedule_ticks(
+        match,
+        minute,
+        minute_start,
+        entries,
+        config,
+        tick_seconds=tick_seconds,
+        rng=rng,
+    )
 
 
 def persist_broadcast_items(match: Match, minute: int, items: Sequence[BroadcastItem]) -> List[MatchBroadcastEvent]:
-    stored = []
-    for item in items:
-        defaults = {
-            "match": match,
-            "game_minute": minute,
-            "idx_in_minute": item.idx,
-            "payload_json": item.payload,
-            "scheduled_at": item.scheduled_at,
-            "status": MatchBroadcastEvent.STATUS_PENDING,
-        }
-        obj, created = MatchBroadcastEvent.objects.get_or_create(
+    """
+    Idempotently stores the minute's items with one upsert keyed on idempotency_key.
+    Pending rows get the new payload/schedule; rows already sent or skipped stay untouched.
+    """
+    if not items:
+        return []
+    keys = [item.idempotency_key for item in items]
+    settled = {
+        obj.idempotency_key: obj
+        for obj in MatchBroadcastEvent.objects.filter(idempotency_key__in=keys).exclude(
+            status=MatchBroadcastEvent.STATUS_PENDING
+        )
+    }
+    rows = [
+        MatchBroadcastEvent(
+            match=match,
+            game_minute=minute,
+            idx_in_minute=item.idx,
+            payload_json=item.payload,
+            scheduled_at=item.scheduled_at,
+            status=MatchBroadcastEvent.STATUS_PENDING,
             idempotency_key=item.idempotency_key,
-            defaults=defaults,
         )
-        if not created and obj.status == MatchBroadcastEvent.STATUS_PENDING:
-            updates = {}
-            if obj.payload_json != item.payload:
-                updates["payload_json"] = item.payload
-            if obj.scheduled_at != item.scheduled_at:
-                updates["scheduled_at"] = item.scheduled_at
-            if updates:
-                for key, value in updates.items():
-                    setattr(obj, key, value)
-                obj.save(update_fields=list(updates.keys()))
-        stored.append(obj)
+        for item in items
+        if item.idempotency_key not in settled
+    ]
+    upserted = {}
+    if rows:
+        upserted = {
+            obj.idempotency_key: obj
+            for obj in MatchBroadcastEvent.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["idempotency_key"],
+                update_fields=["payload_json", "scheduled_at", "updated_at"],
+            )
+        }
+
+    stored = [settled.get(key) or upserted[key] for key in keys]
+    for obj in stored:
         logger.debug(
             "Minute %s event idx=%s scheduled=%s payload=%s",
             minute,
@@ -372,6 +368,10 @@ def build_and_store_minute_timeline(
     minute_start=None,
     max_actions: int = 8,
 ) -> List[MatchBroadcastEvent]:
+    """
+    Plays the current Markov minute (unless the Celery task already did) and
+    stores its broadcast timeline. ``max_actions`` caps the items per minute.
+    """
     match = (
         Match.objects.select_for_update()
         .select_related("home_team", "away_team")
@@ -383,12 +383,24 @@ def build_and_store_minute_timeline(
         return []
     minute_start = minute_start or timezone.now()
     minute = match.current_minute
-    events = ensure_minute_events(match, max_actions=max_actions)
+    rosters = get_match_rosters(match)
+
+    summary = match.markov_last_summary or {}
+    tick_seconds = DEFAULT_TICK_SECONDS
+    if summary.get("minute") != minute:
+        result, _ = play_markov_minute(match, rosters=rosters)
+        summary = result["minute_summary"]
+        tick_seconds = result.get("tick_seconds") or DEFAULT_TICK_SECONDS
+
     items = build_minute_timeline(
         match,
+        summary,
+        rosters=rosters,
         config=config,
-        minute_events=events,
         minute_start=minute_start,
+        tick_seconds=tick_seconds,
+        max_items=max_actions,
+        minute=minute,
     )
     stored = persist_broadcast_items(match, minute, items)
     match.realtime_last_broadcast_minute = minute
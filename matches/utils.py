@@ -16,3 +16,21 @@ def extract_player_id(slot_val):
         return None
     except (ValueError, TypeError, AttributeError):
         return None
+
+
+def advance_match_minute(match, *, to_minute=None, regulation_minutes: int = 90):
+    """
+    Moves the match clock to the next game minute (or to ``to_minute``).
+    Past regulation time the match is marked as finished.
+    """
+    from django.utils import timezone
+
+    target = to_minute if to_minute is not None else match.current_minute + 1
+    if target > regulation_minutes:
+        match.status = 'finished'
+        match.current_minute = regulation_minutes
+    else:
+        match.current_minute = target
+    match.last_minute_update = timezone.now()
+    match.save(update_fields=['current_minute', 'status', 'last_minute_update'])
+    return match
@@ -164,27 +164,16 @@ def get_best_players_by_line(club):
     """
     Возвращает dict { 'GK': Player|None, 'DEF': ..., 'MID': ..., 'FWD': ... }
     с лучшими игроками клуба по каждой линии. 
+    Суммы атрибутов считаются по матрице атрибутов, экземпляры Player
+    создаются только для победителей.
     """
-    from players.models import get_player_line
+    from players.attribute_matrix import PlayerAttributeMatrix
+    from players.models import Player
 
-    best = {
-        'GK': (0, None),
-        'DEF': (0, None),
-        'MID': (0, None),
-        'FWD': (0, None),
-    }
-    for p in club.player_set.all():
-        line = get_player_line(p)
-        total = p.sum_attributes()
-        if total > best[line][0]:
-            best[line] = (total, p)
-
-    return {
-        'GK': best['GK'][1],
-        'DEF': best['DEF'][1],
-        'MID': best['MID'][1],
-        'FWD': best['FWD'][1],
-    }
+    matrix = PlayerAttributeMatrix.load(Player.objects.filter(club=club))
+    best_ids = matrix.best_by_line(club.id)
+    players = Player.objects.in_bulk([pid for pid in best_ids.values() if pid is not None])
+    return {line: players.get(pid) for line, pid in best_ids.items()}
 
 
 @login_required
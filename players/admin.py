@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Player, TrainingSettings
+from .models import Player, TrainingRun, TrainingSettings
 
 @admin.register(Player)
 class PlayerAdmin(admin.ModelAdmin):
@@ -8,6 +8,7 @@ class PlayerAdmin(admin.ModelAdmin):
     list_filter = ('club', 'nationality', 'bloom_type', 'position')
     search_fields = ('last_name', 'first_name', 'club__name', 'nationality')
     readonly_fields = ('is_in_bloom', 'personality_traits_display')
+    ordering = Player.NAME_ORDERING
     
     def personality_traits_display(self, obj):
         """Отображение черт характера игрока в читаемом формате"""
@@ -32,3 +33,10 @@ class TrainingSettingsAdmin(admin.ModelAdmin):
     def get_player_position(self, obj):
         return obj.player.position
     get_player_position.short_description = 'Position'
+
+
+@admin.register(TrainingRun)
+class TrainingRunAdmin(admin.ModelAdmin):
+    list_display = ('run_id', 'scheduled_for', 'status', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = ('stats',)
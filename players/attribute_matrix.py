@@ -0,0 +1,291 @@
+"""
+Player attribute matrix.
+
+Loads the numeric attributes of many players into one (players x columns)
+NumPy array with one ``values_list`` query, so engines, training analytics
+and rankings work on array views instead of thousands of ``Player``
+instances.  Rows are sorted by player id; ``rows()`` maps ids to rows with
+``searchsorted``.  ``refresh()`` re-reads only rows whose ``updated_at``
+moved since the last load and updates the matrix in place.
+
+Column layout keeps each consumer's block contiguous, so its view is a
+slice of the matrix (no copy):
+
+* ``training_view()``   -- the trained attributes (``TRAINED_ATTRS``), which
+  are also the attributes summed by ``Player.sum_attributes``;
+* ``simulation_view()`` -- trained attributes, morale and overall rating,
+  the stats the match engine reads from rosters;
+* ``ranking_view()``    -- the stored overall rating.
+
+``personality`` holds each player's personality modifier vector
+(``matches.personality_engine.PERSONALITY_SLOTS``) for roster snapshots.
+"""
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Sum
+
+from matches.personality_engine import PERSONALITY_SLOTS, personality_modifier_vectors
+
+from .models import Player, get_player_line
+from .training_batch import TRAINED_ATTRS
+
+MATRIX_COLUMNS = tuple(TRAINED_ATTRS) + ('morale', 'overall_rating', 'age', 'player_class')
+COLUMN_INDEX = {name: idx for idx, name in enumerate(MATRIX_COLUMNS)}
+TRAINING_END = len(TRAINED_ATTRS)
+SIMULATION_END = COLUMN_INDEX['overall_rating'] + 1
+
+POSITION_CODES = tuple(code for code, _ in Player.POSITIONS)
+POSITION_INDEX = {code: idx for idx, code in enumerate(POSITION_CODES)}
+LINES = ('GK', 'DEF', 'MID', 'FWD')
+# Line (index into LINES) per position code, as get_player_line decides it
+POSITION_LINES = np.array(
+    [LINES.index(get_player_line(SimpleNamespace(position=code))) for code in POSITION_CODES],
+    dtype=np.int8,
+)
+UNKNOWN_POSITION = -1
+NO_CLUB = -1
+
+META_FIELDS = ('id', 'club_id', 'position', 'last_name', 'experience', 'updated_at', 'personality_traits')
+FETCH_FIELDS = META_FIELDS + MATRIX_COLUMNS
+FETCH_CHUNK_SIZE = 5000
+
+# Re-read rows changed this long before the last stamp, so rows committed
+# late by a concurrent transaction are not missed.
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+class PlayerAttributeMatrix:
+    """Attributes of the players of ``queryset`` (all players by default)."""
+
+    read_only = False
+
+    def __init__(self, queryset=None):
+        self.queryset = queryset if queryset is not None else Player.objects.all()
+        self.ids = np.empty(0, dtype=np.int64)
+        self.values = np.empty((0, len(MATRIX_COLUMNS)), dtype=np.int32)
+        self.experience = np.empty(0, dtype=np.float64)
+        self.club_ids = np.empty(0, dtype=np.int64)
+        self.positions = np.empty(0, dtype=np.int8)
+        # Personality modifier vectors (see matches.personality_engine)
+        self.personality = np.empty((0, len(PERSONALITY_SLOTS)), dtype=np.float64)
+        self.names: List[str] = []
+        self.stamp = None
+        # Bumped whenever the contents change
+        self.version = 0
+
+    @classmethod
+    def load(cls, queryset=None) -> 'PlayerAttributeMatrix':
+        matrix = cls(queryset)
+        matrix.reload()
+        return matrix
+
+    def _fetch(self, queryset) -> list:
+        return list(
+            queryset.order_by().values_list(*FETCH_FIELDS).iterator(chunk_size=FETCH_CHUNK_SIZE)
+        )
+
+    def reload(self) -> None:
+        """Reads every row again."""
+        rows = self._fetch(self.queryset)
+        rows.sort(key=lambda row: row[0])
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.values = np.array(
+            [row[len(META_FIELDS):] for row in rows], dtype=np.int32,
+        ).reshape(len(rows), len(MATRIX_COLUMNS))
+        self.experience = np.array([row[4] or 0.0 for row in rows], dtype=np.float64)
+        self.club_ids = np.array([NO_CLUB if row[1] is None else row[1] for row in rows], dtype=np.int64)
+        self.positions = np.array(
+            [POSITION_INDEX.get(row[2], UNKNOWN_POSITION) for row in rows], dtype=np.int8,
+        )
+        self.personality = personality_modifier_vectors([row[6] for row in rows])
+        self.names = [row[3] for row in rows]
+        self.stamp = max((row[5] for row in rows), default=None)
+        self.version += 1
+
+    def refresh(self) -> int:
+        """
+        Applies rows changed since the last load; returns how many rows were
+        read.  Changed rows are overwritten in place, so views taken earlier
+        see them; new players are appended (re-take views after that).
+        Deleted players are noticed by the count and sum of ids (one
+        aggregate; ids only grow, so a delete plus an insert still changes
+        the sum) and trigger a reload.
+        """
+        if self.stamp is None:
+            self.reload()
+            return len(self)
+        rows = self._fetch(self.queryset.filter(updated_at__gte=self.stamp - REFRESH_OVERLAP))
+        if rows:
+            self.stamp = max(self.stamp, max(row[5] for row in rows))
+            self._apply(rows)
+        totals = self.queryset.order_by().aggregate(count=Count('id'), id_sum=Sum('id'))
+        if totals['count'] != len(self) or int(totals['id_sum'] or 0) != int(self.ids.sum()):
+            self.reload()
+            return len(self)
+        return len(rows)
+
+    def _apply(self, rows) -> None:
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        positions = np.searchsorted(self.ids, ids)
+        known = positions < len(self.ids)
+        known[known] = self.ids[positions[known]] == ids[known]
+        changed = False
+        new_rows = []
+        personality = personality_modifier_vectors([row[6] for row in rows])
+        for idx, (row, pos, is_known) in enumerate(zip(rows, positions.tolist(), known.tolist())):
+            if not is_known:
+                new_rows.append(row)
+                continue
+            values = row[len(META_FIELDS):]
+            club_id = NO_CLUB if row[1] is None else row[1]
+            position = POSITION_INDEX.get(row[2], UNKNOWN_POSITION)
+            before = (self.values[pos].tolist(), int(self.club_ids[pos]), int(self.positions[pos]),
+                      float(self.experience[pos]), self.names[pos], self.personality[pos].tolist())
+            if before != (list(values), club_id, position, row[4] or 0.0, row[3], personality[idx].tolist()):
+                changed = True
+            self.personality[pos] = personality[idx]
+            self.values[pos] = values
+            self.experience[pos] = row[4] or 0.0
+            self.club_ids[pos] = club_id
+            self.positions[pos] = position
+            self.names[pos] = row[3]
+        if new_rows:
+            self._append(new_rows)
+            changed = True
+        if changed:
+            self.version += 1
+
+    def _append(self, rows) -> None:
+        rows = sorted(rows, key=lambda row: row[0])
+        ids = np.concatenate([self.ids, np.array([row[0] for row in rows], dtype=np.int64)])
+        order = np.argsort(ids, kind='stable')
+        self.ids = ids[order]
+        self.values = np.concatenate(
+            [self.values, np.array([row[len(META_FIELDS):] for row in rows], dtype=np.int32)]
+        )[order]
+        self.experience = np.concatenate(
+            [self.experience, np.array([row[4] or 0.0 for row in rows], dtype=np.float64)]
+        )[order]
+        self.club_ids = np.concatenate(
+            [self.club_ids, np.array([NO_CLUB if row[1] is None else row[1] for row in rows], dtype=np.int64)]
+        )[order]
+        self.positions = np.concatenate(
+            [self.positions, np.array([POSITION_INDEX.get(row[2], UNKNOWN_POSITION) for row in rows], dtype=np.int8)]
+        )[order]
+        self.personality = np.concatenate(
+            [self.personality, personality_modifier_vectors([row[6] for row in rows])]
+        )[order]
+        names = self.names + [row[3] for row in rows]
+        self.names = [names[idx] for idx in order.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, player_id) -> bool:
+        pos = int(np.searchsorted(self.ids, player_id))
+        return pos < len(self.ids) and self.ids[pos] == player_id
+
+    def rows(self, player_ids: Iterable[int]) -> np.ndarray:
+        """Row index of each player id; ``KeyError`` for ids not in the matrix."""
+        ids = np.asarray(list(player_ids), dtype=np.int64)
+        positions = np.searchsorted(self.ids, ids)
+        found = positions < len(self.ids)
+        found[found] = self.ids[positions[found]] == ids[found]
+        if not found.all():
+            raise KeyError(f"Players not in the attribute matrix: {ids[~found].tolist()}")
+        return positions
+
+    def row(self, player_id: int) -> int:
+        return int(self.rows([player_id])[0])
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, COLUMN_INDEX[name]]
+
+    def training_view(self) -> np.ndarray:
+        """Trained attributes, columns in ``TRAINED_ATTRS`` order."""
+        return self.values[:, :TRAINING_END]
+
+    def simulation_view(self) -> np.ndarray:
+        """Stats read by the match engine, columns in ``MATRIX_COLUMNS[:SIMULATION_END]`` order."""
+        return self.values[:, :SIMULATION_END]
+
+    def ranking_view(self) -> np.ndarray:
+        return self.column('overall_rating')
+
+    def attribute_totals(self) -> np.ndarray:
+        """``Player.sum_attributes`` for every row."""
+        return self.training_view().sum(axis=1)
+
+    def lines(self) -> np.ndarray:
+        """Line per row as an index into ``LINES`` (unknown positions count as MID)."""
+        lines = POSITION_LINES[np.maximum(self.positions, 0)]
+        return np.where(self.positions == UNKNOWN_POSITION, LINES.index('MID'), lines)
+
+    def club_rows(self, club_id: int) -> np.ndarray:
+        return np.flatnonzero(self.club_ids == club_id)
+
+    def best_by_line(self, club_id: int) -> Dict[str, Optional[int]]:
+        """
+        Id of the club's player with the highest attribute total per line
+        (``None`` if the line is empty or every total is 0); ties go to
+        the lowest id.
+        """
+        rows = self.club_rows(club_id)
+        totals = self.attribute_totals()[rows]
+        lines = self.lines()[rows]
+        best = {}
+        for code, line in enumerate(LINES):
+            candidates = np.flatnonzero((lines == code) & (totals > 0))
+            if not len(candidates):
+                best[line] = None
+                continue
+            winner = candidates[np.argmax(totals[candidates])]
+            best[line] = int(self.ids[rows[winner]])
+        return best
+
+    def position(self, row: int) -> str:
+        code = int(self.positions[row])
+        return POSITION_CODES[code] if code != UNKNOWN_POSITION else ''
+
+    def stats(self, row: int) -> Dict[str, int]:
+        """Simulation stats of one row as a plain dict."""
+        return dict(zip(MATRIX_COLUMNS[:SIMULATION_END], self.values[row, :SIMULATION_END].tolist()))
+
+
+_shared_lock = threading.Lock()
+_shared: Dict[str, object] = {'matrix': None, 'checked': 0.0}
+
+
+def get_attribute_matrix(max_age: Optional[float] = None) -> PlayerAttributeMatrix:
+    """
+    Process-wide matrix of all players for long-lived workers; refreshed
+    incrementally when older than ``max_age`` seconds
+    (``PLAYER_MATRIX_REFRESH_SECONDS``, default 60).
+    """
+    if max_age is None:
+        max_age = getattr(settings, 'PLAYER_MATRIX_REFRESH_SECONDS', 60)
+    with _shared_lock:
+        matrix = _shared['matrix']
+        now = time.monotonic()
+        if matrix is None:
+            matrix = PlayerAttributeMatrix.load()
+            _shared['matrix'] = matrix
+        elif not matrix.read_only and now - _shared['checked'] >= max_age:
+            matrix.refresh()
+        else:
+            return matrix
+        _shared['checked'] = now
+        return matrix
+
+
+def reset_attribute_matrix() -> None:
+    """Drops the process-wide matrix (tests, forked workers)."""
+    with _shared_lock:
+        _shared['matrix'] = None
+        _shared['checked'] = 0.0
@@ -0,0 +1,230 @@
+"""
+Batch player generation.
+
+Draws the attributes of many players in one NumPy call, with the normal
+distribution and the position / class modifiers of
+``players.utils.generate_player_stats``, picks unique Faker names against a
+``players.names.NameIndex`` and inserts the players in batches (one
+``unnest()`` insert per batch on PostgreSQL, ``bulk_create`` elsewhere).
+Used for starter squads and for populating whole worlds of bot clubs.
+"""
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
+
+from clubs.country_locales import country_locales
+
+from .models import Player
+from .names import NameAllocationError, NameAllocator, NameIndex
+from .personality import PersonalityGenerator
+from .utils import POSITION_MODIFIERS
+
+BASE_STATS = ('strength', 'stamina', 'morale', 'pace', 'positioning')
+GK_STATS = (
+    'reflexes', 'handling', 'aerial', 'command',
+    'distribution', 'one_on_one', 'rebound_control', 'shot_reading',
+)
+FIELD_STATS = (
+    'marking', 'tackling', 'work_rate', 'passing', 'crossing', 'dribbling',
+    'flair', 'heading', 'finishing', 'long_range', 'vision', 'accuracy',
+)
+STAT_COLUMNS = BASE_STATS + GK_STATS + FIELD_STATS
+STAT_INDEX = {name: col for col, name in enumerate(STAT_COLUMNS)}
+
+BLOOM_TYPES = ('early', 'middle', 'late')
+# Inclusive bloom start age ranges, as in players.utils.generate_bloom_data
+BLOOM_START_AGES = {'early': (17, 17), 'middle': (18, 19), 'late': (20, 21)}
+
+BULK_CREATE_BATCH_SIZE = 5000
+# Jobs at least this large preload the name index instead of querying per round.
+NAME_INDEX_PRELOAD_MIN = 1000
+MAX_CONFLICT_RETRIES = 5
+
+
+@dataclass
+class PlayerSpec:
+    """What to generate: the stats and name are drawn by ``bulk_create_players``."""
+
+    club: object
+    position: str
+    player_class: int
+    age: int = 17
+
+
+def apply_stat_modifiers(raw: np.ndarray, positions: Sequence[str], player_classes: Sequence[int]) -> np.ndarray:
+    """
+    Turns a (players x STAT_COLUMNS) matrix of ``N(50, 10)`` draws into stats:
+    clamp to 1..99, then position and class modifiers, each truncated and
+    capped at 99 exactly like ``generate_player_stats``.
+    """
+    stats = np.clip(np.trunc(raw), 1, 99)
+    positions = np.asarray(positions)
+    for position, modifiers in POSITION_MODIFIERS.items():
+        rows = positions == position
+        if not rows.any():
+            continue
+        for attr, mod in modifiers.items():
+            col = STAT_INDEX[attr]
+            stats[rows, col] = np.minimum(99, np.trunc(stats[rows, col] * mod))
+    class_factor = 1 + (5 - np.asarray(player_classes, dtype=np.int64)) * 0.1
+    stats = np.minimum(99, np.trunc(stats * class_factor[:, None]))
+    return stats.astype(np.int64)
+
+
+def generate_stats_batch(
+    positions: Sequence[str],
+    player_classes: Sequence[int],
+    rng: Optional[np.random.Generator] = None,
+) -> List[Dict[str, object]]:
+    """Batch counterpart of ``generate_player_stats``: one stats dict per player."""
+    rng = rng or np.random.default_rng()
+    count = len(positions)
+    stats = apply_stat_modifiers(rng.normal(50, 10, size=(count, len(STAT_COLUMNS))), positions, player_classes)
+
+    bloom_types = rng.integers(0, len(BLOOM_TYPES), size=count)
+    bloom_offsets = rng.integers(0, 2, size=count)
+
+    result = []
+    for row, position in enumerate(positions):
+        attrs = BASE_STATS + (GK_STATS if position == 'Goalkeeper' else FIELD_STATS)
+        values = stats[row].tolist()
+        player_stats = {attr: values[STAT_INDEX[attr]] for attr in attrs}
+        player_stats['base_morale'] = player_stats['morale']
+
+        bloom_type = BLOOM_TYPES[bloom_types[row]]
+        low, high = BLOOM_START_AGES[bloom_type]
+        player_stats['bloom_type'] = bloom_type
+        player_stats['bloom_start_age'] = min(low + int(bloom_offsets[row]), high)
+        player_stats['bloom_seasons_left'] = 0
+        result.append(player_stats)
+    return result
+
+
+def _club_locale(club) -> str:
+    country_code = getattr(club.country, 'code', None) or str(club.country)
+    return country_locales.get(country_code, 'en_US')
+
+
+def bulk_create_players(
+    specs: Sequence[PlayerSpec],
+    *,
+    seed=None,
+    batch_size: int = BULK_CREATE_BATCH_SIZE,
+    name_index: Optional[NameIndex] = None,
+) -> List[Player]:
+    """
+    Generates and inserts one player per spec. The batch insert skips
+    ``Player.save()``, so nationality, the stored rating and personality are
+    filled in here.
+
+    Names come from ``name_index``; jobs of ``NAME_INDEX_PRELOAD_MIN`` or
+    more players preload one (``NameIndex.load``) when none is given.
+    Names taken concurrently since then are redrawn after the insert.
+    """
+    if not specs:
+        return []
+    if name_index is None:
+        name_index = NameIndex.load() if len(specs) >= NAME_INDEX_PRELOAD_MIN else NameIndex()
+    allocator = NameAllocator(name_index, seed=seed)
+    locales = [_club_locale(s.club) for s in specs]
+    rng = np.random.default_rng(seed)
+    stats = generate_stats_batch([s.position for s in specs], [s.player_class for s in specs], rng)
+    names = allocator.allocate(locales)
+    with_personality = getattr(settings, 'USE_PERSONALITY_ENGINE', False)
+
+    players = []
+    for spec, player_stats, (first_name, last_name) in zip(specs, stats, names):
+        player = Player(
+            club=spec.club,
+            first_name=first_name,
+            last_name=last_name,
+            nationality=spec.club.country,
+            age=spec.age,
+            position=spec.position,
+            player_class=spec.player_class,
+            **player_stats,
+        )
+        player.overall_rating = player.calculate_overall_rating()
+        if with_personality:
+            player.personality_traits = PersonalityGenerator.generate()
+        players.append(player)
+    for start in range(0, len(players), batch_size):
+        batch = list(range(start, min(start + batch_size, len(players))))
+        for _ in range(MAX_CONFLICT_RETRIES):
+            clashed = _insert_players([players[idx] for idx in batch])
+            if not clashed:
+                break
+            # Lost these names to a concurrent creator: draw new ones and retry
+            clashed_ids = {id(player) for player in clashed}
+            batch = [idx for idx in batch if id(players[idx]) in clashed_ids]
+            for idx, (first_name, last_name) in zip(batch, allocator.allocate([locales[idx] for idx in batch])):
+                players[idx].first_name, players[idx].last_name = first_name, last_name
+        else:
+            raise NameAllocationError(f"{len(batch)} players kept clashing with concurrent inserts")
+    return players
+
+
+def _column_values(field, players: Sequence[Player]) -> list:
+    # pre_save as in bulk_create: fills auto_now columns such as updated_at
+    values = [field.pre_save(player, True) for player in players]
+    if isinstance(field, (models.IntegerField, models.FloatField, models.BooleanField, models.ForeignKey)):
+        return values
+    if isinstance(field, models.JSONField):
+        return [json.dumps(value, cls=field.encoder) for value in values]
+    return [field.get_db_prep_save(value, connection) for value in values]
+
+
+def _insert_players(players: Sequence[Player]) -> List[Player]:
+    """
+    Inserts unsaved players, sets their ids and returns the ones whose name
+    was taken in the meantime (not inserted). On PostgreSQL this is one
+    ``INSERT ... SELECT FROM unnest() ON CONFLICT DO NOTHING`` with one array
+    parameter per column, skipping the per-value SQL compilation of
+    ``bulk_create``; other backends use ``bulk_create`` and fall back to
+    per-player savepoints on a name clash.
+    """
+    if connection.vendor != 'postgresql':
+        try:
+            with transaction.atomic():
+                Player.objects.bulk_create(players)
+            return []
+        except IntegrityError:
+            clashed = []
+            for player in players:
+                try:
+                    with transaction.atomic():
+                        player.save_base(raw=True, force_insert=True)
+                except IntegrityError:
+                    player.pk = None
+                    clashed.append(player)
+            return clashed
+
+    qn = connection.ops.quote_name
+    fields = [field for field in Player._meta.concrete_fields if not field.primary_key]
+    columns = ", ".join(qn(field.column) for field in fields)
+    arrays = ", ".join(f"%s::{field.db_type(connection)}[]" for field in fields)
+    name_columns = f"{qn('first_name')}, {qn('last_name')}"
+    sql = (
+        f"INSERT INTO {qn(Player._meta.db_table)} ({columns}) "
+        f"SELECT * FROM unnest({arrays}) "
+        f"ON CONFLICT ({name_columns}) DO NOTHING "
+        f"RETURNING {qn(Player._meta.pk.column)}, {name_columns}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [_column_values(field, players) for field in fields])
+        ids = {(first_name, last_name): pk for pk, first_name, last_name in cursor.fetchall()}
+
+    clashed = []
+    for player in players:
+        pk = ids.get((player.first_name, player.last_name))
+        if pk is None:
+            clashed.append(player)
+            continue
+        player.pk = pk
+        player._state.adding = False
+        player._state.db = connection.alias
+    return clashed
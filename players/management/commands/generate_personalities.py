@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.utils import timezone
 from players.models import Player
 from players.personality import PersonalityGenerator
 
@@ -72,6 +73,9 @@ class Command(BaseCommand):
                 # Генерируем новый профиль личности
                 new_personality = PersonalityGenerator.generate()
                 player.personality_traits = new_personality
+                # bulk_update не вызывает auto_now: без updated_at матрица
+                # атрибутов (PlayerAttributeMatrix.refresh) не увидит изменения
+                player.updated_at = timezone.now()
                 players_to_bulk_update.append(player)
                 
                 # Обновляем batch_size игроков за раз
@@ -79,7 +83,7 @@ class Command(BaseCommand):
                     with transaction.atomic():
                         Player.objects.bulk_update(
                             players_to_bulk_update, 
-                            ['personality_traits'],
+                            ['personality_traits', 'updated_at'],
                             batch_size=batch_size
                         )
                     updated_count += len(players_to_bulk_update)
@@ -96,7 +100,7 @@ class Command(BaseCommand):
                 with transaction.atomic():
                     Player.objects.bulk_update(
                         players_to_bulk_update, 
-                        ['personality_traits'],
+                        ['personality_traits', 'updated_at'],
                         batch_size=len(players_to_bulk_update)
                     )
                 updated_count += len(players_to_bulk_update)
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from players.models import Player
+from players.rating import RATING_ATTRS, compute_overall_rating
+
+
+class Command(BaseCommand):
+    help = 'Backfill the stored Player.overall_rating column or verify it against the attributes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only report stale ratings; exit non-zero if any are found',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Number of players read per batch (default: 2000)',
+        )
+
+    def handle(self, *args, **options):
+        verify = options['verify']
+        batch_size = max(options['batch_size'], 1)
+        fields = ('id', 'position', 'experience', 'overall_rating') + RATING_ATTRS
+
+        checked = 0
+        stale = 0
+        last_id = 0
+        while True:
+            rows = list(
+                Player.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values(*fields)[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+            checked += len(rows)
+
+            fixes = []
+            # bulk_update skips auto_now: updated_at is set so that
+            # PlayerAttributeMatrix.refresh() picks the new ratings up
+            now = timezone.now()
+            for row in rows:
+                rating = compute_overall_rating(row['position'], row['experience'], row)
+                if rating != row['overall_rating']:
+                    fixes.append(Player(id=row['id'], overall_rating=rating, updated_at=now))
+            stale += len(fixes)
+
+            if fixes and not verify:
+                with transaction.atomic():
+                    Player.objects.bulk_update(fixes, ['overall_rating', 'updated_at'], batch_size=500)
+
+        if verify:
+            if stale:
+                raise CommandError(f'{stale} of {checked} players have a stale overall_rating')
+            self.stdout.write(self.style.SUCCESS(f'All {checked} player ratings are up to date'))
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Checked {checked} players, updated {stale} ratings')
+        )
@@ -25,11 +25,19 @@ class Command(BaseCommand):
 
             # Используем tqdm для отображения прогресса
             with tqdm(total=total_players) as pbar:
-                # Обрабатываем игроков батчами для экономии памяти
-                for i in range(0, total_players, batch_size):
+                # Обрабатываем игроков батчами для экономии памяти.
+                # Батчи идут по id (keyset): у Player нет сортировки по умолчанию,
+                # а OFFSET без ORDER BY пропускает или повторяет игроков
+                last_id = 0
+                while True:
                     with transaction.atomic():
-                        players = Player.objects.all()[i:i+batch_size]
-                        
+                        players = list(
+                            Player.objects.filter(id__gt=last_id).order_by('id')[:batch_size]
+                        )
+                        if not players:
+                            break
+                        last_id = players[-1].id
+
                         for player in players:
                             # Генерируем новые характеристики
                             stats = generate_player_stats(
@@ -0,0 +1,47 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('players', '0007_player_last_training_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(max_length=64, unique=True, verbose_name='Run ID')),
+                ('scheduled_for', models.DateTimeField(verbose_name='Scheduled For')),
+                ('seed', models.BigIntegerField(verbose_name='Seed')),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed')], default='running', max_length=16, verbose_name='Status')),
+                ('stats', models.JSONField(blank=True, default=dict, help_text='Итоговая статистика, собранная из завершённых чанков', verbose_name='Stats')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+            ],
+            options={
+                'verbose_name': 'Training Run',
+                'verbose_name_plural': 'Training Runs',
+            },
+        ),
+        migrations.CreateModel(
+            name='TrainingRunChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField(verbose_name='Index')),
+                ('club_ids', models.JSONField(default=list, verbose_name='Club IDs')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=16, verbose_name='Status')),
+                ('stats', models.JSONField(blank=True, default=dict, verbose_name='Stats')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Error')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='players.trainingrun', verbose_name='Run')),
+            ],
+            options={
+                'verbose_name': 'Training Run Chunk',
+                'verbose_name_plural': 'Training Run Chunks',
+                'constraints': [models.UniqueConstraint(fields=('run', 'index'), name='uniq_training_run_chunk')],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations, models
+
+from players.rating import RATING_ATTRS, compute_overall_rating
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def backfill_overall_rating(apps, schema_editor):
+    Player = apps.get_model('players', 'Player')
+    fields = ('id', 'position', 'experience') + RATING_ATTRS
+    last_id = 0
+    while True:
+        rows = list(
+            Player.objects.filter(id__gt=last_id)
+            .order_by('id')
+            .values(*fields)[:BACKFILL_BATCH_SIZE]
+        )
+        if not rows:
+            return
+        Player.objects.bulk_update(
+            [
+                Player(
+                    id=row['id'],
+                    overall_rating=compute_overall_rating(row['position'], row['experience'], row),
+                )
+                for row in rows
+            ],
+            ['overall_rating'],
+            batch_size=500,
+        )
+        last_id = rows[-1]['id']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0002_initial'),
+        ('players', '0008_training_run'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='overall_rating',
+            field=models.IntegerField(db_index=True, default=0, editable=False, verbose_name='Overall Rating'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['club', '-overall_rating'], name='player_club_rating_idx'),
+        ),
+        migrations.RunPython(backfill_overall_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('players', '0009_player_overall_rating'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='player',
+            options={'verbose_name': 'Player', 'verbose_name_plural': 'Players'},
+        ),
+    ]
@@ -3,6 +3,8 @@ from django.db.models import JSONField
 from django.conf import settings
 from django_countries.fields import CountryField
 
+from .rating import RATING_ATTRS, RATING_SOURCE_FIELDS, compute_overall_rating
+
 # === Добавленная функция вне класса Player ===
 def get_player_line(player):
     """
@@ -25,6 +27,8 @@ def get_player_line(player):
 
 
 class Player(models.Model):
+    NAME_ORDERING = ('last_name', 'first_name')
+
     POSITIONS = [
         ('Goalkeeper', 'Goalkeeper'),
         ('Right Back', 'Right Back'),
@@ -135,6 +139,14 @@ class Player(models.Model):
     # Новое поле опыта
     experience = models.FloatField(default=0.0, verbose_name="Experience")
 
+    # Хранимый общий рейтинг (см. players/rating.py); пересчитывается в save()
+    overall_rating = models.IntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        verbose_name="Overall Rating",
+    )
+
     # Счётчик, сколько раз уже прокачивали игрока за токены
     boost_count = models.PositiveIntegerField(
         default=0,
@@ -183,11 +195,19 @@ class Player(models.Model):
         help_text="Player personality traits for the Narrative AI Engine"
     )
 
+    # Время последнего изменения строки; по нему PlayerAttributeMatrix
+    # подхватывает изменения. Пакетные записи (тренировка, генерация) ставят его сами.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name="Updated at")
+
     class Meta:
         unique_together = ('first_name', 'last_name')
         verbose_name = 'Player'
         verbose_name_plural = 'Players'
-        ordering = ['last_name', 'first_name']
+        # No default ordering: internal queries (rosters, training, lineups) must not
+        # pay for a text sort. Lists shown to users order explicitly by NAME_ORDERING.
+        indexes = [
+            models.Index(fields=['club', '-overall_rating'], name='player_club_rating_idx'),
+        ]
 
     # === Группы характеристик (полевые игроки) ===
     FIELD_PLAYER_GROUPS = {
@@ -235,6 +255,15 @@ class Player(models.Model):
             from .personality import PersonalityGenerator
             self.personality_traits = PersonalityGenerator.generate()
         
+        # Keep the stored rating in sync with the attributes it is computed from
+        self.overall_rating = self.calculate_overall_rating()
+        update_fields = kwargs.get('update_fields')
+        if update_fields:
+            update_fields = set(update_fields) | {'updated_at'}
+            if RATING_SOURCE_FIELDS.intersection(update_fields):
+                update_fields.add('overall_rating')
+            kwargs['update_fields'] = update_fields
+
         super().save(*args, **kwargs)
 
     @property
@@ -245,33 +274,17 @@ class Player(models.Model):
     def is_goalkeeper(self):
         return self.position == 'Goalkeeper'
 
-    @property
-    def overall_rating(self):
+    def calculate_overall_rating(self):
         """
         Вычисляет общий рейтинг игрока на основе его характеристик,
         учитывая опыт (1% прибавки за 1.0 опыта).
+        Сохранённое значение лежит в поле ``overall_rating``.
         """
-        experience_multiplier = 1 + self.experience * 0.01
-
-        if self.is_goalkeeper:
-            attributes = [
-                self.reflexes, self.handling, self.aerial,
-                self.command, self.distribution, self.one_on_one,
-                self.rebound_control, self.shot_reading,
-                self.strength, self.stamina, self.pace, self.positioning
-            ]
-        else:
-            attributes = [
-                self.strength, self.stamina, self.pace,
-                self.marking, self.tackling, self.work_rate,
-                self.positioning, self.passing, self.crossing,
-                self.dribbling, self.flair, self.heading,
-                self.finishing, self.long_range, self.vision,
-                self.accuracy
-            ]
-
-        adjusted = [int(a * experience_multiplier) for a in attributes]
-        return sum(adjusted) // len(adjusted)
+        return compute_overall_rating(
+            self.position,
+            self.experience,
+            {attr: getattr(self, attr) for attr in RATING_ATTRS},
+        )
 
     def get_position_specific_attributes(self):
         """Возвращает атрибуты, специфичные для позиции игрока."""
@@ -385,4 +398,4 @@ class Player(models.Model):
 
 
 # Импорт модели настроек тренировок
-from .training import TrainingSettings
+from .training import TrainingRun, TrainingRunChunk, TrainingSettings
@@ -0,0 +1,193 @@
+"""
+Player name reservation.
+
+``Player`` names are unique per (first_name, last_name).  Generators draw
+Faker names and check them against a ``NameIndex`` that is loaded once per
+job instead of querying per candidate.  Small tables are held as a set;
+large ones as a Bloom filter whose positives fall back to one batched
+database query.  The index only avoids obvious collisions: inserts still
+resolve races with concurrent creators through the unique constraint
+(``ON CONFLICT DO NOTHING`` or ``IntegrityError``) and retry with new names.
+"""
+import hashlib
+import math
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+from django.db import IntegrityError, transaction
+from faker import Faker
+
+from .models import Player
+
+Name = Tuple[str, str]
+
+# Above this many players the index is a Bloom filter instead of a set.
+SET_PRELOAD_LIMIT = 200_000
+BLOOM_FALSE_POSITIVE_RATE = 0.01
+PRELOAD_CHUNK_SIZE = 10_000
+DB_LOOKUP_BATCH = 2000
+MAX_NAME_ATTEMPTS = 100
+MAX_NAME_ROUNDS = 20
+
+
+class NameAllocationError(Exception):
+    """No free player name could be found."""
+
+
+def fake_name(fake: Faker) -> Name:
+    first_name = fake.first_name_male() if hasattr(fake, 'first_name_male') else fake.first_name()
+    last_name = fake.last_name_male() if hasattr(fake, 'last_name_male') else fake.last_name()
+    return first_name, last_name
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (blake2b double hashing)."""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_FALSE_POSITIVE_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+def _key(name: Name) -> str:
+    return f"{name[0]}\x1f{name[1]}"
+
+
+def _existing_names(candidates: Iterable[Name]) -> Set[Name]:
+    """Which of ``candidates`` exist in the table; one indexed query per batch."""
+    candidates = list(candidates)
+    existing: Set[Name] = set()
+    for start in range(0, len(candidates), DB_LOOKUP_BATCH):
+        batch = set(candidates[start:start + DB_LOOKUP_BATCH])
+        rows = Player.objects.filter(
+            first_name__in={first for first, _ in batch},
+            last_name__in={last for _, last in batch},
+        ).order_by().values_list('first_name', 'last_name')
+        existing.update(batch.intersection(rows))
+    return existing
+
+
+class NameIndex:
+    """
+    Names taken in the table plus names reserved by the current job.
+    Build one per bulk job with ``NameIndex.load()``; a default-constructed
+    index has no snapshot and asks the database for every check.
+    """
+
+    def __init__(self, names: Optional[Set[Name]] = None, bloom: Optional[BloomFilter] = None):
+        self._names = names
+        self._bloom = bloom
+        self._reserved: Set[Name] = set()
+
+    @classmethod
+    def load(cls, set_limit: int = SET_PRELOAD_LIMIT) -> 'NameIndex':
+        total = Player.objects.count()
+        rows = Player.objects.order_by().values_list('first_name', 'last_name').iterator(
+            chunk_size=PRELOAD_CHUNK_SIZE
+        )
+        if total <= set_limit:
+            return cls(names=set(rows))
+        bloom = BloomFilter(total)
+        for name in rows:
+            bloom.add(_key(name))
+        return cls(bloom=bloom)
+
+    def taken(self, candidates: Iterable[Name]) -> Set[Name]:
+        """Which of ``candidates`` are already used (reserved, or in the table)."""
+        candidates = set(candidates)
+        result = candidates & self._reserved
+        unknown = candidates - result
+        if self._names is not None:
+            return result | (unknown & self._names)
+        if self._bloom is not None:
+            unknown = {name for name in unknown if _key(name) in self._bloom}
+        return result | _existing_names(unknown)
+
+    def reserve(self, name: Name) -> None:
+        self._reserved.add(name)
+
+
+class NameAllocator:
+    """Draws unique names per Faker locale against a ``NameIndex``."""
+
+    def __init__(self, index: Optional[NameIndex] = None, seed=None):
+        self.index = index if index is not None else NameIndex()
+        self.seed = seed
+        self._fakers = {}
+
+    def faker(self, locale: str) -> Faker:
+        fake = self._fakers.get(locale)
+        if fake is None:
+            fake = Faker(locale)
+            if self.seed is not None:
+                fake.seed_instance(f"{self.seed}:{locale}")
+            self._fakers[locale] = fake
+        return fake
+
+    def allocate(self, locales: Sequence[str], max_rounds: int = MAX_NAME_ROUNDS) -> List[Name]:
+        """
+        One reserved name per entry of ``locales``. Candidates are drawn in
+        memory and checked against the index in one batch per round. A slot
+        gets ``MAX_NAME_ATTEMPTS`` draws per round to avoid the names already
+        drawn in it; raises ``NameAllocationError`` when the locale pools run
+        out.
+        """
+        names: List[Optional[Name]] = [None] * len(locales)
+        pending = list(range(len(locales)))
+        for _ in range(max_rounds):
+            drawn = {}
+            seen: Set[Name] = set()
+            for idx in pending:
+                fake = self.faker(locales[idx])
+                for _ in range(MAX_NAME_ATTEMPTS):
+                    name = fake_name(fake)
+                    if name not in seen:
+                        seen.add(name)
+                        drawn[idx] = name
+                        break
+            taken = self.index.taken(seen)
+            still_pending = []
+            for idx in pending:
+                name = drawn.get(idx)
+                if name is None or name in taken:
+                    still_pending.append(idx)
+                else:
+                    self.index.reserve(name)
+                    names[idx] = name
+            pending = still_pending
+            if not pending:
+                return names
+        locales_left = ', '.join(sorted({locales[idx] for idx in pending}))
+        raise NameAllocationError(
+            f"Could not find unique names for {len(pending)} players (locales: {locales_left})"
+        )
+
+
+def create_player_with_unique_name(fake: Faker, *, max_attempts: int = MAX_NAME_ATTEMPTS, **fields) -> Player:
+    """
+    Creates a player under a fresh Faker name. The unique constraint decides:
+    a clashing name (including one inserted concurrently) raises
+    ``IntegrityError`` inside a savepoint and the next name is tried.
+    """
+    for _ in range(max_attempts):
+        first_name, last_name = fake_name(fake)
+        try:
+            with transaction.atomic():
+                return Player.objects.create(first_name=first_name, last_name=last_name, **fields)
+        except IntegrityError:
+            if not Player.objects.filter(first_name=first_name, last_name=last_name).exists():
+                raise
+    raise NameAllocationError(f"No free player name after {max_attempts} attempts")
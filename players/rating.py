@@ -0,0 +1,57 @@
+"""
+Overall rating formula.
+
+``Player.overall_rating`` is a stored column; this module is the single place
+that computes it, for one player (``Player.save``), for NumPy chunks (batch
+training) and for the backfill migration / ``sync_overall_ratings`` command.
+"""
+from typing import Mapping, Sequence
+
+import numpy as np
+
+FIELD_RATING_ATTRS = (
+    'strength', 'stamina', 'pace',
+    'marking', 'tackling', 'work_rate',
+    'positioning', 'passing', 'crossing',
+    'dribbling', 'flair', 'heading',
+    'finishing', 'long_range', 'vision',
+    'accuracy',
+)
+GK_RATING_ATTRS = (
+    'reflexes', 'handling', 'aerial',
+    'command', 'distribution', 'one_on_one',
+    'rebound_control', 'shot_reading',
+    'strength', 'stamina', 'pace', 'positioning',
+)
+RATING_ATTRS = tuple(dict.fromkeys(FIELD_RATING_ATTRS + GK_RATING_ATTRS))
+# Every field the rating depends on.
+RATING_SOURCE_FIELDS = frozenset(RATING_ATTRS + ('experience', 'position'))
+
+
+def compute_overall_rating(position: str, experience: float, values: Mapping[str, int]) -> int:
+    """
+    Общий рейтинг: среднее атрибутов позиции с учётом опыта
+    (1% прибавки за 1.0 опыта, каждый атрибут округляется вниз).
+    """
+    experience_multiplier = 1 + (experience or 0) * 0.01
+    attrs = GK_RATING_ATTRS if position == 'Goalkeeper' else FIELD_RATING_ATTRS
+    adjusted = [int(values[attr] * experience_multiplier) for attr in attrs]
+    return sum(adjusted) // len(adjusted)
+
+
+def compute_overall_ratings(
+    values: np.ndarray,
+    columns: Sequence[str],
+    is_goalkeeper: np.ndarray,
+    experience: np.ndarray,
+) -> np.ndarray:
+    """Vectorised ``compute_overall_rating`` for a (players x columns) attribute matrix."""
+    index = {name: col for col, name in enumerate(columns)}
+    multiplier = (1 + experience.astype(float) * 0.01)[:, None]
+    ratings = np.empty(len(values), dtype=np.int64)
+    for mask, attrs in ((~is_goalkeeper, FIELD_RATING_ATTRS), (is_goalkeeper, GK_RATING_ATTRS)):
+        if mask.any():
+            block = values[mask][:, [index[attr] for attr in attrs]]
+            adjusted = np.trunc(block * multiplier[mask]).astype(np.int64)
+            ratings[mask] = adjusted.sum(axis=1) // len(attrs)
+    return ratings
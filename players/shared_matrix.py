@@ -0,0 +1,125 @@
+"""
+Publishing a ``PlayerAttributeMatrix`` to process-pool workers.
+
+The parent loads the matrix once and writes its arrays as ``.npy`` files
+into a run directory; workers open them with ``np.load(mmap_mode='r')``.
+The files are mapped, not read, so attaching takes milliseconds and every
+worker shares the same page-cache pages: memory does not grow with the
+number of workers.  Pointing ``PLAYER_MATRIX_RUN_DIR`` at a tmpfs such as
+``/dev/shm`` keeps the pages off disk entirely.
+
+Typical use::
+
+    with published_matrix(PlayerAttributeMatrix.load()) as path:
+        with ProcessPoolExecutor(initializer=attach_worker_matrix, initargs=(path,)) as pool:
+            ...  # workers call get_attribute_matrix()
+
+An attached matrix is read-only; publish a new one to pick up changes.
+"""
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Iterator, Optional
+
+import numpy as np
+from django.conf import settings
+
+from .attribute_matrix import MATRIX_COLUMNS, PlayerAttributeMatrix, _shared, _shared_lock
+
+ARRAYS = ('ids', 'values', 'experience', 'club_ids', 'positions', 'personality', 'names')
+META_FILE = 'meta.json'
+
+
+class ReadOnlyMatrixError(RuntimeError):
+    """An attached matrix cannot reload or refresh."""
+
+
+class AttachedAttributeMatrix(PlayerAttributeMatrix):
+    """``PlayerAttributeMatrix`` over memory-mapped, read-only arrays."""
+
+    read_only = True
+
+    def __init__(self, path: str):
+        super().__init__(queryset=None)
+        with open(os.path.join(path, META_FILE)) as fh:
+            meta = json.load(fh)
+        if tuple(meta['columns']) != MATRIX_COLUMNS:
+            raise ValueError(f"Matrix at {path} has columns {meta['columns']}, expected {list(MATRIX_COLUMNS)}")
+        for name in ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r'))
+        self.path = path
+        self.version = meta['version']
+
+    def reload(self) -> None:
+        raise ReadOnlyMatrixError("Attached attribute matrix is read-only; publish a new one")
+
+    def refresh(self) -> int:
+        raise ReadOnlyMatrixError("Attached attribute matrix is read-only; publish a new one")
+
+
+def _run_dir_base() -> Optional[str]:
+    return getattr(settings, 'PLAYER_MATRIX_RUN_DIR', None)
+
+
+def publish_matrix(matrix: PlayerAttributeMatrix, run_dir: Optional[str] = None) -> str:
+    """
+    Writes ``matrix`` into a new directory under ``run_dir``
+    (``PLAYER_MATRIX_RUN_DIR`` or the temp directory) and returns its path.
+    The directory only appears once complete, so workers never see a
+    partial matrix.
+    """
+    base = run_dir or _run_dir_base() or tempfile.gettempdir()
+    os.makedirs(base, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.player-matrix-', dir=base)
+    try:
+        arrays = {
+            'ids': matrix.ids,
+            'values': matrix.values,
+            'experience': matrix.experience,
+            'club_ids': matrix.club_ids,
+            'positions': matrix.positions,
+            'personality': matrix.personality,
+            'names': np.array(matrix.names, dtype=str) if len(matrix.names) else np.array([], dtype='<U1'),
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(staging, f'{name}.npy'), np.ascontiguousarray(array))
+        with open(os.path.join(staging, META_FILE), 'w') as fh:
+            json.dump({'columns': list(MATRIX_COLUMNS), 'version': matrix.version, 'rows': len(matrix)}, fh)
+        path = tempfile.mkdtemp(prefix='player-matrix-', dir=base)
+        os.rmdir(path)
+        os.replace(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return path
+
+
+def attach_matrix(path: str) -> AttachedAttributeMatrix:
+    return AttachedAttributeMatrix(path)
+
+
+def remove_published_matrix(path: str) -> None:
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def published_matrix(matrix: PlayerAttributeMatrix, run_dir: Optional[str] = None) -> Iterator[str]:
+    """Publishes ``matrix`` for the duration of the block and removes it afterwards."""
+    path = publish_matrix(matrix, run_dir)
+    try:
+        yield path
+    finally:
+        remove_published_matrix(path)
+
+
+def attach_worker_matrix(path: str) -> None:
+    """
+    Pool initializer: makes ``get_attribute_matrix()`` in this worker return
+    the published matrix instead of loading one from the database.
+    """
+    matrix = attach_matrix(path)
+    with _shared_lock:
+        _shared['matrix'] = matrix
+        _shared['checked'] = 0.0
@@ -1,21 +1,24 @@
 import logging
 from typing import Optional
-from celery import shared_task
+from celery import chord, shared_task
 from django.utils import timezone
 from django.db import transaction
-from django.db.models import Max
+from django.db.models import F, Max
 from django.core.cache import cache
-from datetime import datetime, date, time, timedelta
+from datetime import datetime, date, time, timedelta, timezone as dt_timezone
 import pytz
 from django.conf import settings
 
-from .training_logic import conduct_all_teams_training
+from .training_batch import train_players_batch
 
 logger = logging.getLogger("player_training")
 
 
 TRAINING_CACHE_KEY = "players:last_training_run"
 MAX_CATCHUP_DAYS = 6
+BLOOM_SEASONS = 3
+TRAINING_CLUBS_PER_CHUNK = getattr(settings, "TRAINING_CLUBS_PER_CHUNK", 25)
+TRAINING_STATS_KEYS = ('teams_trained', 'players_trained', 'total_improvements', 'players_in_bloom', 'errors')
 
 def _get_training_timezone():
     tz_name = getattr(settings, "TRAINING_TIMEZONE", "CET")
@@ -43,9 +46,13 @@ def _build_training_timestamp(run_for_date=None):
                 ),
             )
         )
-        return local_dt.astimezone(timezone.utc)
+        return local_dt.astimezone(dt_timezone.utc)
     return timezone.now()
 
+def _training_seed(run_ts):
+    """Seed of a training run; derived from its timestamp so a re-run trains the same way."""
+    return int(run_ts.timestamp())
+
 def _remember_training_run(at_dt):
     try:
         cache.set(TRAINING_CACHE_KEY, at_dt.isoformat())
@@ -98,11 +105,70 @@ def _collect_missed_training_dates(last_run_local, now_local, training_days):
         cursor += timedelta(days=1)
     return missed
 
+def _training_run_id(run_ts):
+    """Run id of a scheduled training; the same slot always maps to the same run."""
+    return run_ts.strftime("%Y%m%dT%H%M%SZ")
+
+def _club_chunks(club_ids, size):
+    size = max(int(size), 1)
+    return [club_ids[i:i + size] for i in range(0, len(club_ids), size)]
+
+def _start_training_run(run_ts):
+    """
+    Returns the ``TrainingRun`` for ``run_ts``, creating it together with its
+    club chunks on first call. Later calls reuse the stored chunks, so a
+    re-queued run only retrains what is not done yet.
+    """
+    from clubs.models import Club
+    from .models import TrainingRun, TrainingRunChunk
+
+    with transaction.atomic():
+        run, created = TrainingRun.objects.select_for_update().get_or_create(
+            run_id=_training_run_id(run_ts),
+            defaults={'scheduled_for': run_ts, 'seed': _training_seed(run_ts)},
+        )
+        if created:
+            club_ids = list(Club.objects.order_by('id').values_list('id', flat=True))
+            TrainingRunChunk.objects.bulk_create(
+                TrainingRunChunk(run=run, index=idx, club_ids=chunk)
+                for idx, chunk in enumerate(_club_chunks(club_ids, TRAINING_CLUBS_PER_CHUNK))
+            )
+    return run
+
+def _aggregate_training_run(run):
+    """Sums chunk stats into the summary shape of ``conduct_all_teams_training``."""
+    from .models import TrainingRunChunk
+
+    stats = {key: 0 for key in TRAINING_STATS_KEYS}
+    pending = 0
+    for chunk in run.chunks.all():
+        if chunk.status == TrainingRunChunk.STATUS_DONE:
+            for key in TRAINING_STATS_KEYS:
+                stats[key] += chunk.stats.get(key, 0)
+        else:
+            pending += 1
+            if chunk.status == TrainingRunChunk.STATUS_FAILED:
+                stats['errors'] += chunk.stats.get('errors', 1)
+    return stats, pending
+
+def _training_run_result(run, stats):
+    return {
+        'status': 'success',
+        'timestamp': run.scheduled_for.isoformat(),
+        'run_id': run.run_id,
+        'seed': run.seed,
+        'stats': stats,
+    }
+
 @shared_task(name='players.conduct_scheduled_training', bind=True)
 def conduct_scheduled_training(self, run_for_date: Optional[str] = None):
     """
     Scheduled team training for all clubs.
     Defaults to Mon/Wed/Fri at 12:00 CET.
+
+    Clubs are split into chunks that train in parallel as a chord of
+    ``train_club_chunk`` subtasks; ``finalize_training_run`` aggregates the
+    summary. Re-running the same date resumes the chunks that are not done.
     """
     run_ts = _build_training_timestamp(run_for_date)
     logger.info(
@@ -112,25 +178,32 @@ def conduct_scheduled_training(self, run_for_date: Optional[str] = None):
     )
 
     try:
-        with transaction.atomic():
-            stats = conduct_all_teams_training(when=run_ts)
+        from .models import TrainingRun, TrainingRunChunk
 
-            logger.info(
-                "[training] Summary: teams=%s players=%s improvements=%s bloom=%s errors=%s",
-                stats.get('teams_trained'),
-                stats.get('players_trained'),
-                stats.get('total_improvements'),
-                stats.get('players_in_bloom'),
-                stats.get('errors'),
-            )
+        run = _start_training_run(run_ts)
+        if run.status == TrainingRun.STATUS_COMPLETED:
+            logger.info("[training] Run %s already completed", run.run_id)
+            return _training_run_result(run, run.stats)
 
-            _remember_training_run(run_ts)
+        pending = list(
+            run.chunks.exclude(status=TrainingRunChunk.STATUS_DONE)
+            .order_by('index')
+            .values_list('index', flat=True)
+        )
+        if not pending:
+            return finalize_training_run([], run.run_id)
 
-            return {
-                'status': 'success',
-                'timestamp': run_ts.isoformat(),
-                'stats': stats,
-            }
+        logger.info("[training] Run %s: dispatching %s chunk(s)", run.run_id, len(pending))
+        chord(train_club_chunk.s(run.run_id, idx) for idx in pending)(
+            finalize_training_run.s(run.run_id)
+        )
+        return {
+            'status': 'queued',
+            'timestamp': run_ts.isoformat(),
+            'run_id': run.run_id,
+            'seed': run.seed,
+            'chunks': len(pending),
+        }
 
     except Exception as e:
         logger.error("[training] Failed to run training: %s", e)
@@ -141,6 +214,91 @@ def conduct_scheduled_training(self, run_for_date: Optional[str] = None):
         }
 
 
+@shared_task(name='players.train_club_chunk', bind=True)
+def train_club_chunk(self, run_id: str, index: int):
+    """
+    Trains one club chunk of a run in its own transaction. The chunk row is
+    locked and marked done in the same transaction, so a redelivered or
+    re-queued chunk is skipped instead of training its players twice. Any
+    failure rolls the whole chunk back and marks it failed, so a resumed
+    run trains it again.
+    """
+    from .models import Player, TrainingRunChunk
+
+    try:
+        with transaction.atomic():
+            chunk = (
+                TrainingRunChunk.objects.select_for_update()
+                .select_related('run')
+                .get(run__run_id=run_id, index=index)
+            )
+            if chunk.status == TrainingRunChunk.STATUS_DONE:
+                return chunk.stats
+            stats = train_players_batch(
+                when=chunk.run.scheduled_for,
+                seed=chunk.run.seed,
+                club_ids=chunk.club_ids,
+                raise_errors=True,
+            )
+            chunk.status = TrainingRunChunk.STATUS_DONE
+            chunk.stats = stats
+            chunk.error = ''
+            chunk.finished_at = timezone.now()
+            chunk.save(update_fields=['status', 'stats', 'error', 'finished_at'])
+            return stats
+    except Exception as e:
+        logger.error("[training] Run %s chunk %s failed: %s", run_id, index, e)
+        chunk_rows = TrainingRunChunk.objects.filter(run__run_id=run_id, index=index)
+        club_ids = chunk_rows.values_list('club_ids', flat=True).first() or []
+        stats = {'errors': Player.objects.filter(club_id__in=club_ids).count()}
+        chunk_rows.update(
+            status=TrainingRunChunk.STATUS_FAILED,
+            stats=stats,
+            error=str(e),
+        )
+        return stats
+
+
+@shared_task(name='players.finalize_training_run', bind=True)
+def finalize_training_run(self, results, run_id: str):
+    """
+    Chord callback: aggregates the stored chunk stats of ``run_id``. The run
+    is marked completed (and remembered for catch-up scheduling) only when
+    every chunk is done.
+    """
+    from .models import TrainingRun
+
+    run = TrainingRun.objects.get(run_id=run_id)
+    stats, pending = _aggregate_training_run(run)
+
+    logger.info(
+        "[training] Summary: teams=%s players=%s improvements=%s bloom=%s errors=%s",
+        stats.get('teams_trained'),
+        stats.get('players_trained'),
+        stats.get('total_improvements'),
+        stats.get('players_in_bloom'),
+        stats.get('errors'),
+    )
+
+    run.stats = stats
+    update_fields = ['stats']
+    if not pending:
+        run.status = TrainingRun.STATUS_COMPLETED
+        run.finished_at = timezone.now()
+        update_fields += ['status', 'finished_at']
+    run.save(update_fields=update_fields)
+
+    if pending:
+        logger.warning("[training] Run %s: %s chunk(s) not done; re-run to resume", run_id, pending)
+        result = _training_run_result(run, stats)
+        result['status'] = 'partial'
+        result['pending_chunks'] = pending
+        return result
+
+    _remember_training_run(run.scheduled_for)
+    return _training_run_result(run, stats)
+
+
 @shared_task(name='players.advance_player_seasons', bind=True)
 def advance_player_seasons(self):
     """
@@ -161,36 +319,20 @@ def advance_player_seasons(self):
     
     try:
         with transaction.atomic():
-            players = Player.objects.all()
-            
-            for player in players:
-                try:
-                    stats['players_processed'] += 1
-                    
-                    # Проверяем, нужно ли запустить расцвет
-                    if player.should_start_bloom():
-                        player.start_bloom()
-                        stats['blooms_started'] += 1
-                        logger.info(
-                            f"🌟 Начат расцвет игрока {player.full_name} "
-                            f"({player.bloom_type}, возраст {player.age})"
-                        )
-                    
-                    # Продвигаем существующий расцвет
-                    if player.is_in_bloom:
-                        old_seasons = player.bloom_seasons_left
-                        player.advance_bloom_season()
-                        
-                        if player.bloom_seasons_left == 0:
-                            stats['blooms_ended'] += 1
-                            logger.info(
-                                f"🏁 Завершен расцвет игрока {player.full_name} "
-                                f"({player.bloom_type})"
-                            )
-                        
-                except Exception as e:
-                    logger.error(f"❌ Ошибка при обработке игрока {player.id}: {e}")
-                    stats['errors'] += 1
+            # Порядок важен и повторяет поштучный цикл: новый расцвет сразу
+            # продвигается на сезон (3 -> 2), а закончившийся в этом сезоне
+            # (1 -> 0) не перезапускается.
+            stats['players_processed'] = Player.objects.count()
+            stats['blooms_started'] = Player.objects.filter(
+                bloom_seasons_left=0,
+                age__gte=F('bloom_start_age'),
+            ).update(bloom_seasons_left=BLOOM_SEASONS)
+            stats['blooms_ended'] = Player.objects.filter(
+                bloom_seasons_left=1,
+            ).update(bloom_seasons_left=0)
+            Player.objects.filter(bloom_seasons_left__gt=1).update(
+                bloom_seasons_left=F('bloom_seasons_left') - 1
+            )
             
             logger.info(
                 f"✅ Сезоны игроков продвинуты. Статистика: "
@@ -151,4 +151,80 @@ class TrainingSettings(models.Model):
             'physical': float(self.gk_physical_weight) / 100,
             'core_gk_skills': float(self.gk_core_skills_weight) / 100,
             'additional_gk_skills': float(self.gk_additional_skills_weight) / 100,
-        }
\ No newline at end of file
+        }
+
+class TrainingRun(models.Model):
+    """Один запуск плановой тренировки; делится на чанки клубов."""
+
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+    ]
+
+    run_id = models.CharField(max_length=64, unique=True, verbose_name="Run ID")
+    scheduled_for = models.DateTimeField(verbose_name="Scheduled For")
+    seed = models.BigIntegerField(verbose_name="Seed")
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_RUNNING,
+        verbose_name="Status",
+    )
+    stats = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Stats",
+        help_text="Итоговая статистика, собранная из завершённых чанков",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Finished At")
+
+    class Meta:
+        verbose_name = 'Training Run'
+        verbose_name_plural = 'Training Runs'
+
+    def __str__(self):
+        return f"Training run {self.run_id} ({self.status})"
+
+
+class TrainingRunChunk(models.Model):
+    """Чанк клубов одного запуска тренировки; обрабатывается отдельной задачей."""
+
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    run = models.ForeignKey(
+        TrainingRun,
+        on_delete=models.CASCADE,
+        related_name='chunks',
+        verbose_name="Run",
+    )
+    index = models.PositiveIntegerField(verbose_name="Index")
+    club_ids = models.JSONField(default=list, verbose_name="Club IDs")
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        verbose_name="Status",
+    )
+    stats = models.JSONField(default=dict, blank=True, verbose_name="Stats")
+    error = models.TextField(blank=True, default='', verbose_name="Error")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Finished At")
+
+    class Meta:
+        verbose_name = 'Training Run Chunk'
+        verbose_name_plural = 'Training Run Chunks'
+        constraints = [
+            models.UniqueConstraint(fields=['run', 'index'], name='uniq_training_run_chunk'),
+        ]
+
+    def __str__(self):
+        return f"{self.run.run_id}#{self.index} ({self.status})"
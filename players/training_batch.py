@@ -0,0 +1,351 @@
+"""
+Batch training engine.
+
+Runs the algorithm of ``training_logic.conduct_player_training`` for a whole
+chunk of players at once: players and their training settings are read with
+two queries into NumPy arrays, bloom, age and weight logic run as array
+operations, and the chunk is written back in one statement.  Only the
+random part (rounding leftovers and veteran degradation) stays per player,
+drawing from the same ``player_rng(seed, player_id)`` stream as the scalar
+path, so a seeded batch run gives every player exactly the scalar result.
+"""
+import json
+import logging
+import random
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Player
+from .rating import compute_overall_ratings
+from .training import TrainingSettings
+from .training_logic import (
+    BASE_TRAINING_POINTS,
+    DEGRADATION_AGE_MODIFIER,
+    DEGRADATION_CHANCE,
+    player_rng,
+)
+
+logger = logging.getLogger("player_training")
+
+DEFAULT_CHUNK_SIZE = 2000
+BULK_UPDATE_BATCH_SIZE = 500
+MAX_TABLE_AGE = 120
+
+FIELD_WEIGHT_FIELDS = {
+    'physical': 'physical_weight',
+    'defensive': 'defensive_weight',
+    'attacking': 'attacking_weight',
+    'mental': 'mental_weight',
+    'technical': 'technical_weight',
+    'tactical': 'tactical_weight',
+}
+GK_WEIGHT_FIELDS = {
+    'physical': 'gk_physical_weight',
+    'core_gk_skills': 'gk_core_skills_weight',
+    'additional_gk_skills': 'gk_additional_skills_weight',
+}
+WEIGHT_FIELDS = list(FIELD_WEIGHT_FIELDS.values()) + list(GK_WEIGHT_FIELDS.values())
+
+TRAINED_ATTRS = list(dict.fromkeys(
+    attr
+    for groups in (Player.FIELD_PLAYER_GROUPS, Player.GOALKEEPER_GROUPS)
+    for attrs in groups.values()
+    for attr in attrs
+))
+ATTR_INDEX = {attr: idx for idx, attr in enumerate(TRAINED_ATTRS)}
+
+PLAYER_FIELDS = ['id', 'age', 'position', 'bloom_type', 'bloom_start_age', 'bloom_seasons_left', 'experience']
+
+UPDATE_FIELDS = TRAINED_ATTRS + [
+    'bloom_seasons_left', 'overall_rating', 'last_trained_at', 'last_training_summary', 'updated_at',
+]
+
+
+def _group_plan(groups: dict, weight_fields: dict) -> List[tuple]:
+    return [
+        (WEIGHT_FIELDS.index(weight_fields[name]), [ATTR_INDEX[attr] for attr in attrs])
+        for name, attrs in groups.items()
+    ]
+
+
+FIELD_PLAN = _group_plan(Player.FIELD_PLAYER_GROUPS, FIELD_WEIGHT_FIELDS)
+GK_PLAN = _group_plan(Player.GOALKEEPER_GROUPS, GK_WEIGHT_FIELDS)
+# Same sequences random.choice draws from in distribute_training_points.
+FIELD_POOL = [ATTR_INDEX[a] for attrs in Player.FIELD_PLAYER_GROUPS.values() for a in attrs]
+GK_POOL = [ATTR_INDEX[a] for attrs in Player.GOALKEEPER_GROUPS.values() for a in attrs]
+
+
+@lru_cache(maxsize=1)
+def _age_modifier_table() -> np.ndarray:
+    """Player.get_age_training_modifier evaluated for every age, for lookups by index."""
+    return np.array([Player(age=age).get_age_training_modifier() for age in range(MAX_TABLE_AGE + 1)])
+
+
+@lru_cache(maxsize=1)
+def _bloom_bonus_by_type() -> Dict[str, float]:
+    return {
+        bloom_type: Player(bloom_type=bloom_type, bloom_seasons_left=1).get_bloom_bonus()
+        for bloom_type, _ in Player.BLOOM_TYPES
+    }
+
+
+def _default_weights() -> List[float]:
+    return [float(TrainingSettings._meta.get_field(name).default) for name in WEIGHT_FIELDS]
+
+
+def _load_weights(player_ids: List[int]) -> np.ndarray:
+    """Training weights (as fractions) per player; creates missing settings rows like get_or_create."""
+    rows = {
+        row[0]: row[1:]
+        for row in TrainingSettings.objects.filter(player_id__in=player_ids).values_list(
+            'player_id', *WEIGHT_FIELDS
+        )
+    }
+    missing = [pid for pid in player_ids if pid not in rows]
+    if missing:
+        TrainingSettings.objects.bulk_create(
+            [TrainingSettings(player_id=pid) for pid in missing],
+            ignore_conflicts=True,
+        )
+    defaults = _default_weights()
+    weights = np.array(
+        [[float(v) for v in rows[pid]] if pid in rows else defaults for pid in player_ids],
+        dtype=float,
+    ).reshape(len(player_ids), len(WEIGHT_FIELDS))
+    return weights / 100
+
+
+def _distribute(points: np.ndarray, weights: np.ndarray, kind_mask: np.ndarray, plan, dist, present, used):
+    """
+    Vectorised group split of distribute_training_points for one player kind.
+    Returns, per group, which players got points for it.
+    """
+    group_active = []
+    for weight_idx, attr_idx in plan:
+        group_points = np.trunc(points * weights[:, weight_idx]).astype(np.int64)
+        group_points = np.where(kind_mask, group_points, 0)
+        active = group_points > 0
+        count = len(attr_idx)
+        base, extra = np.divmod(group_points, count)
+        for position, attr in enumerate(attr_idx):
+            dist[:, attr] += np.where(active, base + (position < extra), 0)
+            present[:, attr] |= active
+        used += group_points
+        group_active.append(active)
+    return group_active
+
+
+def _key_order(row: int, plan, group_active: List[np.ndarray]) -> List[int]:
+    """Insertion order of the distribution dict keys for one player."""
+    order = []
+    for (_, attr_idx), active in zip(plan, group_active):
+        if active[row]:
+            order.extend(a for a in attr_idx if a not in order)
+    return order
+
+
+def _write_back(
+    ids,
+    values: np.ndarray,
+    seasons_left: np.ndarray,
+    ratings: np.ndarray,
+    summaries: List[dict],
+    when,
+) -> None:
+    """
+    Stores a trained chunk. On PostgreSQL this is one ``UPDATE ... FROM unnest()``
+    with one array parameter per column; other backends use chunked bulk_update.
+    ``updated_at`` is set explicitly since neither path runs ``auto_now``.
+    """
+    now = timezone.now()
+    if connection.vendor != 'postgresql':
+        players = [
+            Player(
+                id=pid,
+                bloom_seasons_left=int(seasons_left[row]),
+                overall_rating=int(ratings[row]),
+                last_trained_at=when,
+                updated_at=now,
+                last_training_summary=summaries[row],
+                **dict(zip(TRAINED_ATTRS, values[row].tolist())),
+            )
+            for row, pid in enumerate(ids)
+        ]
+        Player.objects.bulk_update(players, UPDATE_FIELDS, batch_size=BULK_UPDATE_BATCH_SIZE)
+        return
+
+    qn = connection.ops.quote_name
+    columns = [
+        Player._meta.get_field(name).column
+        for name in TRAINED_ATTRS + ['bloom_seasons_left', 'overall_rating']
+    ]
+    assignments = [f"{qn(col)} = v.{qn(col)}" for col in columns]
+    assignments.append(f"{qn('last_trained_at')} = %s")
+    assignments.append(f"{qn('updated_at')} = %s")
+    assignments.append(f"{qn('last_training_summary')} = v.{qn('last_training_summary')}")
+    arrays = ", ".join(["%s::bigint[]"] + ["%s::integer[]"] * len(columns) + ["%s::jsonb[]"])
+    aliases = ", ".join(qn(col) for col in ['id'] + columns + ['last_training_summary'])
+    sql = (
+        f"UPDATE {qn(Player._meta.db_table)} AS p SET {', '.join(assignments)} "
+        f"FROM unnest({arrays}) AS v({aliases}) WHERE p.{qn('id')} = v.{qn('id')}"
+    )
+    params = [when, now, list(ids)]
+    params.extend(values[:, col].tolist() for col in range(len(TRAINED_ATTRS)))
+    params.append(seasons_left.tolist())
+    params.append(ratings.tolist())
+    params.append([json.dumps(summary) for summary in summaries])
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def train_players_chunk(
+    player_ids: List[int],
+    *,
+    when: datetime,
+    seed,
+) -> Dict[str, int]:
+    """
+    Trains the given players (one chunk) and writes them back.
+    Returns ``players_trained``, ``total_improvements`` and ``players_in_bloom``.
+    """
+    rows = list(
+        Player.objects.filter(id__in=player_ids)
+        .order_by()
+        .values_list(*PLAYER_FIELDS, *TRAINED_ATTRS)
+    )
+    if not rows:
+        return {'players_trained': 0, 'total_improvements': 0, 'players_in_bloom': 0}
+    rows.sort(key=lambda row: row[0])
+    ids = [row[0] for row in rows]
+    n_meta = len(PLAYER_FIELDS)
+
+    age = np.array([row[1] for row in rows], dtype=np.int64)
+    is_gk = np.array([row[2] == 'Goalkeeper' for row in rows])
+    bloom_types = [row[3] for row in rows]
+    bloom_start_age = np.array([row[4] for row in rows], dtype=np.int64)
+    seasons_left = np.array([row[5] for row in rows], dtype=np.int64)
+    experience = np.array([row[6] for row in rows], dtype=float)
+    old = np.array([row[n_meta:] for row in rows], dtype=np.int64)
+
+    # Bloom start (Player.should_start_bloom / start_bloom).
+    seasons_left = np.where((age >= bloom_start_age) & (seasons_left == 0), 3, seasons_left)
+    in_bloom = seasons_left > 0
+
+    # Points (calculate_training_points).
+    age_modifier = _age_modifier_table()[np.clip(age, 0, MAX_TABLE_AGE)]
+    bonus_by_type = _bloom_bonus_by_type()
+    bloom_bonus = np.array([bonus_by_type.get(t, 0) for t in bloom_types], dtype=float)
+    total = BASE_TRAINING_POINTS * age_modifier
+    total = np.where(in_bloom, total + BASE_TRAINING_POINTS * bloom_bonus, total)
+    points = np.maximum(1, np.trunc(total).astype(np.int64))
+
+    # Group split (distribute_training_points).
+    weights = _load_weights(ids)
+    dist = np.zeros_like(old)
+    present = np.zeros(old.shape, dtype=bool)
+    used = np.zeros(len(ids), dtype=np.int64)
+    field_active = _distribute(points, weights, ~is_gk, FIELD_PLAN, dist, present, used)
+    gk_active = _distribute(points, weights, is_gk, GK_PLAN, dist, present, used)
+    remaining = points - used
+
+    # Random leftovers and veteran degradation, per player in scalar draw order.
+    delta = dist.copy()
+    degrading = age_modifier < DEGRADATION_AGE_MODIFIER
+    for row in np.flatnonzero((remaining > 0) | degrading):
+        rng = player_rng(seed, ids[row])
+        plan, pool, group_active = (
+            (GK_PLAN, GK_POOL, gk_active) if is_gk[row] else (FIELD_PLAN, FIELD_POOL, field_active)
+        )
+        extras = []
+        for _ in range(remaining[row]):
+            attr = rng.choice(pool)
+            if not present[row, attr]:
+                present[row, attr] = True
+                extras.append(attr)
+            delta[row, attr] += 1
+        if degrading[row]:
+            for attr in _key_order(row, plan, group_active) + extras:
+                if rng.random() < DEGRADATION_CHANCE:
+                    delta[row, attr] = -rng.randint(1, 2)
+
+    new = np.where(present, np.clip(old + delta, 1, 99), old)
+    changed = present & (new != old)
+
+    summaries = [
+        {TRAINED_ATTRS[a]: int(new[row, a] - old[row, a]) for a in np.flatnonzero(changed[row])}
+        for row in range(len(ids))
+    ]
+    ratings = compute_overall_ratings(new, TRAINED_ATTRS, is_gk, experience)
+    _write_back(ids, new, seasons_left, ratings, summaries, when)
+
+    return {
+        'players_trained': len(ids),
+        'total_improvements': int(changed.sum()),
+        'players_in_bloom': int(in_bloom.sum()),
+    }
+
+
+def _player_id_chunks(club_ids: Optional[Iterable[int]], chunk_size: int):
+    qs = Player.objects.filter(club__isnull=False)
+    if club_ids is not None:
+        qs = qs.filter(club_id__in=list(club_ids))
+    last_id = 0
+    while True:
+        chunk = list(qs.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def train_players_batch(
+    when: Optional[datetime] = None,
+    *,
+    seed=None,
+    club_ids: Optional[Iterable[int]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    raise_errors: bool = False,
+) -> Dict:
+    """
+    Batch counterpart of ``conduct_all_teams_training`` with the same stats
+    keys. Each chunk is trained and written in its own transaction; a failed
+    chunk is counted in ``errors``, or re-raised with ``raise_errors``.
+    """
+    from clubs.models import Club
+
+    when = when or timezone.now()
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 31)
+    club_ids = list(club_ids) if club_ids is not None else None
+
+    stats = {
+        'teams_trained': len(club_ids) if club_ids is not None else Club.objects.count(),
+        'players_trained': 0,
+        'total_improvements': 0,
+        'players_in_bloom': 0,
+        'errors': 0,
+    }
+    for chunk in _player_id_chunks(club_ids, chunk_size):
+        try:
+            with transaction.atomic():
+                result = train_players_chunk(chunk, when=when, seed=seed)
+        except Exception as e:
+            logger.error(f"[training] Error training chunk starting at player {chunk[0]}: {e}")
+            if raise_errors:
+                raise
+            stats['errors'] += len(chunk)
+            continue
+        for key, value in result.items():
+            stats[key] += value
+
+    logger.info(
+        "[training] Batch summary seed=%s teams=%s players=%s improvements=%s bloom=%s errors=%s",
+        seed, stats['teams_trained'], stats['players_trained'], stats['total_improvements'],
+        stats['players_in_bloom'], stats['errors'],
+    )
+    return stats
@@ -8,6 +8,16 @@ from .training import TrainingSettings
 
 logger = logging.getLogger("player_training")
 
+BASE_TRAINING_POINTS = 3
+# Players whose age modifier is below this may lose attribute points in training.
+DEGRADATION_AGE_MODIFIER = 0.5
+DEGRADATION_CHANCE = 0.3
+
+
+def player_rng(seed, player_id: int) -> random.Random:
+    """Per-player random stream, so a seeded run trains every player the same way."""
+    return random.Random(f"{seed}:{player_id}")
+
 
 def get_or_create_training_settings(player: Player) -> TrainingSettings:
     """Получает или создает настройки тренировок для игрока."""
@@ -22,7 +32,7 @@ def calculate_training_points(player: Player) -> int:
     Вычисляет базовое количество очков для тренировки игрока.
     Базовое количество: 3 очка за тренировку.
     """
-    base_points = 3
+    base_points = BASE_TRAINING_POINTS
     
     # Модификатор возраста  
     age_modifier = player.get_age_training_modifier()
@@ -41,11 +51,12 @@ def calculate_training_points(player: Player) -> int:
     return max(1, int(total_points))
 
 
-def distribute_training_points(player: Player, total_points: int) -> Dict[str, int]:
+def distribute_training_points(player: Player, total_points: int, rng=None) -> Dict[str, int]:
     """
     Распределяет очки тренировки между группами характеристик
     согласно настройкам игрока.
     """
+    rng = rng or random
     settings = get_or_create_training_settings(player)
     distribution = {}
     
@@ -89,7 +100,7 @@ def distribute_training_points(player: Player, total_points: int) -> Dict[str, i
             all_attrs.extend(group_attrs)
         
         for _ in range(remaining_points):
-            random_attr = random.choice(all_attrs)
+            random_attr = rng.choice(all_attrs)
             if random_attr not in distribution:
                 distribution[random_attr] = 0
             distribution[random_attr] += 1
@@ -97,11 +108,12 @@ def distribute_training_points(player: Player, total_points: int) -> Dict[str, i
     return distribution
 
 
-def apply_training_to_player(player: Player, distribution: Dict[str, int]) -> Dict[str, Tuple[int, int]]:
+def apply_training_to_player(player: Player, distribution: Dict[str, int], rng=None) -> Dict[str, Tuple[int, int]]:
     """
     Применяет изменения характеристик к игроку.
     Возвращает словарь изменений {attribute: (old_value, new_value)}
     """
+    rng = rng or random
     changes = {}
     age_modifier = player.get_age_training_modifier()
     
@@ -110,9 +122,9 @@ def apply_training_to_player(player: Player, distribution: Dict[str, int]) -> Di
             old_value = getattr(player, attr_name)
             
             # Для игроков 30+ лет тренировки могут быть отрицательными
-            if age_modifier < 0.5 and random.random() < 0.3:  # 30% шанс деградации
+            if age_modifier < DEGRADATION_AGE_MODIFIER and rng.random() < DEGRADATION_CHANCE:  # 30% шанс деградации
                 # Отрицательный эффект: теряем 1-2 очка
-                points_change = -random.randint(1, 2)
+                points_change = -rng.randint(1, 2)
             else:
                 points_change = points
             
@@ -127,10 +139,11 @@ def apply_training_to_player(player: Player, distribution: Dict[str, int]) -> Di
     return changes
 
 
-def conduct_player_training(player: Player, when: Optional[datetime] = None) -> Dict:
+def conduct_player_training(player: Player, when: Optional[datetime] = None, rng=None) -> Dict:
     """
     Проводит тренировку для одного игрока.
     Возвращает информацию о результатах тренировки.
+    rng: источник случайности (по умолчанию модуль random), см. player_rng.
     """
     timestamp = when or timezone.now()
 
@@ -142,10 +155,10 @@ def conduct_player_training(player: Player, when: Optional[datetime] = None) ->
     total_points = calculate_training_points(player)
     
     # Распределяем очки между характеристиками
-    distribution = distribute_training_points(player, total_points)
+    distribution = distribute_training_points(player, total_points, rng=rng)
     
     # Применяем изменения
-    changes = apply_training_to_player(player, distribution)
+    changes = apply_training_to_player(player, distribution, rng=rng)
 
     # Сохраняем результаты тренировки
     try:
@@ -3,6 +3,43 @@ import random
 import sys
 import os
 
+# Модификаторы характеристик полевых игроков по позициям
+POSITION_MODIFIERS = {
+    'Center Back': {
+        'marking': 1.2, 'tackling': 1.2, 'heading': 1.1,
+        'strength': 1.1, 'finishing': 0.8, 'dribbling': 0.8
+    },
+    'Right Back': {
+        'pace': 1.1, 'crossing': 1.1, 'stamina': 1.1,
+        'tackling': 1.1, 'marking': 1.1
+    },
+    'Left Back': {
+        'pace': 1.1, 'crossing': 1.1, 'stamina': 1.1,
+        'tackling': 1.1, 'marking': 1.1
+    },
+    # Новый ключ для левого полузащитника:
+    'Left Midfielder': {
+        # Примерные бонусы: фланговому полузащитнику полезнее скорость, дриблинг и кроссы
+        'pace': 1.2,
+        'crossing': 1.2,
+        'dribbling': 1.1,
+        'work_rate': 1.1,
+        'stamina': 1.1
+    },
+    # Исходная логика для "Central Midfielder"
+    'Central Midfielder': {
+        'passing': 1.2,
+        'vision': 1.2,
+        'work_rate': 1.1,
+        'stamina': 1.1,
+        'positioning': 1.1
+    },
+    'Center Forward': {
+        'finishing': 1.3, 'heading': 1.2, 'positioning': 1.2,
+        'strength': 1.1, 'dribbling': 1.1
+    }
+}
+
 def generate_stat(weight=1):
     """Генерирует базовую характеристику"""
     base_value = norm.rvs(50, 10)
@@ -53,46 +90,9 @@ def generate_player_stats(position, player_class):
         }
         stats = {**base_stats, **field_stats}
 
-        # Прежний словарь для различных позиций
-        position_modifiers = {
-            'Center Back': {
-                'marking': 1.2, 'tackling': 1.2, 'heading': 1.1,
-                'strength': 1.1, 'finishing': 0.8, 'dribbling': 0.8
-            },
-            'Right Back': {
-                'pace': 1.1, 'crossing': 1.1, 'stamina': 1.1,
-                'tackling': 1.1, 'marking': 1.1
-            },
-            'Left Back': {
-                'pace': 1.1, 'crossing': 1.1, 'stamina': 1.1,
-                'tackling': 1.1, 'marking': 1.1
-            },
-            # Новый ключ для левого полузащитника:
-            'Left Midfielder': {
-                # Примерные бонусы: фланговому полузащитнику полезнее скорость, дриблинг и кроссы
-                'pace': 1.2,
-                'crossing': 1.2,
-                'dribbling': 1.1,
-                'work_rate': 1.1,
-                'stamina': 1.1
-            },
-            # Исходная логика для "Central Midfielder"
-            'Central Midfielder': {
-                'passing': 1.2,
-                'vision': 1.2,
-                'work_rate': 1.1,
-                'stamina': 1.1,
-                'positioning': 1.1
-            },
-            'Center Forward': {
-                'finishing': 1.3, 'heading': 1.2, 'positioning': 1.2,
-                'strength': 1.1, 'dribbling': 1.1
-            }
-        }
-
         # Применяем модификаторы для соответствующей позиции
-        if position in position_modifiers:
-            for attr, mod in position_modifiers[position].items():
+        if position in POSITION_MODIFIERS:
+            for attr, mod in POSITION_MODIFIERS[position].items():
                 if attr in stats:
                     stats[attr] = min(99, int(stats[attr] * mod))
 
@@ -106,8 +106,8 @@ def get_match_participants(match):
     
     # Если нет событий, берем случайных игроков из команд
     if not participants:
-        home_players = list(match.home_team.player_set.all()[:5])
-        away_players = list(match.away_team.player_set.all()[:5])
+        home_players = list(match.home_team.player_set.order_by('id')[:5])
+        away_players = list(match.away_team.player_set.order_by('id')[:5])
         participants = set(home_players + away_players)
     
     return list(participants)
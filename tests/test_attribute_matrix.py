@@ -0,0 +1,140 @@
+from datetime import timedelta
+from io import StringIO
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from matches.models import Match
+from matches.roster import build_match_rosters
+from matches.views import get_best_players_by_line
+from players.attribute_matrix import MATRIX_COLUMNS, PlayerAttributeMatrix
+from players.models import Player, get_player_line
+from players.training_batch import TRAINED_ATTRS, train_players_chunk
+
+
+pytestmark = pytest.mark.django_db
+
+POSITIONS = ["Goalkeeper", "Center Back", "Left Back", "Central Midfielder", "Center Forward"]
+
+
+@pytest.fixture
+def squad(user_with_club, player_factory):
+    _, club = user_with_club(username="matrix-user", club_name="Matrix FC")
+    players = [
+        player_factory(club, position=pos, idx=idx + 1, strength=40 + idx, passing=50 + 3 * idx, reflexes=60 - idx)
+        for idx, pos in enumerate(POSITIONS)
+    ]
+    return club, players
+
+
+def test_matrix_matches_database_and_views_share_memory(squad):
+    _, players = squad
+    matrix = PlayerAttributeMatrix.load()
+
+    rows = matrix.rows([p.id for p in players])
+    for player, row in zip(players, rows):
+        player.refresh_from_db()
+        assert matrix.values[row].tolist() == [getattr(player, name) for name in MATRIX_COLUMNS]
+        assert matrix.attribute_totals()[row] == player.sum_attributes()
+
+    for view in (matrix.training_view(), matrix.simulation_view(), matrix.ranking_view()):
+        assert np.shares_memory(view, matrix.values)
+    assert matrix.training_view().shape[1] == len(TRAINED_ATTRS)
+    with pytest.raises(KeyError):
+        matrix.rows([max(p.id for p in players) + 1000])
+
+
+def test_refresh_applies_changes_additions_and_deletions(squad, player_factory):
+    club, players = squad
+    matrix = PlayerAttributeMatrix.load(Player.objects.filter(club=club))
+    training_view = matrix.training_view()
+    version = matrix.version
+
+    players[0].strength = 99
+    players[0].save(update_fields=["strength"])
+    train_players_chunk([players[1].id], when=timezone.now(), seed=3)
+    matrix.refresh()
+
+    players[1].refresh_from_db()
+    assert training_view[matrix.row(players[0].id), TRAINED_ATTRS.index("strength")] == 99
+    assert matrix.values[matrix.row(players[1].id)].tolist() == [
+        getattr(players[1], name) for name in MATRIX_COLUMNS
+    ]
+    assert matrix.version > version
+
+    newcomer = player_factory(club, position="Right Back", idx=50)
+    deleted_id = players[2].id
+    players[2].delete()
+    matrix.refresh()
+    assert newcomer.id in matrix
+    assert deleted_id not in matrix
+    assert len(matrix) == len(players)
+
+
+
+
+def test_refresh_notices_delete_and_insert_in_one_interval(squad, player_factory):
+    club, players = squad
+    matrix = PlayerAttributeMatrix.load(Player.objects.filter(club=club))
+
+    deleted_id = players[1].id
+    players[1].delete()
+    newcomer = player_factory(club, position="Left Back", idx=60)
+    # Committed late by a long transaction: outside the updated_at window,
+    # so the row count alone looks unchanged
+    Player.objects.filter(id=newcomer.id).update(updated_at=timezone.now() - timedelta(days=1))
+    matrix.refresh()
+
+    assert deleted_id not in matrix
+    assert newcomer.id in matrix
+    assert sorted(matrix.ids.tolist()) == sorted(Player.objects.filter(club=club).values_list("id", flat=True))
+
+
+def test_refresh_sees_bulk_rating_and_personality_fixes(squad):
+    club, players = squad
+    # Stale rating and no personality, written long before the matrix stamp
+    # (the newest updated_at, here players[-1]'s)
+    Player.objects.filter(club=club).update(updated_at=timezone.now() - timedelta(days=2), personality_traits={})
+    Player.objects.filter(id=players[0].id).update(overall_rating=1)
+    Player.objects.filter(id=players[-1].id).update(updated_at=timezone.now() - timedelta(days=1))
+    matrix = PlayerAttributeMatrix.load(Player.objects.filter(club=club))
+    rating = MATRIX_COLUMNS.index("overall_rating")
+    assert matrix.values[matrix.row(players[0].id), rating] == 1
+    assert not matrix.personality.any()
+
+    call_command("sync_overall_ratings", stdout=StringIO())
+    call_command("generate_personalities", stdout=StringIO())
+    assert matrix.refresh() == len(players)
+
+    players[0].refresh_from_db()
+    assert matrix.values[matrix.row(players[0].id), rating] == players[0].overall_rating != 1
+    assert matrix.personality[matrix.row(players[0].id)].any()
+
+
+def test_rankings_and_rosters_from_matrix_match_model_path(squad, user_with_club):
+    club, players = squad
+    _, away = user_with_club(username="matrix-away", club_name="Matrix Away")
+
+    best = get_best_players_by_line(club)
+    for line in ("GK", "DEF", "MID", "FWD"):
+        candidates = Player.objects.filter(club=club).order_by("id")
+        in_line = [p for p in candidates if get_player_line(p) == line]
+        expected = max(in_line, key=lambda p: p.sum_attributes(), default=None)
+        assert best[line] == expected
+
+    match = Match.objects.create(
+        home_team=club,
+        away_team=away,
+        datetime=timezone.now(),
+        status="in_progress",
+        home_lineup={str(slot): {"playerId": str(p.id)} for slot, p in enumerate(players)},
+    )
+    matrix = PlayerAttributeMatrix.load()
+    with CaptureQueriesContext(connection) as ctx:
+        from_matrix = build_match_rosters(match, matrix=matrix)
+    assert len(ctx.captured_queries) == 0
+    assert from_matrix == build_match_rosters(match)
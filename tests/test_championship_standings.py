@@ -0,0 +1,105 @@
+from datetime import date, time, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from clubs.models import Club
+from matches.models import Match
+from tournaments.models import Championship, ChampionshipMatch, ChampionshipTeam, League, Season
+from tournaments.standings import get_standings
+
+
+pytestmark = pytest.mark.django_db
+
+# (points, goals_for, goals_against); the first two are level on everything
+TABLE = [(10, 8, 2), (10, 8, 2), (10, 5, 1), (7, 4, 4), (3, 2, 6), (0, 1, 13)]
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def championship():
+    start = date(2025, 3, 1)
+    season = Season.objects.create(
+        number=7001, name="Season 7001", start_date=start, end_date=start + timedelta(days=30), is_active=True
+    )
+    league = League.objects.create(name="Standings League", country="AX", level=1)
+    championship = Championship.objects.create(
+        season=season, league=league, start_date=start, end_date=start + timedelta(days=30), match_time=time(18, 0)
+    )
+    for idx, (points, goals_for, goals_against) in enumerate(TABLE):
+        club = Club.objects.create(name=f"Standings {idx}", country="AX", is_bot=True)
+        ChampionshipTeam.objects.create(
+            championship=championship,
+            team=club,
+            points=points,
+            goals_for=goals_for,
+            goals_against=goals_against,
+        )
+    return championship
+
+
+def _club(idx):
+    return Club.objects.get(name=f"Standings {idx}")
+
+
+def test_standings_are_ranked_in_one_query_and_cached(championship):
+    with CaptureQueriesContext(connection) as ctx:
+        rows = get_standings(championship.id)
+    assert len(ctx.captured_queries) == 1
+
+    assert [row.team.name for row in rows] == [f"Standings {idx}" for idx in range(len(TABLE))]
+    assert [row.table_position for row in rows] == [1, 2, 3, 4, 5, 6]
+    assert [row.rank for row in rows] == [1, 1, 3, 4, 5, 6]
+    assert [row.goals_diff for row in rows] == [6, 6, 4, 0, -4, -12]
+    assert [row.promotion_zone for row in rows] == [True, True, False, False, False, False]
+    assert [row.relegation_zone for row in rows] == [False, False, False, False, True, True]
+
+    team = ChampionshipTeam.objects.get(championship=championship, team=_club(4))
+    with CaptureQueriesContext(connection) as ctx:
+        assert get_standings(championship.id) == rows
+        assert team.position == 5
+        assert team.is_relegation_zone and not team.is_promotion_zone
+    assert len(ctx.captured_queries) == 0
+
+
+def test_applied_result_invalidates_cached_table(championship, django_capture_on_commit_callbacks):
+    assert get_standings(championship.id)[-1].team == _club(5)
+
+    match = Match.objects.create(
+        home_team=_club(5), away_team=_club(4), datetime=timezone.now(), status="scheduled"
+    )
+    ChampionshipMatch.objects.create(championship=championship, match=match, round=1, match_day=1)
+    match.status = "finished"
+    match.home_score, match.away_score = 5, 0
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        match.save()
+    assert callbacks
+
+    rows = get_standings(championship.id)
+    assert [row.team.name for row in rows[-2:]] == ["Standings 5", "Standings 4"]
+    assert (rows[-2].points, rows[-2].goals_diff, rows[-2].rank) == (3, -7, 5)
+
+
+def test_standings_api_uses_ranked_table(championship, user_with_club, client):
+    user, _ = user_with_club(username="standings-user", club_name="Standings Viewer")
+    client.force_login(user)
+
+    response = client.get(reverse("tournaments:api_championship_detail", args=[championship.id]))
+
+    assert response.status_code == 200
+    standings = response.json()["standings"]
+    assert [row["position"] for row in standings] == [1, 2, 3, 4, 5, 6]
+    assert [row["goal_diff"] for row in standings] == [6, 6, 4, 0, -4, -12]
+    assert [row["is_relegation_zone"] for row in standings] == [False] * 4 + [True] * 2
+    assert [row["is_promotion_zone"] for row in standings] == [True] * 2 + [False] * 4
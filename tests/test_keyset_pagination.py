@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from clubs.models import Club
+from core.pagination import CursorError, keyset_page
+from matches.models import Match
+from transfers.models import TransferHistory, TransferListing
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def matches():
+    home = Club.objects.create(name="Keyset Home", country="AX", is_bot=True)
+    away = Club.objects.create(name="Keyset Away", country="AX", is_bot=True)
+    base = timezone.now().replace(microsecond=0)
+    # Pairs of matches share a kick-off time, so the id breaks the ties
+    return [
+        Match.objects.create(home_team=home, away_team=away, datetime=base + timedelta(hours=idx // 2))
+        for idx in range(9)
+    ]
+
+
+def _walk(queryset, ordering, page_size):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = keyset_page(queryset, ordering, page_size, cursor)
+        pages.append([row.id for row in rows])
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("ordering", [("-datetime", "id"), ("datetime", "id")])
+def test_cursor_pages_follow_the_ordering_without_count_or_offset(matches, ordering):
+    expected = list(Match.objects.order_by(*ordering).values_list("id", flat=True))
+
+    with CaptureQueriesContext(connection) as ctx:
+        pages = _walk(Match.objects.all(), ordering, 4)
+
+    assert [len(page) for page in pages] == [4, 4, 1]
+    assert sum(pages, []) == expected
+    sql = " ".join(query["sql"] for query in ctx.captured_queries).upper()
+    assert "COUNT(" not in sql and "OFFSET" not in sql
+    assert len(ctx.captured_queries) == 3
+
+    with pytest.raises(CursorError):
+        keyset_page(Match.objects.all(), ordering, 4, "not-a-cursor")
+    _, cursor = keyset_page(Match.objects.all(), ("-datetime", "id"), 4)
+    if ordering != ("-datetime", "id"):
+        with pytest.raises(CursorError):
+            keyset_page(Match.objects.all(), ordering, 4, cursor)
+
+
+@pytest.mark.parametrize("ordering", [("expires_at", "id"), ("-expires_at", "id")])
+def test_nullable_key_puts_nulls_last(user_with_club, player_factory, ordering):
+    _, club = user_with_club(username="keyset-seller")
+    listings = [
+        TransferListing.objects.create(player=player_factory(club, idx=800 + idx), club=club, asking_price=1000)
+        for idx in range(5)
+    ]
+    TransferListing.objects.filter(id__in=[listings[1].id, listings[3].id]).update(expires_at=None)
+    dated = sorted(
+        (listing for listing in listings if listing.id not in {listings[1].id, listings[3].id}),
+        key=lambda listing: (listing.expires_at, listing.id),
+        reverse=ordering[0].startswith("-"),
+    )
+
+    pages = _walk(TransferListing.objects.all(), ordering, 2)
+
+    assert sum(pages, []) == [listing.id for listing in dated] + [listings[1].id, listings[3].id]
+
+
+def test_match_list_api_cursor_mode(client, user_with_club, matches):
+    user, _ = user_with_club(username="keyset-matches")
+    client.force_login(user)
+    club_id = matches[0].home_team_id
+
+    numbered = client.get("/api/matches/", {"club_id": club_id, "page_size": 4}).json()
+    assert numbered["count"] == 9 and numbered["next_cursor"]
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        data = client.get("/api/matches/", {"club_id": club_id, "page_size": 4, "cursor": cursor}).json()
+        assert "total_pages" not in data
+        seen.extend(row["id"] for row in data["results"])
+        cursor = data["next_cursor"]
+    assert seen == list(Match.objects.order_by("-datetime", "id").values_list("id", flat=True))
+
+    # The cursor of a numbered page continues where that page stopped
+    resumed = client.get(
+        "/api/matches/", {"club_id": club_id, "page_size": 4, "cursor": numbered["next_cursor"]}
+    ).json()
+    assert [row["id"] for row in resumed["results"]] == seen[4:8]
+
+    with_total = client.get("/api/matches/", {"club_id": club_id, "cursor": "", "include_total": "1"}).json()
+    assert with_total["count"] > 0 and "count_is_approximate" in with_total
+
+    bad = client.get("/api/matches/", {"club_id": club_id, "cursor": numbered["next_cursor"], "ordering": "datetime"})
+    assert bad.status_code == 400
+
+
+def test_transfer_history_cursor_mode(client, user_with_club, player_factory):
+    user, club = user_with_club(username="keyset-history")
+    _, other = user_with_club(username="keyset-history-other", club_name="Keyset Other")
+    moment = timezone.now()
+    for idx in range(5):
+        TransferHistory.objects.create(
+            player=player_factory(club, idx=900 + idx),
+            from_club=club,
+            to_club=other,
+            transfer_fee=100 + idx,
+            transfer_date=moment - timedelta(days=idx // 2),
+        )
+    client.force_login(user)
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        data = client.get("/api/transfers/history/my/", {"page_size": 2, "cursor": cursor}).json()
+        seen.extend(row["id"] for row in data["results"])
+        cursor = data["next_cursor"]
+
+    assert seen == list(TransferHistory.objects.order_by("-transfer_date", "id").values_list("id", flat=True))
@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from matches.dispatch import TimelineDispatcher, TimerWheel, WheelTimelineDispatcher
+from matches.models import Match, MatchBroadcastEvent
+
+
+pytestmark = pytest.mark.django_db
+
+
+class DummyLayer:
+    def __init__(self):
+        self.messages = []
+
+    async def group_send(self, group, message):
+        self.messages.append((group, message))
+
+
+def _match_with_timeline(user_with_club, prefix, start, offsets, minute=3):
+    _, home = user_with_club(username=f"{prefix}-home", club_name=f"{prefix} Home")
+    _, away = user_with_club(username=f"{prefix}-away", club_name=f"{prefix} Away")
+    match = Match.objects.create(
+        home_team=home,
+        away_team=away,
+        datetime=start,
+        status="in_progress",
+        current_minute=minute,
+    )
+    for idx, offset in enumerate(offsets, start=1):
+        payload = {"kind": "micro_pass", "display_text": f"line {idx}"}
+        if idx == len(offsets):
+            payload["score_update"] = {"home": 1, "away": 0, "minute": minute}
+        MatchBroadcastEvent.objects.create(
+            match=match,
+            game_minute=minute,
+            idx_in_minute=idx,
+            payload_json=payload,
+            scheduled_at=start + timedelta(seconds=offset),
+            idempotency_key=f"{match.id}:{minute}:{idx}",
+        )
+    return match
+
+
+def test_timer_wheel_pops_in_schedule_order():
+    wheel = TimerWheel(resolution=0.5)
+    base = timezone.now()
+    wheel.add(base + timedelta(seconds=2.1), "c")
+    wheel.add(base + timedelta(seconds=0.2), "a")
+    wheel.add(base + timedelta(seconds=2.0), "b")
+
+    assert wheel.next_due() == base + timedelta(seconds=0.2)
+    assert wheel.pop_due(base) == []
+    assert wheel.pop_due(base + timedelta(seconds=2.05)) == ["a", "b"]
+    assert len(wheel) == 1
+    assert wheel.pop_due(base + timedelta(seconds=5)) == ["c"]
+    assert wheel.next_due() is None
+
+
+def test_polling_dispatcher_marks_batch_sent(user_with_club):
+    start = timezone.now() - timedelta(seconds=10)
+    match = _match_with_timeline(user_with_club, "poll", start, [1, 2])
+    layer = DummyLayer()
+
+    sent = TimelineDispatcher(match.id, channel_layer=layer).dispatch_ready(now=timezone.now())
+
+    assert sent == 2
+    assert [msg["type"] for _, msg in layer.messages] == ["commentary_line", "commentary_line", "score_update"]
+    assert set(match.broadcast_events.values_list("status", flat=True)) == {MatchBroadcastEvent.STATUS_SENT}
+
+
+def test_wheel_dispatcher_fires_from_memory_with_one_update(user_with_club):
+    start = timezone.now()
+    match = _match_with_timeline(user_with_club, "wheel", start, [1, 2, 30])
+    layer = DummyLayer()
+    dispatcher = WheelTimelineDispatcher(match.id, channel_layer=layer)
+
+    assert dispatcher.load_minute(3) == 3
+    assert dispatcher.load_minute(3) == 0  # already scheduled
+    assert dispatcher.next_due() == start + timedelta(seconds=1)
+
+    with CaptureQueriesContext(connection) as ctx:
+        sent = dispatcher.dispatch_ready(now=start + timedelta(seconds=5))
+    assert sent == 2
+    assert len(ctx.captured_queries) == 1
+    assert ctx.captured_queries[0]["sql"].startswith("UPDATE")
+    assert [msg["data"]["display_text"] for _, msg in layer.messages] == ["line 1", "line 2"]
+
+    pending = match.broadcast_events.filter(status=MatchBroadcastEvent.STATUS_PENDING)
+    assert list(pending.values_list("idx_in_minute", flat=True)) == [3]
+    assert dispatcher.has_pending()
+
+
+def test_wheel_dispatcher_resend_due_recovers_from_database(user_with_club):
+    start = timezone.now() - timedelta(seconds=20)
+    match = _match_with_timeline(user_with_club, "resend", start, [1, 2])
+    layer = DummyLayer()
+
+    # A fresh dispatcher (e.g. after a restart) knows nothing until it reloads.
+    dispatcher = WheelTimelineDispatcher(match.id, channel_layer=layer)
+    assert dispatcher.dispatch_ready(now=timezone.now()) == 0
+    assert dispatcher.resend_due(now=timezone.now()) == 2
+    assert not match.broadcast_events.filter(status=MatchBroadcastEvent.STATUS_PENDING).exists()
+
+
+class FlakyLayer(DummyLayer):
+    def __init__(self, fail_on_call):
+        super().__init__()
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+
+    async def group_send(self, group, message):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise ConnectionError("channel layer down")
+        await super().group_send(group, message)
+
+
+def test_wheel_dispatcher_retries_events_of_a_failed_batch(user_with_club):
+    start = timezone.now() - timedelta(seconds=20)
+    match = _match_with_timeline(user_with_club, "flaky", start, [1, 2, 3])
+    layer = FlakyLayer(fail_on_call=2)
+    dispatcher = WheelTimelineDispatcher(match.id, channel_layer=layer)
+    dispatcher.load_minute(3)
+
+    with pytest.raises(ConnectionError):
+        dispatcher.dispatch_ready(now=timezone.now(), batch_size=1)
+    pending = match.broadcast_events.filter(status=MatchBroadcastEvent.STATUS_PENDING)
+    assert list(pending.values_list("idx_in_minute", flat=True).order_by("idx_in_minute")) == [2, 3]
+    assert dispatcher.has_pending()
+
+    # The unsent events are still scheduled: the runner's next pass sends them
+    assert dispatcher.resend_due(now=timezone.now()) == 2
+    assert not pending.exists()
+    assert [msg["data"]["display_text"] for _, msg in layer.messages if msg["type"] == "commentary_line"] == [
+        "line 1", "line 2", "line 3",
+    ]
+    assert not dispatcher.has_pending()
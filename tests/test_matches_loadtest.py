@@ -0,0 +1,84 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from matches.loadtest import minute_broadcasts, percentile
+from matches.models import Match
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def watched_match(user_with_club, player_factory):
+    _, home = user_with_club(username="bench-home", club_name="Bench Home")
+    _, away = user_with_club(username="bench-away", club_name="Bench Away")
+    lineups = {}
+    for side, club, base in (("home", home, 300), ("away", away, 400)):
+        players = [player_factory(club, position="Central Midfielder", idx=base + i) for i in range(6)]
+        lineups[side] = {str(i): {"playerId": str(p.id)} for i, p in enumerate(players)}
+    return Match.objects.create(
+        home_team=home,
+        away_team=away,
+        datetime=timezone.now(),
+        status="in_progress",
+        home_lineup=lineups["home"],
+        away_lineup=lineups["away"],
+    )
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 99) is None
+    assert percentile([5.0, 1.0, 3.0], 50) == 3.0
+    assert percentile(list(range(1, 101)), 99) == 99
+
+
+def test_minute_broadcasts_replays_minutes_without_touching_match(watched_match):
+    plan = minute_broadcasts(watched_match, 2, 1.0)
+
+    offsets = [offset for offset, _ in plan]
+    assert offsets == sorted(offsets)
+    assert offsets[-1] == pytest.approx(2.0)
+    assert [m["data"]["minute"] for _, m in plan if m["type"] == "match_update"] == [1, 2]
+    assert any(m["type"] == "commentary_line" for _, m in plan)
+    watched_match.refresh_from_db()
+    assert watched_match.markov_token is None
+
+
+def test_bench_spectators_reports_latency_and_delivers_everything(watched_match):
+    out = StringIO()
+    call_command(
+        "bench_spectators",
+        match=watched_match.id,
+        clients=15,
+        minutes=1,
+        speed=0.5,
+        max_lost=0,
+        json=True,
+        stdout=out,
+    )
+
+    report = json.loads(out.getvalue())
+    assert report["connected"] == 15
+    assert report["lost"] == 0
+    assert report["delivered"] == report["expected"] > 0
+    assert report["delivery_p50_ms"] <= report["delivery_p99_ms"]
+    assert report["connect_p99_ms"] is not None
+    assert report["msgs_per_sec"] > 0
+
+
+def test_bench_spectators_fails_the_gate(watched_match):
+    with pytest.raises(CommandError, match="regression"):
+        call_command(
+            "bench_spectators",
+            match=watched_match.id,
+            clients=2,
+            minutes=1,
+            speed=0.2,
+            min_msgs_per_sec=10 ** 9,
+            json=True,
+            stdout=StringIO(),
+        )
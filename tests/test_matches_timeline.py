@@ -0,0 +1,188 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from matches.models import Match, MatchBroadcastEvent
+from matches.realtime_clock import get_realtime_config
+from matches.timeline import (
+    BroadcastItem,
+    build_and_store_minute_timeline,
+    build_minute_timeline,
+    persist_broadcast_items,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def live_match(user_with_club):
+    _, home = user_with_club(username="tl-home", club_name="Timeline Home")
+    _, away = user_with_club(username="tl-away", club_name="Timeline Away")
+    return Match.objects.create(
+        home_team=home,
+        away_team=away,
+        datetime=timezone.now(),
+        status="in_progress",
+        current_minute=12,
+    )
+
+
+def _items(match, minute, start, texts):
+    return [
+        BroadcastItem(
+            idx=idx,
+            scheduled_at=start + timedelta(seconds=idx * 3),
+            payload={"kind": "micro_pass", "display_text": text},
+            idempotency_key=f"{match.id}:{minute}:{idx}",
+        )
+        for idx, text in enumerate(texts, start=1)
+    ]
+
+
+def test_persist_broadcast_items_uses_single_upsert_per_minute(live_match):
+    start = timezone.now()
+    items = _items(live_match, 12, start, ["a", "b", "c", "d", "e", "f"])
+
+    with CaptureQueriesContext(connection) as ctx:
+        stored = persist_broadcast_items(live_match, 12, items)
+
+    inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+    assert len(inserts) == 1
+    assert len(ctx.captured_queries) <= 2
+    assert [obj.idx_in_minute for obj in stored] == [1, 2, 3, 4, 5, 6]
+    assert all(obj.pk for obj in stored)
+    assert MatchBroadcastEvent.objects.filter(match=live_match, game_minute=12).count() == 6
+
+
+def test_persist_broadcast_items_is_idempotent_and_keeps_sent_rows(live_match):
+    start = timezone.now()
+    first = persist_broadcast_items(live_match, 12, _items(live_match, 12, start, ["a", "b"]))
+    first[0].mark_sent(start)
+
+    later = start + timedelta(seconds=1)
+    stored = persist_broadcast_items(live_match, 12, _items(live_match, 12, later, ["x", "y"]))
+
+    assert MatchBroadcastEvent.objects.filter(match=live_match).count() == 2
+    sent, pending = (MatchBroadcastEvent.objects.get(pk=obj.pk) for obj in stored)
+    assert sent.status == MatchBroadcastEvent.STATUS_SENT
+    assert sent.payload_json["display_text"] == "a"
+    assert sent.scheduled_at == start + timedelta(seconds=3)
+    assert pending.status == MatchBroadcastEvent.STATUS_PENDING
+    assert pending.payload_json["display_text"] == "y"
+    assert pending.scheduled_at == later + timedelta(seconds=6)
+    assert pending.pk == first[1].pk
+
+
+ROSTERS = {
+    "home": {"MID": [{"id": 11, "name": "Hart", "stats": {}}, {"id": 12, "name": "Stone", "stats": {}}]},
+    "away": {"DEF": [{"id": 21, "name": "Vale", "stats": {}}, {"id": 22, "name": "Reed", "stats": {}}]},
+}
+
+SUMMARY = {
+    "minute": 12,
+    "score": {"home": 1, "away": 0},
+    "score_total": {"home": 2, "away": 1},
+    "possession_end": "away",
+    "pure_narrative": [],
+    "events": [
+        {"tick": 1, "from": "OPEN_PLAY_MID", "to": "OPEN_PLAY_MID", "label": "PASS:SHORT",
+         "possession": "home", "prev_possession": "home", "zone": "MID", "turnover": False,
+         "actor_id": 11, "actor_name": "Hart"},
+        {"tick": 3, "from": "SHOT", "to": "KICKOFF", "label": "SHOT:GOAL",
+         "possession": "away", "prev_possession": "home", "zone": "FINAL", "turnover": True,
+         "actor_id": 12, "actor_name": "Stone", "narrative": "Goal! Stone scores"},
+        {"tick": 5, "from": "OPEN_PLAY_MID", "to": "OPEN_PLAY_MID", "label": "TURNOVER",
+         "possession": "home", "prev_possession": "away", "zone": "MID", "turnover": True},
+    ],
+}
+
+
+def test_build_minute_timeline_places_tick_events_in_their_window(live_match):
+    config = get_realtime_config(enabled=True, seconds_per_game_minute=60, jitter_ms=0)
+    start = timezone.now()
+
+    with CaptureQueriesContext(connection) as ctx:
+        items = build_minute_timeline(
+            live_match, SUMMARY, rosters=ROSTERS, config=config, minute_start=start, tick_seconds=10
+        )
+
+    assert ctx.captured_queries == []
+    assert [item.payload["tick"] for item in items] == [1, 3, 5]
+    for item in items:
+        offset = (item.scheduled_at - start).total_seconds()
+        tick = item.payload["tick"]
+        assert (tick - 1) * 10 <= offset <= tick * 10
+
+    passing, goal, turnover = (item.payload for item in items)
+    assert passing["kind"] == "micro_pass"
+    assert passing["players"] == [11, 12]
+    assert passing["display_text"].startswith("Hart keeps it simple for Stone")
+    assert goal["kind"] == "goal"
+    assert goal["display_text"] == "Goal! Stone scores"
+    assert goal["score_update"] == {"home": 2, "away": 1, "minute": 12}
+    assert goal["team_id"] == live_match.away_team_id
+    assert turnover["possession_update"]["team_id"] == live_match.home_team_id
+    assert [item.idempotency_key for item in items] == [f"{live_match.id}:12:{i}" for i in (1, 2, 3)]
+
+
+def test_build_minute_timeline_scales_ticks_to_short_minutes(live_match):
+    config = get_realtime_config(enabled=True, seconds_per_game_minute=6, jitter_ms=0, min_events_per_minute=5)
+    start = timezone.now()
+
+    items = build_minute_timeline(live_match, SUMMARY, rosters=ROSTERS, config=config, minute_start=start)
+
+    offsets = [(item.scheduled_at - start).total_seconds() for item in items]
+    assert len(items) == 5
+    assert offsets == sorted(offsets)
+    assert all(0 <= offset < 6 for offset in offsets)
+    fillers = [item.payload for item in items if "tick" in item.payload and item.payload["tick"] in (2, 4)]
+    assert all(player in (21, 22) for payload in fillers for player in payload["players"])
+
+
+def test_build_and_store_minute_timeline_runs_markov_once_from_cached_roster(
+    user_with_club, player_factory
+):
+    _, home = user_with_club(username="tick-home", club_name="Tick Home")
+    _, away = user_with_club(username="tick-away", club_name="Tick Away")
+    positions = ["Goalkeeper", "Center Back", "Central Midfielder", "Center Forward"]
+    lineups = {}
+    for side, club, base in (("home", home, 100), ("away", away, 200)):
+        players = [
+            player_factory(club, first_name=side, position=positions[i % 4], idx=base + i, passing=60)
+            for i in range(8)
+        ]
+        lineups[side] = {str(i): {"playerId": str(p.id)} for i, p in enumerate(players)}
+    match = Match.objects.create(
+        home_team=home,
+        away_team=away,
+        datetime=timezone.now(),
+        status="in_progress",
+        current_minute=1,
+        home_lineup=lineups["home"],
+        away_lineup=lineups["away"],
+    )
+    config = get_realtime_config(enabled=True, seconds_per_game_minute=30)
+
+    stored = build_and_store_minute_timeline(match.id, config=config)
+
+    match.refresh_from_db()
+    assert stored
+    assert match.markov_last_summary["minute"] == 1
+    assert match.realtime_last_broadcast_minute == 1
+    token = match.markov_token
+    ticks = [obj.payload_json["tick"] for obj in stored]
+    assert ticks == sorted(ticks)
+
+    # Rebuilding the same minute reuses the summary and the cached roster.
+    MatchBroadcastEvent.objects.filter(match=match).delete()
+    with CaptureQueriesContext(connection) as ctx:
+        rebuilt = build_and_store_minute_timeline(match.id, config=config)
+
+    match.refresh_from_db()
+    assert match.markov_token == token
+    assert [obj.payload_json for obj in rebuilt] == [obj.payload_json for obj in stored]
+    assert not [q for q in ctx.captured_queries if "players_player" in q["sql"]]
@@ -0,0 +1,88 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from matches.models import Match
+from matches.personality_engine import (
+    PERSONALITY_TRAITS,
+    PersonalityModifier,
+    RosterPersonality,
+    personality_modifier_vector,
+)
+from matches.roster import build_match_rosters
+
+PASS_CONTEXTS = [{}, {"pass_type": "long"}, {"pass_type": "through"}, {"pass_type": "short"}]
+SHOT_CONTEXTS = [
+    {},
+    {"shot_type": "long"},
+    {"shot_type": "penalty"},
+    {"shot_type": "close", "match_minute": 80},
+    {"shot_type": "penalty", "match_minute": 88},
+    {"shot_type": "long", "match_minute": 76},
+]
+ACTIONS = ["pass", "shoot", "dribble", "tackle", "cross"]
+
+
+def _random_traits(rng):
+    traits = {name: rng.randint(1, 20) for name in PERSONALITY_TRAITS}
+    for name in rng.sample(PERSONALITY_TRAITS, rng.randint(0, 3)):
+        del traits[name]
+    return traits
+
+
+@override_settings(USE_PERSONALITY_ENGINE=True)
+def test_vectors_reproduce_personality_modifier_outputs():
+    rng = random.Random(11)
+    for traits in [{}, None] + [_random_traits(rng) for _ in range(200)]:
+        player = SimpleNamespace(id=1, personality_traits=traits)
+        entry = {"personality": personality_modifier_vector(traits)}
+
+        assert RosterPersonality.get_foul_modifier(entry) == PersonalityModifier.get_foul_modifier(player)
+        for context in PASS_CONTEXTS:
+            assert RosterPersonality.get_pass_modifier(entry, context) == PersonalityModifier.get_pass_modifier(
+                player, context
+            )
+        for context in SHOT_CONTEXTS:
+            assert RosterPersonality.get_shot_modifier(entry, context) == PersonalityModifier.get_shot_modifier(
+                player, context
+            )
+        for action in ACTIONS:
+            assert RosterPersonality.get_decision_modifier(
+                entry, action
+            ) == PersonalityModifier.get_decision_modifier(player, action)
+        assert RosterPersonality.get_morale_influence(entry) == PersonalityModifier.get_morale_influence(player)
+
+
+@pytest.mark.django_db
+def test_roster_snapshot_carries_vectors_fixed_at_kickoff(user_with_club, player_factory):
+    _, home = user_with_club(username="pv-home", club_name="Vector Home")
+    _, away = user_with_club(username="pv-away", club_name="Vector Away")
+    traits = {"aggression": 19, "patience": 2, "confidence": 17, "endurance": 15}
+    player = player_factory(home, position="Center Back", personality_traits=traits)
+    match = Match.objects.create(
+        home_team=home,
+        away_team=away,
+        datetime=timezone.now(),
+        status="in_progress",
+        home_lineup={"0": {"playerId": str(player.id)}},
+    )
+
+    with override_settings(USE_PERSONALITY_ENGINE=False):
+        assert "personality" not in build_match_rosters(match)["home"]["DEF"][0]
+
+    with override_settings(USE_PERSONALITY_ENGINE=True):
+        entry = build_match_rosters(match)["home"]["DEF"][0]
+        expected = PersonalityModifier.get_shot_modifier(player, {"shot_type": "penalty", "match_minute": 90})
+    assert entry["personality"] == personality_modifier_vector(traits)
+
+    # The fast path reads only the snapshot, not the current settings
+    with override_settings(USE_PERSONALITY_ENGINE=False):
+        assert RosterPersonality.get_shot_modifier(entry, {"shot_type": "penalty", "match_minute": 90}) == expected
+    assert RosterPersonality.get_pass_modifier({}, {"pass_type": "long"}) == {
+        "accuracy": 0.0,
+        "preference": 0.0,
+        "risk": 0.0,
+    }
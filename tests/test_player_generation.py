@@ -0,0 +1,75 @@
+import itertools
+
+import numpy as np
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from clubs.models import Club
+from players import generation, utils
+from players import names as player_names
+from players.generation import (
+    STAT_COLUMNS,
+    STAT_INDEX,
+    PlayerSpec,
+    apply_stat_modifiers,
+    bulk_create_players,
+    generate_stats_batch,
+)
+from players.models import Player
+
+POSITIONS = [choice for choice, _ in Player.POSITIONS]
+
+
+@pytest.mark.parametrize("draw", [-3.0, 12.4, 47.9, 71.2, 95.5])
+def test_batch_modifiers_match_scalar_generator(monkeypatch, draw):
+    monkeypatch.setattr(utils.norm, "rvs", lambda loc, scale: draw)
+    cases = list(itertools.product(POSITIONS, range(1, 6)))
+
+    batch = apply_stat_modifiers(
+        np.full((len(cases), len(STAT_COLUMNS)), draw),
+        [position for position, _ in cases],
+        [player_class for _, player_class in cases],
+    )
+
+    for row, (position, player_class) in enumerate(cases):
+        scalar = utils.generate_player_stats(position, player_class)
+        for attr, col in STAT_INDEX.items():
+            if attr in scalar:
+                assert batch[row, col] == scalar[attr], (position, player_class, attr)
+
+
+def test_generate_stats_batch_shapes_stats_like_scalar_generator():
+    stats = generate_stats_batch(["Goalkeeper", "Center Forward"] * 50, [4] * 100, np.random.default_rng(1))
+
+    gk, fwd = stats[0], stats[1]
+    assert "reflexes" in gk and "finishing" not in gk
+    assert "finishing" in fwd and "reflexes" not in fwd
+    assert all(s["base_morale"] == s["morale"] for s in stats)
+    assert {s["bloom_type"] for s in stats} == {"early", "middle", "late"}
+    for s in stats:
+        low, high = generation.BLOOM_START_AGES[s["bloom_type"]]
+        assert low <= s["bloom_start_age"] <= high
+
+
+@pytest.mark.django_db
+def test_bulk_create_players_resolves_name_collisions_in_memory(monkeypatch):
+    club = Club.objects.create(name="Bulk FC", country="GB", is_bot=True)
+    Player.objects.create(first_name="Taken", last_name="Name", club=club, nationality="GB")
+    names = iter(
+        [("Taken", "Name"), ("Same", "Name"), ("Same", "Name")]
+        + [(f"First{idx}", f"Last{idx}") for idx in range(100)]
+    )
+    monkeypatch.setattr(player_names, "fake_name", lambda fake: next(names))
+    specs = [PlayerSpec(club=club, position=POSITIONS[idx % len(POSITIONS)], player_class=3) for idx in range(40)]
+
+    with CaptureQueriesContext(connection) as ctx:
+        created = bulk_create_players(specs, seed=7)
+
+    assert len(created) == 40
+    assert len(ctx.captured_queries) <= 4
+    stored = list(Player.objects.filter(club=club).exclude(first_name="Taken"))
+    assert len({(p.first_name, p.last_name) for p in stored}) == 40
+    assert ("Same", "Name") in {(p.first_name, p.last_name) for p in stored}
+    assert all(p.overall_rating == p.calculate_overall_rating() for p in stored)
+    assert all(p.nationality.code == "GB" for p in stored)
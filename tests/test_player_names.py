@@ -0,0 +1,86 @@
+import pytest
+
+from clubs.models import Club
+from players import names as player_names
+from players.generation import PlayerSpec, bulk_create_players
+from players.models import Player
+from players.names import BloomFilter, NameAllocationError, NameAllocator, NameIndex, create_player_with_unique_name
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def club():
+    return Club.objects.create(name="Names FC", country="GB", is_bot=True)
+
+
+@pytest.fixture
+def fake_names(monkeypatch):
+    def _use(*sequence):
+        names = iter(sequence)
+        monkeypatch.setattr(player_names, "fake_name", lambda fake: next(names))
+
+    return _use
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    keys = [f"first{idx}\x1flast{idx}" for idx in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    assert sum(f"other{idx}" in bloom for idx in range(1000)) < 50
+
+
+@pytest.mark.parametrize("set_limit", [10, 0], ids=["set", "bloom"])
+def test_name_index_reports_taken_and_reserved_names(club, set_limit, django_assert_max_num_queries):
+    Player.objects.create(first_name="Taken", last_name="Name", club=club, nationality="GB")
+    index = NameIndex.load(set_limit=set_limit)
+    index.reserve(("Reserved", "Name"))
+
+    with django_assert_max_num_queries(1):
+        taken = index.taken({("Taken", "Name"), ("Reserved", "Name"), ("Free", "Name")})
+
+    assert taken == {("Taken", "Name"), ("Reserved", "Name")}
+
+
+def test_bulk_create_retries_names_taken_by_concurrent_creator(club, fake_names):
+    Player.objects.create(first_name="Raced", last_name="Name", club=club, nationality="GB")
+    fake_names(("Raced", "Name"), ("Fresh", "One"), ("Fresh", "Two"))
+    # Snapshot taken before the concurrent insert: it does not know the name.
+    stale_index = NameIndex(names=set())
+
+    created = bulk_create_players(
+        [PlayerSpec(club=club, position="Goalkeeper", player_class=3)] * 2,
+        name_index=stale_index,
+    )
+
+    assert sorted((p.first_name, p.last_name) for p in created) == [("Fresh", "One"), ("Fresh", "Two")]
+    assert all(p.pk for p in created)
+    assert Player.objects.filter(first_name="Raced").count() == 1
+
+
+def test_create_player_with_unique_name_retries_on_conflict(club, fake_names):
+    Player.objects.create(first_name="Taken", last_name="Name", club=club, nationality="GB")
+    fake_names(("Taken", "Name"), ("Taken", "Name"), ("Free", "Name"))
+
+    player = create_player_with_unique_name(None, club=club, nationality="GB", position="Goalkeeper")
+
+    assert (player.first_name, player.last_name) == ("Free", "Name")
+
+    fake_names(*[("Taken", "Name")] * 3)
+    with pytest.raises(NameAllocationError):
+        create_player_with_unique_name(None, max_attempts=3, club=club, nationality="GB")
+
+
+def test_allocator_gives_up_when_the_locale_pool_runs_out(monkeypatch):
+    pool = [("Ivan", "Petrov"), ("Oleg", "Sidorov"), ("Pavel", "Orlov")]
+    draws = iter(range(10**6))
+    monkeypatch.setattr(player_names, "fake_name", lambda fake: pool[next(draws) % len(pool)])
+    allocator = NameAllocator(NameIndex(names=set()))
+
+    assert sorted(allocator.allocate(["ru_RU"] * 2)) == sorted(pool[:2])
+    with pytest.raises(NameAllocationError, match="ru_RU"):
+        allocator.allocate(["ru_RU"] * 5)
@@ -0,0 +1,104 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from matches.models import Match
+from matches.roster import build_match_rosters
+from players.models import Player
+from players.training_batch import train_players_chunk
+from tournaments.tasks import complete_lineup
+
+
+pytestmark = pytest.mark.django_db
+
+POSITIONS = [
+    "Goalkeeper",
+    "Right Back",
+    "Left Back",
+    "Center Back",
+    "Center Back",
+    "Central Midfielder",
+    "Central Midfielder",
+    "Right Midfielder",
+    "Left Midfielder",
+    "Center Forward",
+    "Center Forward",
+]
+
+
+def _player_selects(ctx):
+    return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT") and "players_player" in q["sql"]]
+
+
+@pytest.fixture
+def squad(user_with_club, player_factory):
+    _, club = user_with_club(username="order-user", club_name="Order FC")
+    # Created in reverse name order so a name sort would reorder them
+    players = [
+        player_factory(club, first_name=f"Z{len(POSITIONS) - idx}", position=pos, idx=idx + 1)
+        for idx, pos in enumerate(POSITIONS)
+    ]
+    return club, players
+
+
+def test_player_model_has_no_default_ordering():
+    assert not Player._meta.ordering
+    assert "ORDER BY" not in str(Player.objects.filter(club_id=1).query)
+
+
+def test_rosters_keep_lineup_order_without_sql_sort(squad, user_with_club):
+    club, players = squad
+    _, away = user_with_club(username="order-away", club_name="Order Away")
+    reversed_players = list(reversed(players))
+    lineup = {str(slot): {"playerId": str(p.id)} for slot, p in enumerate(reversed_players)}
+    match = Match.objects.create(
+        home_team=club,
+        away_team=away,
+        datetime=timezone.now(),
+        status="in_progress",
+        home_lineup=lineup,
+    )
+
+    with CaptureQueriesContext(connection) as ctx:
+        rosters = build_match_rosters(match)
+
+    selects = _player_selects(ctx)
+    assert len(selects) == 1
+    assert "ORDER BY" not in selects[0]
+    defenders = [entry["id"] for entry in rosters["home"]["DEF"]]
+    expected = [p.id for p in reversed_players if p.position in {"Right Back", "Left Back", "Center Back"}]
+    assert defenders == expected
+
+
+def test_training_and_lineup_queries_skip_order_by(squad):
+    club, players = squad
+
+    with CaptureQueriesContext(connection) as ctx:
+        train_players_chunk([p.id for p in players], when=timezone.now(), seed=7)
+        assert complete_lineup(club, {}) is not None
+
+    selects = _player_selects(ctx)
+    assert selects
+    assert not [sql for sql in selects if "ORDER BY" in sql]
+
+
+def test_update_player_attributes_visits_every_player_once(squad, monkeypatch):
+    visited = []
+    original_save = Player.save
+
+    def recording_save(self, *args, **kwargs):
+        visited.append(self.pk)
+        return original_save(self, *args, **kwargs)
+
+    monkeypatch.setattr(Player, "save", recording_save)
+    with CaptureQueriesContext(connection) as ctx:
+        call_command("update_player_attributes", "--batch-size", "4", stdout=StringIO())
+
+    assert visited == sorted(Player.objects.values_list("id", flat=True))
+    # Batches page by id, never by OFFSET
+    pages = [sql for sql in _player_selects(ctx) if "LIMIT" in sql]
+    assert pages and all('ORDER BY "players_player"."id"' in sql and "OFFSET" not in sql for sql in pages)
@@ -0,0 +1,57 @@
+import random
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from players.models import Player
+from players.rating import RATING_ATTRS, compute_overall_rating, compute_overall_ratings
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_vectorised_rating_matches_scalar_formula():
+    rng = random.Random(5)
+    rows = [
+        (
+            "Goalkeeper" if idx % 4 == 0 else "Central Midfielder",
+            rng.choice([0.0, 3.5, 12.0, 27.3]),
+            {attr: rng.randint(1, 99) for attr in RATING_ATTRS},
+        )
+        for idx in range(40)
+    ]
+    values = np.array([[attrs[a] for a in RATING_ATTRS] for _, _, attrs in rows], dtype=np.int64)
+    is_gk = np.array([position == "Goalkeeper" for position, _, _ in rows])
+    experience = np.array([exp for _, exp, _ in rows])
+
+    ratings = compute_overall_ratings(values, RATING_ATTRS, is_gk, experience)
+
+    assert ratings.tolist() == [compute_overall_rating(*row) for row in rows]
+
+
+def test_save_keeps_stored_rating_in_sync(user_with_club, player_factory):
+    _, club = user_with_club(username="rating", club_name="Rating FC")
+    player = player_factory(club, **{attr: 50 for attr in RATING_ATTRS})
+    assert Player.objects.get(pk=player.pk).overall_rating == 50
+
+    player.pace = 98
+    player.save(update_fields=["pace"])
+
+    stored = Player.objects.get(pk=player.pk).overall_rating
+    assert stored == player.calculate_overall_rating() == (15 * 50 + 98) // 16
+
+
+def test_sync_overall_ratings_verifies_and_backfills(user_with_club, player_factory):
+    _, club = user_with_club(username="rating-sync", club_name="Rating Sync FC")
+    players = [player_factory(club, idx=idx, **{attr: 40 + idx for attr in RATING_ATTRS}) for idx in range(3)]
+    Player.objects.filter(pk=players[0].pk).update(overall_rating=0)
+
+    with pytest.raises(CommandError, match="1 of 3"):
+        call_command("sync_overall_ratings", "--verify")
+
+    call_command("sync_overall_ratings", "--batch-size", "2")
+    call_command("sync_overall_ratings", "--verify")
+
+    assert list(Player.objects.order_by("id").values_list("overall_rating", flat=True)) == [40, 41, 42]
@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from players.models import Player
+from players.tasks import advance_player_seasons
+
+
+pytestmark = pytest.mark.django_db
+
+# (age, bloom_start_age, bloom_seasons_left)
+CASES = [
+    (16, 18, 0),  # too young
+    (18, 18, 0),  # starts now
+    (25, 18, 0),  # late start
+    (20, 18, 1),  # last bloom season
+    (20, 18, 2),
+    (20, 18, 3),
+    (17, 21, 2),  # bloom below start age keeps advancing
+]
+
+
+def _expected(age, start, left):
+    """Per-player rules of the former loop (should_start_bloom / advance_bloom_season)."""
+    started = ended = 0
+    if age >= start and left == 0:
+        left = 3
+        started = 1
+    if left > 0:
+        left -= 1
+        ended = int(left == 0)
+    return left, started, ended
+
+
+def test_advance_player_seasons_matches_per_player_rules(user_with_club, player_factory):
+    _, club = user_with_club(username="seasons", club_name="Seasons FC")
+    players = [
+        player_factory(club, idx=idx, age=age, bloom_start_age=start, bloom_seasons_left=left)
+        for idx, (age, start, left) in enumerate(CASES)
+    ]
+
+    with CaptureQueriesContext(connection) as ctx:
+        result = advance_player_seasons()
+
+    expected = [_expected(*case) for case in CASES]
+    assert result["status"] == "success"
+    assert result["stats"] == {
+        "players_processed": len(CASES),
+        "blooms_started": sum(e[1] for e in expected),
+        "blooms_ended": sum(e[2] for e in expected),
+        "errors": 0,
+    }
+    for player, (left, _, _) in zip(players, expected):
+        player.refresh_from_db(fields=["bloom_seasons_left"])
+        assert player.bloom_seasons_left == left
+    assert len([q for q in ctx.captured_queries if q["sql"].startswith(("UPDATE", "SELECT"))]) == 4
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from matches.dispatch import TimelineDispatcher, WheelTimelineDispatcher
+from matches.models import Match, MatchBroadcastEvent
+from matches.realtime_clock import get_realtime_config
+from matches.realtime_runner import RealtimeRunner
+
+
+pytestmark = pytest.mark.django_db
+
+
+class DummyLayer:
+    def __init__(self):
+        self.messages = []
+
+    async def group_send(self, group, message):
+        self.messages.append((group, message))
+
+
+def _make_match(home, away, **extra):
+    return Match.objects.create(
+        home_team=home,
+        away_team=away,
+        datetime=timezone.now(),
+        status=extra.pop("status", "in_progress"),
+        **extra,
+    )
+
+
+def _fake_build(match_id, *, config, minute_start, max_actions):
+    match = Match.objects.get(pk=match_id)
+    for idx in (1, 2):
+        MatchBroadcastEvent.objects.create(
+            match=match,
+            game_minute=match.current_minute,
+            idx_in_minute=idx,
+            payload_json={"kind": "micro_pass", "display_text": f"event {idx}"},
+            scheduled_at=minute_start + timedelta(seconds=idx),
+            idempotency_key=f"{match.id}:{match.current_minute}:{idx}",
+        )
+    match.realtime_last_broadcast_minute = match.current_minute
+    match.minute_building = False
+    match.save(update_fields=["realtime_last_broadcast_minute", "minute_building"])
+
+
+def test_runner_only_claims_matches_of_its_shard(user_with_club):
+    _, home = user_with_club(username="shard-home", club_name="Shard Home")
+    _, away = user_with_club(username="shard-away", club_name="Shard Away")
+    matches = [_make_match(home, away) for _ in range(4)]
+    _make_match(home, away, status="finished")
+
+    runner = RealtimeRunner(get_realtime_config(), shard_index=1, shard_count=2)
+    expected = {m.id for m in matches if m.id % 2 == 1}
+    assert set(runner.active_match_ids()) == expected
+
+
+@pytest.mark.parametrize("dispatcher_cls", [TimelineDispatcher, WheelTimelineDispatcher])
+def test_runner_builds_dispatches_and_advances_minute(monkeypatch, user_with_club, dispatcher_cls):
+    monkeypatch.setattr("matches.realtime_runner.build_and_store_minute_timeline", _fake_build)
+    _, home = user_with_club(username="run-home", club_name="Runner Home")
+    _, away = user_with_club(username="run-away", club_name="Runner Away")
+    match = _make_match(home, away, current_minute=5)
+
+    layer = DummyLayer()
+    config = get_realtime_config(enabled=True, seconds_per_game_minute=10)
+    runner = RealtimeRunner(
+        config,
+        refresh_interval=600,
+        dispatcher_factory=lambda match_id: dispatcher_cls(match_id, channel_layer=layer),
+    )
+
+    start = timezone.now()
+    assert runner.tick(start) == 1
+    state = runner.states[match.id]
+    assert state.minute == 5
+    assert len(state.pending_at) == 2
+    assert state.next_wake() == start + timedelta(seconds=1)
+
+    # Nothing is due before the first scheduled item.
+    assert runner.tick(start + timedelta(milliseconds=500)) == 0
+    assert layer.messages == []
+
+    runner.tick(start + timedelta(seconds=3))
+    assert len(layer.messages) == 2
+    assert not MatchBroadcastEvent.objects.filter(
+        match=match, status=MatchBroadcastEvent.STATUS_PENDING
+    ).exists()
+    assert runner.states[match.id].next_wake() == start + timedelta(seconds=10)
+
+    runner.tick(start + timedelta(seconds=11))
+    match.refresh_from_db()
+    assert match.current_minute == 6
+    assert match.realtime_started_at == start + timedelta(seconds=11)
+    assert runner.states[match.id].minute == 6
+    assert MatchBroadcastEvent.objects.filter(match=match, game_minute=6).count() == 2
+
+
+def test_runner_drops_finished_matches(monkeypatch, user_with_club):
+    monkeypatch.setattr("matches.realtime_runner.build_and_store_minute_timeline", _fake_build)
+    _, home = user_with_club(username="drop-home", club_name="Drop Home")
+    _, away = user_with_club(username="drop-away", club_name="Drop Away")
+    match = _make_match(home, away)
+
+    runner = RealtimeRunner(
+        get_realtime_config(enabled=True, seconds_per_game_minute=10),
+        refresh_interval=600,
+        dispatcher_factory=lambda match_id: TimelineDispatcher(match_id, channel_layer=DummyLayer()),
+    )
+    start = timezone.now()
+    runner.tick(start)
+    assert match.id in runner.states
+
+    Match.objects.filter(pk=match.pk).update(status="finished")
+    runner.tick(start + timedelta(seconds=11))
+    assert match.id not in runner.states
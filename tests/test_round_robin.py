@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from tournaments.round_robin import BYE, round_robin_rounds, schedule_errors, schedule_matches
+
+
+@pytest.mark.parametrize("team_count", list(range(2, 25)) + [31, 40])
+def test_schedule_is_balanced_double_round_robin(team_count):
+    matches = schedule_matches(team_count)
+
+    assert schedule_errors(matches, team_count) == []
+    rounds = round_robin_rounds(team_count)
+    assert len(rounds) == 2 * (team_count - 1 + team_count % 2)
+    byes = (rounds == BYE).any(axis=-1).sum(axis=1)
+    assert (byes == team_count % 2).all()
+
+
+def test_errors_report_streaks_missing_and_duplicate_matches():
+    matches = schedule_matches(6)
+    missing = matches[1:]
+    assert any("instead of 30" in error for error in schedule_errors(missing, 6))
+
+    duplicate = matches.copy()
+    duplicate[1, 1:] = duplicate[0, 1:]
+    assert any("pairings" in error for error in schedule_errors(duplicate, 6))
+    assert any("more than once in a round" in error for error in schedule_errors(duplicate, 6))
+
+    # Balanced and complete, but team 0 opens with three home games
+    streak = np.array(
+        [(1, 0, 1), (2, 0, 2), (3, 0, 3), (4, 1, 0), (5, 2, 0), (6, 3, 0),
+         (1, 2, 3), (2, 3, 1), (3, 1, 2), (4, 3, 2), (5, 1, 3), (6, 2, 1)]
+    )
+    errors = schedule_errors(streak, 4)
+    assert len(errors) == 1 and "consecutive home or away games for teams [0," in errors[0]
+    assert schedule_errors(streak, 4, max_streak=3) == []
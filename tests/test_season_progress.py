@@ -0,0 +1,113 @@
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from clubs.models import Club
+from matches.models import Match
+from tournaments import tasks as tournament_tasks
+from tournaments.models import Championship, ChampionshipMatch, League, Season
+from tournaments.utils import add_championship_teams
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def season_fixtures():
+    cache.clear()
+    start = date(2025, 6, 1)
+    season = Season.objects.create(
+        number=9101, name="Season 9101", start_date=start, end_date=start + timedelta(days=29), is_active=True
+    )
+    league = League.objects.create(name="Progress League", country="AX", level=3)
+    championship = Championship.objects.create(
+        season=season, league=league, start_date=start, end_date=start + timedelta(days=29)
+    )
+    home, away = (Club.objects.create(name=f"Progress {idx}", country="AX", is_bot=True) for idx in range(2))
+    add_championship_teams(championship, [home, away])
+    matches = []
+    for _ in range(2):
+        match = Match.objects.create(home_team=home, away_team=away, datetime=timezone.now(), status="scheduled")
+        ChampionshipMatch.objects.create(championship=championship, match=match, round=1, match_day=1)
+        matches.append(match)
+    yield season, championship, matches
+    cache.clear()
+
+
+def _finish(match):
+    match.status = "finished"
+    match.home_score, match.away_score = 1, 0
+    match.save()
+
+
+def test_counters_follow_linked_and_finished_matches(season_fixtures):
+    season, championship, matches = season_fixtures
+    season.refresh_from_db()
+    championship.refresh_from_db()
+    assert (season.matches_total, season.matches_finished) == (2, 0)
+    assert (championship.matches_total, championship.matches_finished) == (2, 0)
+
+    _finish(matches[0])
+    championship.refresh_from_db()
+    assert championship.matches_finished == 1
+    assert championship.status == "pending"
+
+    _finish(matches[1])
+    # Saving a finished match again does not count it twice
+    matches[1].save()
+    season.refresh_from_db()
+    championship.refresh_from_db()
+    assert (season.matches_total, season.matches_finished) == (2, 2)
+    assert championship.status == "finished"
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert season.is_completed and championship.is_completed
+    assert len(ctx.captured_queries) == 0
+
+
+def test_check_season_end_waits_for_counters(season_fixtures, monkeypatch):
+    season, _, matches = season_fixtures
+
+    class FakeNow:
+        def date(self):
+            return season.end_date + timedelta(days=1)
+
+    monkeypatch.setattr(tournament_tasks.timezone, "now", lambda: FakeNow())
+
+    assert "still active" in tournament_tasks.check_season_end.run()
+    season.refresh_from_db()
+    assert season.is_active is True
+
+
+def test_verify_command_reports_and_fixes_drift(season_fixtures):
+    season, championship, matches = season_fixtures
+    # Queryset updates bypass the signals, so the counters drift
+    Match.objects.filter(id=matches[0].id).update(status="finished")
+    Season.objects.filter(id=season.id).update(matches_total=5)
+
+    out = StringIO()
+    call_command("verify_season_progress", season=season.number, stdout=out)
+    output = out.getvalue()
+    assert "matches_finished is 0, matches say 1" in output
+    assert "matches_total is 5, matches say 2" in output
+    assert "3 counters are off" in output
+    season.refresh_from_db()
+    assert season.matches_total == 5
+
+    out = StringIO()
+    call_command("verify_season_progress", fix=True, stdout=out)
+    assert "Fixed 3 counters" in out.getvalue()
+    season.refresh_from_db()
+    championship.refresh_from_db()
+    assert (season.matches_total, season.matches_finished) == (2, 1)
+    assert championship.matches_finished == 1
+
+    out = StringIO()
+    call_command("verify_season_progress", stdout=out)
+    assert "Progress counters match the matches" in out.getvalue()
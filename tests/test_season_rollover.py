@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from clubs.models import Club
+from matches.models import Match
+from tournaments.models import Championship, ChampionshipMatch, ChampionshipTeam, League, Season
+from tournaments.season_rollover import apply_transitions, rollover_season, season_transitions
+from tournaments.utils import add_championship_teams
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def two_divisions():
+    cache.clear()
+    start = date(2025, 5, 1)
+    season = Season.objects.create(
+        number=9001, name="Season 9001", start_date=start, end_date=start + timedelta(days=29), is_active=True
+    )
+    divisions = {}
+    for level in (1, 2):
+        league = League.objects.create(name=f"Rollover {level}", country="AX", level=level)
+        championship = Championship.objects.create(
+            season=season, league=league, start_date=start, end_date=start + timedelta(days=29)
+        )
+        clubs = [
+            Club.objects.create(name=f"Rollover {level}-{idx}", country="AX", is_bot=True, league=league)
+            for idx in range(16)
+        ]
+        add_championship_teams(championship, clubs)
+        # Club idx finishes in place idx + 1
+        for idx, club in enumerate(clubs):
+            ChampionshipTeam.objects.filter(championship=championship, team=club).update(points=60 - idx)
+        divisions[level] = (league, championship, clubs)
+    # A country with a single division has no transitions
+    lonely = League.objects.create(name="Lonely 1", country="BY", level=1)
+    Championship.objects.create(season=season, league=lonely, start_date=start, end_date=start + timedelta(days=29))
+    yield season, divisions
+    cache.clear()
+
+
+def test_transitions_are_ranked_in_one_query_and_applied_in_bulk(two_divisions, django_assert_num_queries):
+    season, divisions = two_divisions
+    top_league, _, top_clubs = divisions[1]
+    second_league, _, second_clubs = divisions[2]
+    Club.objects.filter(id=top_clubs[0].id).update(promoted=True)
+
+    with django_assert_num_queries(1):
+        transitions = season_transitions(season)
+
+    assert list(transitions) == ["AX"]
+    moves = transitions["AX"]
+    assert (moves["div1"], moves["div2"]) == (top_league.id, second_league.id)
+    assert [row["team_id"] for row in moves["relegated"]] == [top_clubs[14].id, top_clubs[15].id]
+    assert [row["team_id"] for row in moves["promoted"]] == [second_clubs[0].id, second_clubs[1].id]
+
+    # Flag reset and one bulk UPDATE for the four clubs
+    with django_assert_num_queries(2):
+        assert apply_transitions(transitions) == 4
+
+    relegated = Club.objects.filter(relegated=True)
+    promoted = Club.objects.filter(promoted=True)
+    assert set(relegated.values_list("id", "league_id")) == {
+        (top_clubs[14].id, second_league.id), (top_clubs[15].id, second_league.id)
+    }
+    assert set(promoted.values_list("id", "league_id")) == {
+        (second_clubs[0].id, top_league.id), (second_clubs[1].id, top_league.id)
+    }
+    assert Club.objects.filter(league=top_league).count() == 16
+
+
+def test_rollover_starts_next_season_with_full_leagues(two_divisions):
+    season, divisions = two_divisions
+
+    result = rollover_season(season, days=20)
+
+    season.refresh_from_db()
+    assert season.is_active is False
+    new_season = result["season"]
+    assert Season.objects.get(is_active=True) == new_season
+    assert new_season.number == 9002
+    assert new_season.end_date - new_season.start_date == timedelta(days=20)
+
+    assert result["clubs_moved"] == 4
+    assert result["championships"] == 2
+    assert [league.name for league in result["skipped_leagues"]] == ["Lonely 1"]
+    assert result["matches"] == 2 * 240
+    assert set(result["timings"]) == {"standings", "transitions", "new_season", "total"}
+
+    for league, _, _ in divisions.values():
+        championship = Championship.objects.get(season=new_season, league=league)
+        assert set(championship.teams.values_list("id", flat=True)) == set(
+            Club.objects.filter(league=league).values_list("id", flat=True)
+        )
+        assert ChampionshipMatch.objects.filter(championship=championship).count() == 240
+    assert Match.objects.filter(championshipmatch__championship__season=new_season).count() == 480
+
+
+def test_handle_season_transitions_command_reports_moves(two_divisions):
+    season, divisions = two_divisions
+    out = StringIO()
+
+    call_command("handle_season_transitions", season=season.number, stdout=out)
+
+    output = out.getvalue()
+    assert "Relegated: Rollover 1-15 (Points: 45" in output
+    assert "Promoted: Rollover 2-0 (Points: 60" in output
+    assert "Moved 4 clubs in 1 countries" in output
+    assert Club.objects.get(name="Rollover 2-1").league == divisions[1][0]
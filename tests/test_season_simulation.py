@@ -0,0 +1,106 @@
+from datetime import date, time, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from clubs.models import Club
+from matches.engines.markov_match import simulate_markov_match
+from matches.models import Match
+from matches.roster import build_match_rosters
+from players.attribute_matrix import PlayerAttributeMatrix
+from tournaments.models import Championship, ChampionshipMatch, ChampionshipTeam, League, Season
+from tournaments.season_simulation import offline_lineup, simulate_season
+from tournaments.standings import get_standings
+from tournaments.utils import add_championship_teams, create_championship_matches
+
+
+pytestmark = pytest.mark.django_db
+
+OUTFIELD = ["Center Back", "Left Back", "Right Back", "Central Midfielder", "Attacking Midfielder", "Center Forward"]
+
+
+@pytest.fixture
+def season_with_league(player_factory):
+    cache.clear()
+    start = date(2025, 4, 1)
+    season = Season.objects.create(
+        number=8001, name="Season 8001", start_date=start, end_date=start + timedelta(days=29), is_active=True
+    )
+    league = League.objects.create(name="Offline League", country="AX", level=1)
+    championship = Championship.objects.create(
+        season=season, league=league, start_date=start, end_date=start + timedelta(days=29), match_time=time(18, 0)
+    )
+    clubs = [Club.objects.create(name=f"Offline {idx}", country="AX", is_bot=True) for idx in range(4)]
+    idx = 0
+    for club in clubs:
+        for slot in range(12):
+            idx += 1
+            position = "Goalkeeper" if slot == 0 else OUTFIELD[slot % len(OUTFIELD)]
+            player_factory(club, position=position, idx=idx, strength=30 + slot, passing=40 + slot)
+    add_championship_teams(championship, clubs)
+    create_championship_matches(championship)
+    yield season, championship, clubs
+    cache.clear()
+
+
+def test_offline_lineup_picks_best_keeper_and_outfield(season_with_league):
+    _, _, clubs = season_with_league
+    matrix = PlayerAttributeMatrix.load()
+
+    lineup = offline_lineup(matrix, clubs[0].id)
+    assert sorted(lineup) == sorted(str(slot) for slot in range(11))
+    assert lineup["0"]["playerPosition"] == "Goalkeeper"
+    # The weakest outfield player (slot 1 of the squad) sits out
+    weakest = clubs[0].player_set.filter(strength=31).get()
+    assert str(weakest.id) not in {entry["playerId"] for entry in lineup.values()}
+
+    saved = {"lineup": lineup, "tactic": "balanced"}
+    assert offline_lineup(matrix, clubs[0].id, saved) is not None
+    assert offline_lineup(matrix, clubs[1].id, saved)["0"]["playerId"] != lineup["0"]["playerId"]
+
+
+def test_season_is_played_in_pool_and_applied_per_round(season_with_league):
+    season, championship, clubs = season_with_league
+    rounds = []
+
+    stats = simulate_season(season, workers=2, progress=lambda *args: rounds.append(args))
+
+    assert stats == {"rounds": 6, "matches_played": 12, "matches_skipped": 0, "championships_finished": 1}
+    assert [args[1] for args in rounds] == [2, 4, 6, 8, 10, 12]
+    assert not Match.objects.exclude(status="finished").exists()
+    assert not ChampionshipMatch.objects.filter(processed=False).exists()
+    championship.refresh_from_db()
+    assert championship.status == "finished"
+
+    matches = list(Match.objects.filter(championshipmatch__championship=championship))
+    table = get_standings(championship.id)
+    assert all(row.matches_played == 6 for row in table)
+    assert sum(row.goals_for for row in table) == sum(m.home_score + m.away_score for m in matches)
+    assert sum(row.points for row in table) == sum(2 if m.home_score == m.away_score else 3 for m in matches)
+
+    # Same result as playing the match in this process from its seed
+    match = matches[0]
+    rosters = build_match_rosters(match, matrix=PlayerAttributeMatrix.load())
+    replay = simulate_markov_match({
+        "match_id": match.id,
+        "seed": match.markov_seed,
+        "home_name": match.home_team.name,
+        "away_name": match.away_team.name,
+        "rosters": rosters,
+    })
+    assert (replay["home_score"], replay["away_score"]) == (match.home_score, match.away_score)
+
+
+def test_simulate_season_command_skips_clubs_without_squad(season_with_league):
+    season, championship, clubs = season_with_league
+    clubs[3].player_set.filter(position="Goalkeeper").delete()
+
+    call_command("simulate_season", season=season.number, workers=0)
+
+    assert Match.objects.filter(status="scheduled").count() == 6
+    finished = ChampionshipTeam.objects.filter(championship=championship, matches_played=4)
+    assert set(finished.values_list("team_id", flat=True)) == {club.id for club in clubs[:3]}
+    championship.refresh_from_db()
+    assert championship.status == "in_progress"
+
@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from players.attribute_matrix import PlayerAttributeMatrix, get_attribute_matrix, reset_attribute_matrix
+from players.shared_matrix import (
+    ReadOnlyMatrixError,
+    attach_matrix,
+    attach_worker_matrix,
+    published_matrix,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _worker_summary(player_ids):
+    matrix = get_attribute_matrix()
+    rows = matrix.rows(player_ids)
+    return {
+        "pid": os.getpid(),
+        "memmap": isinstance(matrix.values, np.memmap),
+        "totals": matrix.attribute_totals()[rows].tolist(),
+        "names": [str(matrix.names[row]) for row in rows],
+    }
+
+
+@pytest.fixture
+def squad(user_with_club, player_factory):
+    _, club = user_with_club(username="shm-user", club_name="Shared FC")
+    return [player_factory(club, position="Center Back", idx=idx + 1, strength=30 + idx) for idx in range(6)]
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_matrix():
+    reset_attribute_matrix()
+    yield
+    reset_attribute_matrix()
+
+
+def test_attached_matrix_is_read_only_copy_of_published(squad, tmp_path):
+    matrix = PlayerAttributeMatrix.load()
+    with published_matrix(matrix, run_dir=str(tmp_path)) as path:
+        attached = attach_matrix(path)
+        assert np.array_equal(attached.values, matrix.values)
+        assert np.array_equal(attached.ids, matrix.ids)
+        assert [str(name) for name in attached.names] == matrix.names
+        assert not attached.values.flags.writeable
+        assert np.shares_memory(attached.training_view(), attached.values)
+        with pytest.raises(ReadOnlyMatrixError):
+            attached.refresh()
+    assert not os.path.exists(path)
+
+
+def test_pool_workers_attach_published_matrix(squad, tmp_path):
+    matrix = PlayerAttributeMatrix.load()
+    ids = [player.id for player in squad]
+    expected = matrix.attribute_totals()[matrix.rows(ids)].tolist()
+
+    context = multiprocessing.get_context("fork")
+    with published_matrix(matrix, run_dir=str(tmp_path)) as path:
+        with ProcessPoolExecutor(
+            max_workers=2, mp_context=context, initializer=attach_worker_matrix, initargs=(path,)
+        ) as pool:
+            results = list(pool.map(_worker_summary, [ids] * 4))
+
+    assert all(result["memmap"] for result in results)
+    assert all(result["totals"] == expected for result in results)
+    assert all(result["names"] == [p.last_name for p in squad] for result in results)
@@ -0,0 +1,145 @@
+from datetime import date, time, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from clubs.models import Club
+from matches.models import Match
+from tournaments.models import Championship, ChampionshipMatch, League, Season
+from tournaments.season_rollover import rollover_season
+from tournaments.utils import add_championship_teams
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def api_client(client, user_with_club):
+    user, _ = user_with_club(username="versions-user", club_name="Versions Viewer")
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def championship(django_capture_on_commit_callbacks):
+    start = date(2025, 7, 1)
+    with django_capture_on_commit_callbacks(execute=True):
+        season = Season.objects.create(
+            number=9201, name="Season 9201", start_date=start, end_date=start + timedelta(days=29), is_active=True
+        )
+        league = League.objects.create(name="Versions League", country="AX", level=1)
+        championship = Championship.objects.create(
+            season=season, league=league, start_date=start, end_date=start + timedelta(days=29), match_time=time(18, 0)
+        )
+        clubs = [Club.objects.create(name=f"Versions {idx}", country="AX", is_bot=True) for idx in range(2)]
+        add_championship_teams(championship, clubs)
+        match = Match.objects.create(
+            home_team=clubs[0], away_team=clubs[1], datetime=timezone.now(), status="scheduled"
+        )
+        ChampionshipMatch.objects.create(championship=championship, match=match, round=1, match_day=1)
+    return championship, match
+
+
+def _tournament_queries(ctx):
+    return [q["sql"] for q in ctx.captured_queries if "tournaments_" in q["sql"]]
+
+
+def test_repeat_requests_get_304_or_cached_body_without_queries(api_client, championship):
+    championship, _ = championship
+    url = reverse("tournaments:api_championship_detail", args=[championship.id])
+
+    first = api_client.get(url)
+    assert first.status_code == 200
+    etag = first["ETag"]
+    assert "no-cache" in first["Cache-Control"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        not_modified = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        cached = api_client.get(url)
+        weak = api_client.get(url, HTTP_IF_NONE_MATCH=f'"stale", W/{etag}')
+    assert _tournament_queries(ctx) == []
+    assert not_modified.status_code == 304 and not_modified["ETag"] == etag
+    assert cached.status_code == 200 and cached.content == first.content
+    assert weak.status_code == 304
+
+    missing = api_client.get(reverse("tournaments:api_championship_detail", args=[championship.id + 1000]))
+    assert missing.status_code == 404
+
+
+def test_applied_result_bumps_championship_version(api_client, championship, django_capture_on_commit_callbacks):
+    championship, match = championship
+    detail_url = reverse("tournaments:api_championship_detail", args=[championship.id])
+    matches_url = reverse("tournaments:api_championship_matches", args=[championship.id])
+    seasons_url = reverse("tournaments:api_season_list")
+    before = {url: api_client.get(url) for url in (detail_url, matches_url, seasons_url)}
+
+    match.status = "finished"
+    match.home_score, match.away_score = 2, 1
+    with django_capture_on_commit_callbacks(execute=True):
+        match.save()
+
+    detail = api_client.get(detail_url, HTTP_IF_NONE_MATCH=before[detail_url]["ETag"])
+    assert detail.status_code == 200
+    assert detail["ETag"] != before[detail_url]["ETag"]
+    assert detail.json()["standings"][0]["points"] == 3
+    fixtures = api_client.get(matches_url, HTTP_IF_NONE_MATCH=before[matches_url]["ETag"])
+    assert fixtures.json()["matches"][0]["score"] == {"home": 2, "away": 1}
+    # Other resources keep their version
+    assert api_client.get(seasons_url, HTTP_IF_NONE_MATCH=before[seasons_url]["ETag"]).status_code == 304
+
+
+def test_rollover_bumps_lists_and_query_strings_are_cached_apart(
+    api_client, championship, django_capture_on_commit_callbacks
+):
+    championship, _ = championship
+    seasons_url = reverse("tournaments:api_season_list")
+    list_url = reverse("tournaments:api_championship_list")
+
+    seasons = api_client.get(seasons_url)
+    active = api_client.get(list_url, {"status": "pending"})
+    finished = api_client.get(list_url, {"status": "finished"})
+    assert len(active.json()) == 1 and finished.json() == []
+    assert active["ETag"] == finished["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        rollover_season(championship.season)
+
+    after = api_client.get(seasons_url, HTTP_IF_NONE_MATCH=seasons["ETag"])
+    assert after.status_code == 200
+    assert [row["is_active"] for row in after.json()] == [True, False]
+    assert api_client.get(list_url, {"status": "pending"}, HTTP_IF_NONE_MATCH=active["ETag"]).status_code == 200
+
+
+def test_club_rename_bumps_its_championships(api_client, championship, django_capture_on_commit_callbacks):
+    championship, match = championship
+    detail_url = reverse("tournaments:api_championship_detail", args=[championship.id])
+    matches_url = reverse("tournaments:api_championship_matches", args=[championship.id])
+    before = {url: api_client.get(url)["ETag"] for url in (detail_url, matches_url)}
+    club = match.home_team
+
+    # Saves that do not touch the name keep the cached bodies
+    with django_capture_on_commit_callbacks(execute=True):
+        club.save()
+    assert api_client.get(detail_url, HTTP_IF_NONE_MATCH=before[detail_url]).status_code == 304
+
+    club.name = "Versions Renamed"
+    with django_capture_on_commit_callbacks(execute=True):
+        club.save()
+
+    detail = api_client.get(detail_url, HTTP_IF_NONE_MATCH=before[detail_url])
+    assert detail.status_code == 200
+    assert "Versions Renamed" in {row["team"]["name"] for row in detail.json()["standings"]}
+    fixtures = api_client.get(matches_url, HTTP_IF_NONE_MATCH=before[matches_url])
+    assert fixtures.status_code == 200
+    assert fixtures.json()["matches"][0]["home_team"]["name"] == "Versions Renamed"
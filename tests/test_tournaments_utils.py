@@ -3,15 +3,18 @@ from datetime import date, datetime, time, timedelta
 
 import pytest
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connection, models
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from clubs.models import Club
 from matches.models import Match
-from tournaments.models import Championship, League, Season
+from tournaments.models import Championship, ChampionshipTeam, League, Season
 from tournaments.utils import (
+    add_championship_teams,
     check_consecutive_matches,
     create_championship_matches,
+    create_season_matches,
     generate_league_schedule,
     get_team_matches,
     validate_championship_schedule,
@@ -117,9 +120,20 @@ def test_validate_schedule_balance_counts_home_and_away():
     assert balance["D"] == {"home": 1, "away": 1}
 
 
-def test_generate_league_schedule_requires_16_teams(championship_factory):
+def test_generate_league_schedule_handles_odd_team_count(championship_factory):
     championship, clubs = championship_factory(level=1)
-    championship.teams.remove(clubs[-1])  # remove one team
+    championship.teams.remove(clubs[-1])  # 15 teams: one bye per round
+
+    schedule = generate_league_schedule(championship)
+    assert len(schedule) == 15 * 14
+    assert len({round_num for round_num, _, _, _ in schedule}) == 30
+    assert all(count == 7 for count in collections.Counter(r for r, _, _, _ in schedule).values())
+    create_championship_matches(championship)
+    assert validate_championship_schedule(championship) is True
+
+
+def test_generate_league_schedule_requires_two_teams(championship_factory):
+    championship, _ = championship_factory(level=1, team_count=1)
 
     with pytest.raises(ValueError):
         generate_league_schedule(championship)
@@ -167,6 +181,41 @@ def test_create_championship_matches_and_cleanup(championship_factory):
     assert championship.championshipmatch_set.count() == 240
 
 
+def test_create_season_matches_bulk_inserts_every_championship(championship_factory):
+    championships = [championship_factory(level=1)[0], championship_factory(level=2)[0]]
+    stale = create_season_matches(championships[:1])
+    assert stale == 240
+
+    with CaptureQueriesContext(connection) as ctx:
+        created = create_season_matches(championships)
+
+    assert created == 480
+    inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+    assert len(inserts) == 2  # one for Match, one for ChampionshipMatch
+    # Constant in the number of championships, progress recount included
+    assert len(ctx.captured_queries) < 30
+    for championship in championships:
+        assert championship.championshipmatch_set.count() == 240
+        championship.refresh_from_db()
+        assert (championship.matches_total, championship.matches_finished) == (240, 0)
+        assert validate_championship_schedule(championship) is True
+    # Matches of the replaced schedule are removed, not orphaned
+    assert Match.objects.filter(championshipmatch__isnull=True).count() == 0
+
+
+def test_add_championship_teams_uses_one_insert(championship_factory):
+    championship, clubs = championship_factory(level=1)
+    ChampionshipTeam.objects.filter(championship=championship).delete()
+
+    with CaptureQueriesContext(connection) as ctx:
+        added = add_championship_teams(championship, clubs)
+    assert added == 16
+    assert len([q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]) == 1
+
+    add_championship_teams(championship, clubs[:3])  # already members: skipped
+    assert championship.teams.count() == 16
+
+
 def test_create_championship_matches_adjusts_level_two_time(championship_factory):
     championship, _ = championship_factory(level=2)
     championship.match_time = time(20, 0)
@@ -211,8 +260,9 @@ def test_validate_championship_schedule_success(championship_factory):
             )
         round_number += 1
 
-    assert validate_championship_schedule(championship) is True
-    assert validate_championship_schedule(championship) is True
+    with CaptureQueriesContext(connection) as ctx:
+        assert validate_championship_schedule(championship) is True
+    assert len(ctx.captured_queries) == 1
 
 
 def test_validate_championship_schedule_missing_match(championship_factory):
@@ -0,0 +1,97 @@
+import random
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from players.models import Player
+from players.training import TrainingSettings
+from players.training_batch import TRAINED_ATTRS, train_players_batch
+from players.training_logic import conduct_player_training, player_rng
+
+
+pytestmark = pytest.mark.django_db
+
+SEED = 20250106
+WHEN = datetime(2025, 1, 6, 11, 0, tzinfo=dt_timezone.utc)
+POSITIONS = [choice for choice, _ in Player.POSITIONS]
+SNAPSHOT_FIELDS = TRAINED_ATTRS + ["bloom_seasons_left", "overall_rating", "last_trained_at", "last_training_summary"]
+
+
+@pytest.fixture
+def squad(user_with_club):
+    _, club = user_with_club(username="batch-train", club_name="Batch Train FC")
+    rng = random.Random(7)
+    players = []
+    for idx in range(60):
+        attrs = {attr: rng.choice([1, 2, rng.randint(20, 80), 98, 99]) for attr in TRAINED_ATTRS}
+        players.append(
+            Player.objects.create(
+                first_name=f"Batch{idx}",
+                last_name=f"Trainee{idx}",
+                nationality="GB",
+                club=club,
+                position=POSITIONS[idx % len(POSITIONS)],
+                age=17 + idx % 24,
+                bloom_type=["early", "middle", "late"][idx % 3],
+                bloom_start_age=17 + idx % 5,
+                bloom_seasons_left=idx % 4,
+                **attrs,
+            )
+        )
+    for player in players[::3]:
+        TrainingSettings.objects.create(
+            player=player,
+            physical_weight=Decimal("50"),
+            defensive_weight=Decimal("0"),
+            attacking_weight=Decimal("12.5"),
+            mental_weight=Decimal("0"),
+            technical_weight=Decimal("37.5"),
+            tactical_weight=Decimal("0"),
+            gk_physical_weight=Decimal("60"),
+            gk_core_skills_weight=Decimal("40"),
+            gk_additional_skills_weight=Decimal("0"),
+        )
+    return club, players
+
+
+def _snapshot(players):
+    return {
+        row["id"]: row
+        for row in Player.objects.filter(id__in=[p.id for p in players]).values("id", *SNAPSHOT_FIELDS)
+    }
+
+
+def test_batch_training_matches_scalar_algorithm_for_seed(squad):
+    club, players = squad
+    before = _snapshot(players)
+
+    for player in Player.objects.filter(club=club).order_by("id"):
+        conduct_player_training(player, when=WHEN, rng=player_rng(SEED, player.id))
+    scalar = _snapshot(players)
+
+    for pid, row in before.items():
+        Player.objects.filter(id=pid).update(**{k: v for k, v in row.items() if k != "id"})
+
+    stats = train_players_batch(when=WHEN, seed=SEED, club_ids=[club.id], chunk_size=25)
+    batch = _snapshot(players)
+
+    assert batch == scalar
+    assert stats["players_trained"] == len(players)
+    assert stats["teams_trained"] == 1
+    assert stats["errors"] == 0
+    assert stats["total_improvements"] == sum(len(row["last_training_summary"]) for row in batch.values())
+    assert stats["players_in_bloom"] == sum(1 for row in batch.values() if row["bloom_seasons_left"] > 0)
+
+
+def test_batch_training_creates_missing_settings_and_uses_few_queries(squad):
+    club, players = squad
+
+    with CaptureQueriesContext(connection) as ctx:
+        train_players_batch(when=WHEN, seed=SEED, club_ids=[club.id], chunk_size=len(players))
+
+    assert TrainingSettings.objects.filter(player__club=club).count() == len(players)
+    selects = [q for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+    assert len(selects) <= 4
@@ -0,0 +1,142 @@
+import functools
+import random
+
+import pytest
+
+from players import tasks as player_tasks
+from players.models import Player, TrainingRun, TrainingRunChunk
+from players.tasks import _build_training_timestamp, _training_seed, conduct_scheduled_training
+from players import training_batch
+from players.training_batch import TRAINED_ATTRS, train_players_batch
+from realfootballsim.celery import app
+
+
+pytestmark = pytest.mark.django_db
+
+RUN_DATE = "2025-01-06"
+POSITIONS = [choice for choice, _ in Player.POSITIONS]
+SNAPSHOT_FIELDS = TRAINED_ATTRS + ["bloom_seasons_left", "overall_rating", "last_trained_at", "last_training_summary"]
+
+
+@pytest.fixture
+def eager_celery(monkeypatch):
+    monkeypatch.setattr(app.conf, "task_always_eager", True)
+    monkeypatch.setattr(player_tasks, "TRAINING_CLUBS_PER_CHUNK", 1)
+
+
+@pytest.fixture
+def clubs(user_with_club):
+    rng = random.Random(11)
+    result = []
+    for club_idx in range(3):
+        _, club = user_with_club(username=f"run-train-{club_idx}", club_name=f"Run Train {club_idx}")
+        for idx in range(8):
+            Player.objects.create(
+                first_name=f"Run{club_idx}",
+                last_name=f"Trainee{idx}",
+                nationality="GB",
+                club=club,
+                position=POSITIONS[idx % len(POSITIONS)],
+                age=18 + (idx * 3) % 20,
+                bloom_type=["early", "middle", "late"][idx % 3],
+                bloom_start_age=17 + idx % 5,
+                bloom_seasons_left=idx % 3,
+                **{attr: rng.randint(20, 80) for attr in TRAINED_ATTRS},
+            )
+        result.append(club)
+    return result
+
+
+def _snapshot():
+    return {row["id"]: row for row in Player.objects.values("id", *SNAPSHOT_FIELDS)}
+
+
+def _restore(snapshot):
+    for pid, row in snapshot.items():
+        Player.objects.filter(id=pid).update(**{k: v for k, v in row.items() if k != "id"})
+
+
+def test_chunked_run_matches_single_batch_summary(eager_celery, clubs):
+    before = _snapshot()
+    run_ts = _build_training_timestamp(RUN_DATE)
+    expected_stats = train_players_batch(when=run_ts, seed=_training_seed(run_ts))
+    expected = _snapshot()
+    _restore(before)
+
+    result = conduct_scheduled_training(run_for_date=RUN_DATE)
+
+    run = TrainingRun.objects.get(run_id=result["run_id"])
+    assert result["chunks"] == len(clubs)
+    assert run.status == TrainingRun.STATUS_COMPLETED
+    assert run.stats == expected_stats
+    assert _snapshot() == expected
+
+
+def test_failed_chunk_is_resumed_without_retraining_done_chunks(eager_celery, clubs, monkeypatch):
+    failing_club = clubs[1].id
+    real_batch = player_tasks.train_players_batch
+    trained_clubs = []
+
+    def flaky_batch(*, club_ids, **kwargs):
+        trained_clubs.extend(club_ids)
+        if failing_club in club_ids:
+            raise RuntimeError("worker lost")
+        return real_batch(club_ids=club_ids, **kwargs)
+
+    monkeypatch.setattr(player_tasks, "train_players_batch", flaky_batch)
+    conduct_scheduled_training(run_for_date=RUN_DATE)
+
+    run = TrainingRun.objects.get()
+    assert run.status == TrainingRun.STATUS_RUNNING
+    assert run.stats["errors"] == Player.objects.filter(club_id=failing_club).count()
+    failed = run.chunks.get(status=TrainingRunChunk.STATUS_FAILED)
+    assert failed.club_ids == [failing_club]
+    assert not Player.objects.filter(club_id=failing_club, last_trained_at__isnull=False).exists()
+
+    trained_clubs.clear()
+    monkeypatch.setattr(
+        player_tasks,
+        "train_players_batch",
+        lambda **kwargs: trained_clubs.extend(kwargs["club_ids"]) or real_batch(**kwargs),
+    )
+    result = conduct_scheduled_training(run_for_date=RUN_DATE)
+
+    run.refresh_from_db()
+    assert result["chunks"] == 1
+    assert trained_clubs == [failing_club]
+    assert run.status == TrainingRun.STATUS_COMPLETED
+    assert run.stats["errors"] == 0
+    assert run.stats["teams_trained"] == len(clubs)
+    assert run.stats["players_trained"] == Player.objects.count()
+
+    again = conduct_scheduled_training(run_for_date=RUN_DATE)
+    assert again["status"] == "success"
+    assert again["stats"] == run.stats
+    assert TrainingRun.objects.count() == 1
+
+
+def test_failed_sub_chunk_fails_the_club_chunk(eager_celery, clubs, monkeypatch):
+    failing_club = clubs[2].id
+    real_chunk = training_batch.train_players_chunk
+    failing_ids = set(Player.objects.filter(club_id=failing_club).values_list("id", flat=True))
+
+    def flaky_chunk(ids, **kwargs):
+        if max(failing_ids) in ids:
+            raise RuntimeError("bad row")
+        return real_chunk(ids, **kwargs)
+
+    # Sub-chunks of 3 players: the first ones of the club train, the last one fails
+    monkeypatch.setattr(
+        player_tasks, "train_players_batch", functools.partial(train_players_batch, chunk_size=3)
+    )
+    monkeypatch.setattr(training_batch, "train_players_chunk", flaky_chunk)
+    result = conduct_scheduled_training(run_for_date=RUN_DATE)
+
+    run = TrainingRun.objects.get(run_id=result["run_id"])
+    failed = run.chunks.get(status=TrainingRunChunk.STATUS_FAILED)
+    assert failed.club_ids == [failing_club]
+    assert failed.stats == {"errors": len(failing_ids)}
+    assert run.status == TrainingRun.STATUS_RUNNING
+    assert run.stats["errors"] == len(failing_ids)
+    # The failed chunk is rolled back as a whole
+    assert not Player.objects.filter(id__in=failing_ids, last_trained_at__isnull=False).exists()
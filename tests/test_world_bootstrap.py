@@ -0,0 +1,99 @@
+from datetime import date
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from clubs.models import Club
+from players.models import Player
+from tournaments.models import Championship, ChampionshipMatch, League, Season
+from tournaments.world_bootstrap import (
+    WorldBootstrapError,
+    build_world,
+    plan_world,
+    squad_slots,
+    world_countries,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _inserts(ctx, table):
+    return [q for q in ctx.captured_queries if q["sql"].startswith(f'INSERT INTO "{table}"')]
+
+
+def test_world_is_planned_in_memory_and_written_in_bulk(django_capture_on_commit_callbacks):
+    Club.objects.create(name="Existing Bootstrap Club", country="AX", is_bot=True)
+    assert world_countries(12)[:10] == world_countries()
+
+    with CaptureQueriesContext(connection) as ctx:
+        plan = plan_world(["GB", "ES"], divisions=2, seed=7)
+    # Name uniqueness is checked against one read, not per candidate
+    assert len(ctx.captured_queries) == 3
+    assert len(plan.leagues) == 4 and len(plan.clubs) == 64
+    assert plan.players_total == 64 * len(squad_slots()) == 64 * 25
+
+    progress = []
+    with CaptureQueriesContext(connection) as ctx, django_capture_on_commit_callbacks(execute=True):
+        stats = build_world(plan, seed=7, start_date=date(2026, 1, 1), progress=lambda *args: progress.append(args))
+
+    assert len(_inserts(ctx, "tournaments_league")) == 1
+    assert len(_inserts(ctx, "clubs_club")) == 1
+    assert len(_inserts(ctx, "players_player")) <= 2
+    assert [stage for stage, _, _ in progress] == ["leagues", "clubs", "players", "season"]
+    assert progress[2] == ("players", 64 * 25, 64 * 25)
+    assert {stage: row["rows"] for stage, row in stats.items()} == {
+        "leagues": 4, "clubs": 64, "players": 64 * 25, "season": 4 * 240,
+    }
+
+    names = list(Club.objects.values_list("name", flat=True))
+    assert len(names) == len(set(names)) == 65
+    assert list(League.objects.filter(country="GB").order_by("level").values_list("name", flat=True)) == [
+        "GB Premier League", "GB Championship",
+    ]
+    for league in League.objects.all():
+        clubs = Club.objects.filter(league=league)
+        assert clubs.count() == 16 and all(club.is_bot for club in clubs)
+        assert {Player.objects.filter(club=club).count() for club in clubs} == {25}
+
+    season = Season.objects.get(is_active=True)
+    assert season.start_date == date(2026, 1, 1)
+    assert Championship.objects.filter(season=season).count() == 4
+    for championship in Championship.objects.filter(season=season):
+        assert ChampionshipMatch.objects.filter(championship=championship).count() == 240
+        assert championship.teams.count() == 16
+
+
+def test_existing_leagues_or_active_season_stop_the_plan():
+    League.objects.create(name="Taken", country="GB", level=2)
+    with pytest.raises(WorldBootstrapError):
+        plan_world(["GB"], divisions=2)
+    assert len(plan_world(["GB"], divisions=1).clubs) == 16
+
+    Season.objects.create(
+        number=9301, name="Season 9301", start_date=date(2026, 1, 1), end_date=date(2026, 1, 30), is_active=True
+    )
+    with pytest.raises(WorldBootstrapError):
+        plan_world(["ES"], divisions=1)
+
+
+def test_command_reports_progress_and_throughput():
+    out = StringIO()
+    call_command("initialize_football_world", "--countries", "1", "--divisions", "1", "--seed", "3", stdout=out)
+
+    output = out.getvalue()
+    assert "Planned 1 leagues, 16 clubs and 400 players" in output
+    assert "players: 400/400" in output
+    assert "rows/s" in output and "season: 240 rows" in output
+    assert Club.objects.filter(league__country="GB").count() == 16
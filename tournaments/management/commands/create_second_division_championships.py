@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from tournaments.models import League, Championship, Season
+from tournaments.utils import add_championship_teams
 from django.utils import timezone
 
 class Command(BaseCommand):
@@ -35,8 +36,7 @@ class Command(BaseCommand):
                         )
                         
                         # Добавляем все команды лиги в чемпионат
-                        for club in league.clubs.all():
-                            championship.teams.add(club)
+                        add_championship_teams(championship, league.clubs.all())
                             
                         championships_created += 1
                         self.stdout.write(f"Created championship for {league.name}")
@@ -2,7 +2,7 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.utils import timezone
 from tournaments.models import Season, Championship
-from django.core.management import call_command
+from tournaments.season_rollover import rollover_season
 from django.db.models import Count, Q
 
 class Command(BaseCommand):
@@ -21,15 +21,9 @@ class Command(BaseCommand):
                 # Получаем текущий активный сезон
                 current_season = Season.objects.get(is_active=True)
                 
-                # Проверяем завершение всех матчей
+                # Проверяем завершение всех матчей по счётчикам сезона
                 championships = Championship.objects.filter(season=current_season)
-                
-                unfinished_matches = 0
-                for championship in championships:
-                    unfinished = championship.championshipmatch_set.filter(
-                        ~Q(match__status='finished')
-                    ).count()
-                    unfinished_matches += unfinished
+                unfinished_matches = current_season.matches_total - current_season.matches_finished
                 
                 if unfinished_matches > 0 and not options['force']:
                     self.stdout.write(
@@ -59,20 +53,17 @@ class Command(BaseCommand):
                     )
                     return
 
-                # Завершаем текущий сезон
+                # Завершаем текущий сезон: переходы между дивизионами,
+                # деактивация сезона и новый сезон одним пакетным проходом
                 self.stdout.write("Processing end of season transitions...")
-                
-                # Обрабатываем переходы между дивизионами
-                call_command('handle_season_transitions')
-                
-                # Деактивируем текущий сезон
-                current_season.is_active = False
-                current_season.save()
-                
-                # Создаем новый сезон
-                self.stdout.write("Creating new season...")
-                call_command('create_new_season')
-                
+                result = rollover_season(current_season)
+
+                timings = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in result['timings'].items())
+                self.stdout.write(
+                    f"Moved {result['clubs_moved']} clubs, created season "
+                    f"{result['season'].number} with {result['championships']} championships "
+                    f"and {result['matches']} matches ({timings})"
+                )
                 self.stdout.write(
                     self.style.SUCCESS(
                         f"Successfully ended season {current_season.number}"
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from tournaments.models import Championship
-from tournaments.utils import create_championship_matches
+from tournaments.utils import create_season_matches
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,20 +17,13 @@ class Command(BaseCommand):
                     status='in_progress'
                 ).select_related('league')
                 
-                total_matches = 0
                 for championship in championships:
                     self.stdout.write(
                         f"Generating matches for {championship} "
                         f"(Division {championship.league.level})"
                     )
-                    create_championship_matches(championship)
-                    matches_count = championship.championshipmatch_set.count()
-                    total_matches += matches_count
-                    self.stdout.write(
-                        f"Created {matches_count} matches for "
-                        f"{championship.league.name} (Division {championship.league.level})"
-                    )
-                    
+                total_matches = create_season_matches(championships)
+
                 self.stdout.write(
                     self.style.SUCCESS(
                         f'Successfully generated {total_matches} matches '
@@ -3,6 +3,7 @@ from django.db import transaction
 from django_countries import countries
 from faker import Faker
 from tournaments.models import League, Championship, Season
+from tournaments.utils import add_championship_teams
 from clubs.models import Club
 from tqdm import tqdm
 import sys
@@ -162,6 +163,7 @@ class Command(BaseCommand):
                                 self.stats['championships_created'] += 1
 
                                 # Create teams
+                                teams = []
                                 for i in range(16):
                                     team_name = self.generate_team_name()
                                     team = Club.objects.create(
@@ -170,8 +172,9 @@ class Command(BaseCommand):
                                         is_bot=True,
                                         owner=None
                                     )
-                                    championship.teams.add(team)
+                                    teams.append(team)
                                     self.stats['teams_created'] += 1
+                                add_championship_teams(championship, teams)
 
                             self.stats['countries_processed'] += 1
 
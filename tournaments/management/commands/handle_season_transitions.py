@@ -1,8 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from tournaments.models import Championship, Season, League
-from django.db.models import F
-from django.core.exceptions import ValidationError
+from tournaments.models import Season
+from tournaments.season_rollover import apply_transitions, season_transitions
 
 class Command(BaseCommand):
     help = 'Process end of season transitions between divisions'
@@ -26,37 +25,16 @@ class Command(BaseCommand):
 
                 self.stdout.write(f"Processing end of season transitions for {season}")
 
-                # Получаем все чемпионаты текущего сезона
-                championships = Championship.objects.filter(
-                    season=season
-                ).select_related('league')
+                # Переходы всех стран считаются одним запросом по таблицам
+                transitions = season_transitions(season)
+                for country_code, moves in transitions.items():
+                    self.report_country_transitions(country_code, moves)
 
-                # Группируем чемпионаты по странам
-                countries = {}
-                for champ in championships:
-                    country_code = champ.league.country.code
-                    if country_code not in countries:
-                        countries[country_code] = {'div1': None, 'div2': None}
-                    
-                    if champ.league.level == 1:
-                        countries[country_code]['div1'] = champ
-                    elif champ.league.level == 2:
-                        countries[country_code]['div2'] = champ
-
-                # Обрабатываем каждую страну
-                for country_code, divisions in countries.items():
-                    if not divisions['div1'] or not divisions['div2']:
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f"Skipping {country_code} - missing division"
-                            )
-                        )
-                        continue
-
-                    self.process_country_transitions(
-                        divisions['div1'], 
-                        divisions['div2']
-                    )
+                # И применяются одним пакетным обновлением клубов
+                moved = apply_transitions(transitions)
+                self.stdout.write(
+                    self.style.SUCCESS(f"Moved {moved} clubs in {len(transitions)} countries")
+                )
 
         except Season.DoesNotExist:
             self.stdout.write(
@@ -68,67 +46,20 @@ class Command(BaseCommand):
             )
             raise
 
-    def process_country_transitions(self, div1_championship, div2_championship):
+    def report_country_transitions(self, country_code, moves):
         """
-        Обработка переходов между дивизионами для одной страны
+        Выводит переходы между дивизионами для одной страны
         """
-        country_name = div1_championship.league.country.name
-        self.stdout.write(f"\nProcessing {country_name}:")
-
-        try:
-            # Получаем команды для понижения (2 последние из первого дивизиона)
-            relegated_teams = (
-                div1_championship.championshipteam_set
-                .annotate(
-                    goals_diff=F('goals_for') - F('goals_against')
-                )
-                .order_by(
-                    'points',
-                    'goals_diff',
-                    'goals_for'
-                )[:2]
+        self.stdout.write(f"\nProcessing {country_code}:")
+        for row in moves['relegated']:
+            self.stdout.write(
+                f"  Relegated: {row['team__name']} "
+                f"(Points: {row['points']}, "
+                f"GD: {row['goals_diff']})"
             )
-
-            # Получаем команды для повышения (2 первые из второго дивизиона)
-            promoted_teams = (
-                div2_championship.championshipteam_set
-                .annotate(
-                    goals_diff=F('goals_for') - F('goals_against')
-                )
-                .order_by(
-                    '-points',
-                    '-goals_diff',
-                    '-goals_for'
-                )[:2]
+        for row in moves['promoted']:
+            self.stdout.write(
+                f"  Promoted: {row['team__name']} "
+                f"(Points: {row['points']}, "
+                f"GD: {row['goals_diff']})"
             )
-
-            # Применяем переходы
-            div2_league = div2_championship.league
-            div1_league = div1_championship.league
-
-            # Понижаем команды
-            for team_stats in relegated_teams:
-                team = team_stats.team
-                team.league = div2_league
-                team.save()
-                self.stdout.write(
-                    f"  Relegated: {team.name} "
-                    f"(Points: {team_stats.points}, "
-                    f"GD: {team_stats.goals_diff})"
-                )
-
-            # Повышаем команды
-            for team_stats in promoted_teams:
-                team = team_stats.team
-                team.league = div1_league
-                team.save()
-                self.stdout.write(
-                    f"  Promoted: {team.name} "
-                    f"(Points: {team_stats.points}, "
-                    f"GD: {team_stats.goals_diff})"
-                )
-
-        except Exception as e:
-            raise ValidationError(
-                f"Error processing transitions for {country_name}: {str(e)}"
-            )
\ No newline at end of file
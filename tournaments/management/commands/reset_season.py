@@ -3,7 +3,7 @@ from django.db import transaction
 from django.utils import timezone
 from datetime import datetime, date
 from tournaments.models import Season, Championship, ChampionshipMatch
-from tournaments.utils import create_championship_matches
+from tournaments.utils import add_championship_teams, create_season_matches
 from matches.match_simulation import simulate_match
 from matches.models import Match
 from clubs.models import Club
@@ -32,6 +32,7 @@ class Command(BaseCommand):
                 from tournaments.models import League
                 leagues = League.objects.all()
                 championships_created = 0
+                championships = []
 
                 for league in leagues:
                     # Получаем команды для этой лиги
@@ -56,13 +57,13 @@ class Command(BaseCommand):
                     )
                     
                     # Добавляем все команды в чемпионат
-                    for team in list(bot_teams) + list(human_teams):
-                        championship.teams.add(team)
-
-                    # Генерируем расписание
-                    create_championship_matches(championship)
+                    add_championship_teams(championship, list(bot_teams) + list(human_teams))
+                    championships.append(championship)
                     championships_created += 1
 
+                # Генерируем расписание всех чемпионатов пакетными вставками
+                create_season_matches(championships)
+
                 self.stdout.write(self.style.SUCCESS(
                     f"Created {championships_created} championships"
                 ))
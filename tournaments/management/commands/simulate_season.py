@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tournaments.models import Season
+from tournaments.season_simulation import simulate_season
+
+
+class Command(BaseCommand):
+    help = 'Plays out all scheduled championship matches of a season offline with the Markov engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season',
+            type=int,
+            help='Season number (default: the active season)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Worker processes (default: one per CPU, 0: play in this process)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Reseed every match from this value instead of its markov_seed'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options['season'] is not None:
+                season = Season.objects.get(number=options['season'])
+            else:
+                season = Season.objects.get(is_active=True)
+        except (Season.DoesNotExist, Season.MultipleObjectsReturned) as e:
+            raise CommandError(f"Season not found: {e}")
+
+        self.stdout.write(f"Simulating {season}...")
+        started = time.monotonic()
+
+        def progress(round_num, played, skipped):
+            self.stdout.write(f"Round {round_num}: {played} matches played, {skipped} skipped")
+
+        stats = simulate_season(
+            season,
+            workers=options['workers'],
+            seed_salt=options['seed'],
+            progress=progress,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Played {stats['matches_played']} matches in {stats['rounds']} rounds "
+                f"({stats['matches_skipped']} skipped, "
+                f"{stats['championships_finished']} championships finished) "
+                f"in {time.monotonic() - started:.1f}s"
+            )
+        )
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tournaments.models import Season
+from tournaments.progress import reconcile_progress
+
+
+class Command(BaseCommand):
+    help = 'Checks season and championship match counters against the matches (and fixes them with --fix)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season',
+            type=int,
+            help='Season number to check (default: all seasons)'
+        )
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Write the recounted values back'
+        )
+
+    def handle(self, *args, **options):
+        season_ids = None
+        if options['season'] is not None:
+            try:
+                season_ids = [Season.objects.get(number=options['season']).id]
+            except Season.DoesNotExist:
+                raise CommandError(f"Season {options['season']} not found")
+
+        mismatches = reconcile_progress(season_ids, fix=options['fix'])
+        for obj, field, stored, actual in mismatches:
+            self.stdout.write(f"{obj}: {field} is {stored}, matches say {actual}")
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("Progress counters match the matches"))
+        elif options['fix']:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(mismatches)} counters"))
+        else:
+            self.stdout.write(
+                self.style.WARNING(f"{len(mismatches)} counters are off; run with --fix to correct them")
+            )
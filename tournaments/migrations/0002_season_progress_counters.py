@@ -0,0 +1,62 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:25
+
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def backfill_progress(apps, schema_editor):
+    Championship = apps.get_model('tournaments', 'Championship')
+    Season = apps.get_model('tournaments', 'Season')
+    championships = list(
+        Championship.objects.annotate(
+            total=models.Count('championshipmatch'),
+            finished=models.Count(
+                'championshipmatch', filter=models.Q(championshipmatch__match__status='finished')
+            ),
+        )
+    )
+    totals, finished = Counter(), Counter()
+    for championship in championships:
+        championship.matches_total = championship.total
+        championship.matches_finished = championship.finished
+        totals[championship.season_id] += championship.total
+        finished[championship.season_id] += championship.finished
+    Championship.objects.bulk_update(championships, ['matches_total', 'matches_finished'], batch_size=500)
+
+    seasons = list(Season.objects.all())
+    for season in seasons:
+        season.matches_total = totals[season.id]
+        season.matches_finished = finished[season.id]
+    Season.objects.bulk_update(seasons, ['matches_total', 'matches_finished'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='championship',
+            name='matches_finished',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='championship',
+            name='matches_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='season',
+            name='matches_finished',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='season',
+            name='matches_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
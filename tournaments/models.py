@@ -18,6 +18,9 @@ class Season(models.Model):
     start_date = models.DateField()
     end_date = models.DateField()
     is_active = models.BooleanField(default=False)
+    # Счётчики матчей сезона (см. tournaments.progress)
+    matches_total = models.PositiveIntegerField(default=0)
+    matches_finished = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ['-start_date']
@@ -44,6 +47,11 @@ class Season(models.Model):
                 'end_date': f'Дата окончания сезона должна быть {last_day}-м числом месяца'
             })
 
+    @property
+    def is_completed(self) -> bool:
+        """Проверяет по счётчикам, сыграны ли все матчи сезона"""
+        return self.matches_finished >= self.matches_total
+
     @property
     def is_february(self) -> bool:
         """Проверяет, является ли текущий сезон февральским"""
@@ -133,6 +141,9 @@ class Championship(models.Model):
         default=time(18, 0),
         help_text="Match start time (UTC)"
     )
+    # Счётчики матчей чемпионата (см. tournaments.progress)
+    matches_total = models.PositiveIntegerField(default=0)
+    matches_finished = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = ['season', 'league']
@@ -209,25 +220,13 @@ class Championship(models.Model):
 
     @property
     def is_completed(self) -> bool:
-        """Проверяет, завершены ли все матчи чемпионата"""
-        return not self.championshipmatch_set.filter(
-            ~models.Q(match__status='finished')
-        ).exists()
+        """Проверяет по счётчикам, завершены ли все матчи чемпионата"""
+        return self.matches_finished >= self.matches_total
 
     def get_standings(self) -> list:
-        """Возвращает отсортированную таблицу результатов"""
-        return (
-            self.championshipteam_set
-            .annotate(
-                goals_diff=models.F('goals_for') - models.F('goals_against')
-            )
-            .select_related('team')
-            .order_by(
-                '-points',
-                '-goals_diff',
-                '-goals_for'
-            )
-        )
+        """Возвращает отсортированную таблицу результатов (см. tournaments.standings)"""
+        from .standings import get_standings  # Импорт внутри функции
+        return get_standings(self.id)
 
     def validate_status(self) -> tuple:
         """
@@ -275,33 +274,27 @@ class ChampionshipTeam(models.Model):
             return round(self.points / self.matches_played, 2)
         return 0
 
+    def _standing(self):
+        from .standings import team_standing  # Импорт внутри функции
+        return team_standing(self.championship_id, self.team_id)
+
     @property
     def position(self) -> int:
-        """Возвращает текущую позицию команды в таблице"""
-        return (
-            self.championship.championshipteam_set
-            .annotate(
-                goals_diff=models.F('goals_for') - models.F('goals_against')
-            )
-            .filter(
-                models.Q(points__gt=self.points) |
-                (models.Q(points=self.points) & models.Q(goals_diff__gt=self.goals_difference)) |
-                (models.Q(points=self.points) & 
-                 models.Q(goals_diff=self.goals_difference) & 
-                 models.Q(goals_for__gt=self.goals_for))
-            )
-            .count() + 1
-        )
+        """Возвращает текущую позицию команды в таблице (RANK(), из кэша таблицы)"""
+        row = self._standing()
+        return row.rank if row else None
 
     @property
     def is_relegation_zone(self) -> bool:
         """Проверяет, находится ли команда в зоне вылета"""
-        return self.position >= 15
+        row = self._standing()
+        return bool(row and row.relegation_zone)
 
     @property
     def is_promotion_zone(self) -> bool:
         """Проверяет, находится ли команда в зоне повышения"""
-        return self.position <= 2
+        row = self._standing()
+        return bool(row and row.promotion_zone)
 
 class ChampionshipMatch(models.Model):
     """Model for linking matches to championship"""
@@ -0,0 +1,111 @@
+"""
+Season progress counters.
+
+``Championship`` and ``Season`` keep ``matches_total`` and
+``matches_finished`` so completion checks are reads of one row instead
+of counts over ``Match`` joined through ``ChampionshipMatch``:
+
+* a linked match adds to ``matches_total`` (``record_scheduled_matches``,
+  from the ``ChampionshipMatch`` post_save signal);
+* an applied result adds to ``matches_finished``
+  (``record_finished_matches``, from ``handle_match_result`` and the
+  offline season simulation);
+* bulk schedule generation recounts its seasons (``reconcile_progress``).
+
+Increments are ``F()`` updates, so concurrent results do not lose counts.
+Paths that bypass these hooks (raw deletes, queryset updates of match
+status) are caught by ``reconcile_progress``, which the
+``verify_season_progress`` command runs.
+"""
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import models, transaction
+
+from .models import Championship, Season
+
+PROGRESS_FIELDS = ['matches_total', 'matches_finished']
+
+# {(season_id, championship_id): number of matches}
+ProgressCounts = Dict[Tuple[int, int], int]
+
+
+def _increment(field: str, counts: ProgressCounts) -> None:
+    championships_by_amount = defaultdict(list)
+    seasons = Counter()
+    for (season_id, championship_id), amount in counts.items():
+        if amount:
+            championships_by_amount[amount].append(championship_id)
+            seasons[season_id] += amount
+    seasons_by_amount = defaultdict(list)
+    for season_id, amount in seasons.items():
+        seasons_by_amount[amount].append(season_id)
+
+    # One UPDATE per distinct amount: a round adds the same number of
+    # matches to every league
+    for amount, ids in championships_by_amount.items():
+        Championship.objects.filter(id__in=ids).update(**{field: models.F(field) + amount})
+    for amount, ids in seasons_by_amount.items():
+        Season.objects.filter(id__in=ids).update(**{field: models.F(field) + amount})
+
+
+def record_scheduled_matches(counts: ProgressCounts) -> None:
+    """Adds newly linked championship matches to ``matches_total``."""
+    _increment('matches_total', counts)
+
+
+def record_finished_matches(counts: ProgressCounts) -> None:
+    """Adds matches whose result was applied to ``matches_finished``."""
+    _increment('matches_finished', counts)
+
+
+def reconcile_progress(season_ids: Optional[Iterable[int]] = None, fix: bool = False) -> List[tuple]:
+    """
+    Recounts the progress of the given seasons (all when ``None``) from
+    ``ChampionshipMatch`` (one aggregate query per model).  Returns the mismatches as
+    ``(object, field, stored, actual)``; with ``fix`` they are written
+    back with one bulk update per model.
+    """
+    championships = Championship.objects.select_related('season', 'league').order_by('season_id', 'id')
+    seasons = Season.objects.order_by('id')
+    if season_ids is not None:
+        season_ids = list(season_ids)
+        championships = championships.filter(season_id__in=season_ids)
+        seasons = seasons.filter(id__in=season_ids)
+    championships = championships.annotate(
+        actual_total=models.Count('championshipmatch'),
+        actual_finished=models.Count(
+            'championshipmatch', filter=models.Q(championshipmatch__match__status='finished')
+        ),
+    )
+
+    actual_by_season = defaultdict(lambda: {'matches_total': 0, 'matches_finished': 0})
+    mismatches = []
+    changed_championships = []
+    for championship in championships:
+        actual = {'matches_total': championship.actual_total, 'matches_finished': championship.actual_finished}
+        for field, value in actual.items():
+            actual_by_season[championship.season_id][field] += value
+        if _compare(championship, actual, mismatches):
+            changed_championships.append(championship)
+
+    changed_seasons = [
+        season for season in seasons if _compare(season, actual_by_season[season.id], mismatches)
+    ]
+
+    if fix and mismatches:
+        with transaction.atomic():
+            Championship.objects.bulk_update(changed_championships, PROGRESS_FIELDS)
+            Season.objects.bulk_update(changed_seasons, PROGRESS_FIELDS)
+    return mismatches
+
+
+def _compare(obj, actual: Dict[str, int], mismatches: List[tuple]) -> bool:
+    changed = False
+    for field in PROGRESS_FIELDS:
+        stored = getattr(obj, field)
+        if stored != actual[field]:
+            mismatches.append((obj, field, stored, actual[field]))
+            setattr(obj, field, actual[field])
+            changed = True
+    return changed
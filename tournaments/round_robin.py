@@ -0,0 +1,140 @@
+"""
+Double round-robin schedules as integer arrays.
+
+Teams are numbered ``0..n-1``; a schedule is an ``(matches, 3)`` array of
+``(round, home, away)`` rows with 1-based rounds.  Any ``n >= 2`` works:
+an odd league gets a dummy opponent and whoever meets it sits the round
+out (bye), so it has ``2n`` rounds instead of ``2(n-1)``.
+
+Rounds come from the circle (Berger) method, orientated so that within
+a leg no team plays more than two home or away games in a row.  The
+second leg mirrors the first with home and away swapped, starting from
+its second round and ending with the mirror of round 1, which keeps the
+streak limit across the change of legs too.  Every team plays every other
+team once at home and once away, so home and away games are balanced.
+
+``schedule_errors`` checks a schedule (generated or read back from the
+database) in one vectorised pass: match count, each ordered pair exactly
+once, one game per team per round, home/away balance and streaks.
+"""
+from typing import List
+
+import numpy as np
+
+BYE = -1
+MAX_STREAK = 2
+
+
+def round_robin_rounds(team_count: int) -> np.ndarray:
+    """
+    ``(rounds, pairs, 2)`` array of (home, away) per round of a double
+    round robin; pairs with a ``BYE`` side are byes.
+    """
+    if team_count < 2:
+        raise ValueError(f"A round robin needs at least 2 teams, got {team_count}")
+    size = team_count + team_count % 2
+    rounds = size - 1
+    round_index = np.arange(rounds)
+    r = round_index[:, None]
+    k = np.arange(1, size // 2)[None, :]
+
+    # The fixed team meets team r, alternating home and away
+    fixed = np.full(rounds, size - 1)
+    first = np.where(
+        (round_index % 2 == 0)[:, None],
+        np.stack([round_index, fixed], axis=1),
+        np.stack([fixed, round_index], axis=1),
+    )
+    # The others pair up symmetrically around r, odd distances at home
+    x = (r + k) % rounds
+    y = (r - k) % rounds
+    odd = (k % 2 == 1)
+    rest = np.stack([np.where(odd, x, y), np.where(odd, y, x)], axis=-1)
+
+    first_leg = np.concatenate([first[:, None, :], rest], axis=1)
+    second_leg = first_leg[np.roll(np.arange(rounds), -1)][..., ::-1]
+    schedule = np.concatenate([first_leg, second_leg])
+    schedule[schedule == team_count] = BYE
+    return schedule
+
+
+def schedule_matches(team_count: int) -> np.ndarray:
+    """``(matches, 3)`` array of (round, home, away), byes dropped, in round order."""
+    rounds = round_robin_rounds(team_count)
+    round_numbers = np.broadcast_to(
+        np.arange(1, len(rounds) + 1)[:, None, None], rounds.shape[:2] + (1,)
+    )
+    matches = np.concatenate([round_numbers, rounds], axis=-1).reshape(-1, 3)
+    return matches[(matches[:, 1] != BYE) & (matches[:, 2] != BYE)]
+
+
+def _max_streaks(venues: np.ndarray) -> np.ndarray:
+    """
+    Longest run of equal non-zero values per row of ``venues`` (+1 home,
+    -1 away, 0 no game), skipping the zeros: a bye does not break a run.
+    """
+    teams = venues.shape[0]
+    played = np.take_along_axis(venues, np.argsort(venues == 0, axis=1, kind='stable'), axis=1)
+    # A zero column between rows so runs never cross teams
+    flat = np.concatenate([played, np.zeros((teams, 1), dtype=played.dtype)], axis=1).ravel()
+    starts = np.flatnonzero(np.concatenate([[True], flat[1:] != flat[:-1]]))
+    lengths = np.diff(np.append(starts, len(flat)))
+    games = flat[starts] != 0
+    streaks = np.zeros(teams, dtype=np.int64)
+    np.maximum.at(streaks, starts[games] // (played.shape[1] + 1), lengths[games])
+    return streaks
+
+
+def schedule_errors(matches: np.ndarray, team_count: int, max_streak: int = MAX_STREAK) -> List[str]:
+    """
+    Problems of a double round-robin schedule given as ``(round, home,
+    away)`` rows with teams ``0..team_count-1``; an empty list means valid.
+    """
+    matches = np.asarray(matches, dtype=np.int64).reshape(-1, 3)
+    rounds, home, away = matches[:, 0], matches[:, 1], matches[:, 2]
+    n = team_count
+    errors = []
+
+    expected = n * (n - 1)
+    if len(matches) != expected:
+        errors.append(f"{len(matches)} matches instead of {expected}")
+    if len(matches) == 0:
+        return errors
+    if ((home < 0) | (home >= n) | (away < 0) | (away >= n)).any():
+        errors.append("team index out of range")
+        return errors
+    if (rounds < 1).any():
+        errors.append("round numbers must start at 1")
+        return errors
+    if (home == away).any():
+        errors.append(f"{int((home == away).sum())} matches of a team against itself")
+
+    pairs = np.bincount(home * n + away, minlength=n * n).reshape(n, n)
+    np.fill_diagonal(pairs, 1)
+    wrong = np.argwhere(pairs != 1)
+    if len(wrong):
+        errors.append(f"{len(wrong)} home/away pairings not played exactly once, e.g. {wrong[0].tolist()}")
+
+    last_round = int(rounds.max())
+    per_round = np.bincount(
+        np.concatenate([rounds * n + home, rounds * n + away]), minlength=(last_round + 1) * n,
+    )
+    if (per_round > 1).any():
+        errors.append("a team plays more than once in a round")
+
+    home_games = np.bincount(home, minlength=n)
+    away_games = np.bincount(away, minlength=n)
+    unbalanced = np.flatnonzero((home_games != n - 1) | (away_games != n - 1))
+    if len(unbalanced):
+        errors.append(f"unbalanced home/away games for teams {unbalanced.tolist()}")
+
+    venues = np.zeros((n, last_round + 1), dtype=np.int8)
+    venues[home, rounds] = 1
+    venues[away, rounds] = -1
+    streaks = _max_streaks(venues)
+    too_long = np.flatnonzero(streaks > max_streak)
+    if len(too_long):
+        errors.append(
+            f"more than {max_streak} consecutive home or away games for teams {too_long.tolist()}"
+        )
+    return errors
@@ -0,0 +1,174 @@
+"""
+Season rollover.
+
+Ends a season and starts the next one with a fixed number of statements,
+however many countries and leagues there are:
+
+1. ``season_transitions`` ranks every championship of the season in one
+   window-function query (``standings.rank_teams``) and picks, per country,
+   the bottom ``TRANSITION_PLACES`` of division 1 and the top ones of
+   division 2;
+2. ``apply_transitions`` moves those clubs with one ``bulk_update`` (no
+   per-club ``save()``/``full_clean()``) and sets their
+   ``promoted``/``relegated`` flags;
+3. ``start_season`` creates the season, a championship for every league
+   with a full set of clubs, their ``ChampionshipTeam`` rows and all
+   fixtures with bulk inserts.
+
+``rollover_season`` runs the three steps in one transaction and returns
+counters and per-step timings in seconds.  Bulk writes send no signals,
+so the API version stamps (``tournaments.versions``) are bumped here.
+"""
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from clubs.models import Club
+
+from .models import Championship, ChampionshipTeam, League, Season
+from .standings import rank_teams
+from .utils import SCHEDULE_BATCH_SIZE, create_season_matches
+from .versions import bump_versions
+
+TRANSITION_PLACES = 2
+SEASON_DAYS = 30
+LEAGUE_TEAMS = 16
+
+TRANSITION_FIELDS = (
+    'team_id', 'team__name', 'points', 'goals_diff', 'table_position', 'teams_total',
+    'championship__league_id', 'championship__league__country', 'championship__league__level',
+)
+
+
+def season_transitions(season, places: int = TRANSITION_PLACES) -> Dict[str, dict]:
+    """
+    Promotions and relegations of every country of ``season``:
+    ``{country: {'div1': league_id, 'div2': league_id, 'relegated': [...],
+    'promoted': [...]}}`` with the standings rows as dicts.  Countries
+    without both divisions are left out.
+    """
+    rows = (
+        rank_teams(ChampionshipTeam.objects.filter(
+            championship__season=season,
+            championship__league__level__in=(1, 2),
+        ))
+        .order_by('championship_id', 'table_position')
+        .values(*TRANSITION_FIELDS)
+    )
+    countries = defaultdict(lambda: {'div1': None, 'div2': None, 'relegated': [], 'promoted': []})
+    for row in rows:
+        country = countries[str(row['championship__league__country'])]
+        if row['championship__league__level'] == 1:
+            country['div1'] = row['championship__league_id']
+            if row['table_position'] > row['teams_total'] - places:
+                country['relegated'].append(row)
+        else:
+            country['div2'] = row['championship__league_id']
+            if row['table_position'] <= places:
+                country['promoted'].append(row)
+    return {code: moves for code, moves in countries.items() if moves['div1'] and moves['div2']}
+
+
+def apply_transitions(transitions: Dict[str, dict]) -> int:
+    """
+    Moves relegated and promoted clubs with one bulk update; flags of
+    clubs moved in earlier seasons are cleared.  Returns the clubs moved.
+    """
+    moved = []
+    for moves in transitions.values():
+        for row in moves['relegated']:
+            moved.append(Club(id=row['team_id'], league_id=moves['div2'], relegated=True, promoted=False))
+        for row in moves['promoted']:
+            moved.append(Club(id=row['team_id'], league_id=moves['div1'], relegated=False, promoted=True))
+    Club.objects.filter(models.Q(promoted=True) | models.Q(relegated=True)).update(promoted=False, relegated=False)
+    Club.objects.bulk_update(moved, ['league', 'promoted', 'relegated'], batch_size=SCHEDULE_BATCH_SIZE)
+    return len(moved)
+
+
+def start_season(start_date: Optional[date] = None, days: int = SEASON_DAYS) -> dict:
+    """
+    Creates the next season (active) with a championship and fixtures for
+    every league that has exactly ``LEAGUE_TEAMS`` clubs.  Returns the
+    season, its championships, the skipped leagues and the match count.
+    """
+    start_date = start_date or timezone.now().date()
+    last_season = Season.objects.order_by('-number').first()
+    number = 1 if not last_season else last_season.number + 1
+    season = Season.objects.create(
+        number=number,
+        name=f"Season {number}",
+        start_date=start_date,
+        end_date=start_date + timedelta(days=days),
+        is_active=True
+    )
+
+    clubs_by_league = defaultdict(list)
+    for club in Club.objects.filter(league__isnull=False).order_by('id'):
+        clubs_by_league[club.league_id].append(club)
+    leagues = list(League.objects.order_by('country', 'level'))
+    full = [league for league in leagues if len(clubs_by_league[league.id]) == LEAGUE_TEAMS]
+    skipped = [league for league in leagues if len(clubs_by_league[league.id]) != LEAGUE_TEAMS]
+
+    championships = Championship.objects.bulk_create([
+        Championship(
+            season=season,
+            league=league,
+            status='pending',
+            start_date=season.start_date,
+            end_date=season.end_date
+        )
+        for league in full
+    ])
+    teams = {championship.id: clubs_by_league[championship.league_id] for championship in championships}
+    ChampionshipTeam.objects.bulk_create(
+        [
+            ChampionshipTeam(championship=championship, team=club)
+            for championship in championships
+            for club in teams[championship.id]
+        ],
+        batch_size=SCHEDULE_BATCH_SIZE,
+    )
+    matches = create_season_matches(championships, teams)
+    bump_versions('championships')
+    return {'season': season, 'championships': championships, 'skipped_leagues': skipped, 'matches': matches}
+
+
+def rollover_season(season, days: int = SEASON_DAYS, places: int = TRANSITION_PLACES) -> dict:
+    """
+    Applies the transitions of ``season``, closes it and starts the next
+    one, all in one transaction.  Returns counters and ``timings``.
+    """
+    timings = {}
+    started = time.monotonic()
+    with transaction.atomic():
+        step = time.monotonic()
+        transitions = season_transitions(season, places)
+        timings['standings'] = time.monotonic() - step
+
+        step = time.monotonic()
+        moved = apply_transitions(transitions)
+        timings['transitions'] = time.monotonic() - step
+
+        # Queryset update: Season.save(update_fields=['is_active']) would
+        # trigger handle_season_transitions again through the signal
+        Season.objects.filter(pk=season.pk).update(is_active=False)
+        bump_versions('seasons')
+
+        step = time.monotonic()
+        created = start_season(days=days)
+        timings['new_season'] = time.monotonic() - step
+    timings['total'] = time.monotonic() - started
+
+    return {
+        'transitions': transitions,
+        'clubs_moved': moved,
+        'season': created['season'],
+        'championships': len(created['championships']),
+        'skipped_leagues': created['skipped_leagues'],
+        'matches': created['matches'],
+        'timings': timings,
+    }
@@ -0,0 +1,257 @@
+"""
+Offline season simulation.
+
+Plays every scheduled championship match of a season with the Markov
+engine, round by round, without the real-time clock.  The parent process
+loads the players of all clubs of the season into a
+``PlayerAttributeMatrix`` once, picks a lineup per club and builds each
+club's roster from the matrix (no per-match queries).  The matches of a
+round (across all leagues) are played in a process pool by
+``matches.engines.markov_match.simulate_markov_match``, which needs no
+database; the parent then applies the round in bulk: one ``bulk_update``
+for the matches, one for ``ChampionshipTeam``, one ``UPDATE`` for the
+championship matches and the progress counters, inside a transaction per
+round.
+
+Matches are seeded with ``markov_seed`` (or their id), so a rerun of the
+same schedule gives the same results.
+"""
+import logging
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from django.db import models, transaction
+from django.utils import timezone
+
+from matches.engines.markov_match import simulate_markov_match
+from matches.models import Match
+from matches.roster import build_match_rosters
+from matches.utils import extract_player_id
+from players.attribute_matrix import LINES, PlayerAttributeMatrix
+from players.models import Player
+
+from .models import Championship, ChampionshipMatch, ChampionshipTeam
+from .progress import record_finished_matches
+from .standings import invalidate_standings
+from .versions import bump_championships, bump_versions
+
+logger = logging.getLogger(__name__)
+
+LINEUP_SIZE = 11
+# Matches handed to a worker at a time
+POOL_CHUNK_SIZE = 8
+
+MATCH_RESULT_FIELDS = [
+    'home_score', 'away_score', 'status', 'processed', 'home_lineup', 'away_lineup',
+    'current_minute', 'started_at', 'last_minute_update', 'waiting_for_next_minute',
+    'markov_seed', 'markov_token', 'markov_coefficients', 'st_shoots', 'st_fouls', 'st_possessions',
+]
+TEAM_STAT_FIELDS = ['points', 'matches_played', 'wins', 'draws', 'losses', 'goals_for', 'goals_against']
+
+
+def _lineup_slots(matrix: PlayerAttributeMatrix, rows: List[int], label: str) -> dict:
+    lineup = {}
+    for slot, row in enumerate(rows):
+        lineup[str(slot)] = {
+            "playerId": str(int(matrix.ids[row])),
+            "slotType": "goalkeeper" if slot == 0 else "auto",
+            "slotLabel": "GK" if slot == 0 else f"{label}_{slot}",
+            "playerPosition": matrix.position(row),
+        }
+    return lineup
+
+
+def offline_lineup(matrix: PlayerAttributeMatrix, club_id: int, club_lineup=None) -> Optional[dict]:
+    """
+    Lineup of a club for offline play: the club's saved lineup when all 11
+    slots are filled with its own players, otherwise the best goalkeeper
+    and the ten best outfield players by attribute total (ties go to the
+    lowest id).  ``None`` if the club cannot field a team.
+    """
+    rows = matrix.club_rows(club_id)
+    saved = (club_lineup or {}).get('lineup') if isinstance(club_lineup, dict) else None
+    if isinstance(saved, dict) and all(str(slot) in saved for slot in range(LINEUP_SIZE)):
+        ids = [extract_player_id(saved[str(slot)]) for slot in range(LINEUP_SIZE)]
+        ids = [int(pid) for pid in ids if pid and pid.isdigit()]
+        own = set(matrix.ids[rows].tolist())
+        if len(set(ids)) == LINEUP_SIZE and all(pid in own for pid in ids):
+            return _lineup_slots(matrix, matrix.rows(ids).tolist(), "SLOT")
+
+    if len(rows) < LINEUP_SIZE:
+        return None
+    totals = matrix.attribute_totals()[rows]
+    # Best first, lowest id among equals (rows are sorted by id)
+    ranked = rows[np.argsort(-totals, kind='stable')]
+    is_keeper = matrix.lines()[ranked] == LINES.index('GK')
+    keepers, outfield = ranked[is_keeper], ranked[~is_keeper]
+    if not len(keepers) or len(outfield) < LINEUP_SIZE - 1:
+        return None
+    return _lineup_slots(matrix, [keepers[0]] + outfield[:LINEUP_SIZE - 1].tolist(), "AUTO")
+
+
+def _round_jobs(fixtures, rosters, seed_salt) -> List[dict]:
+    jobs = []
+    for fixture in fixtures:
+        match = fixture.match
+        seed = match.markov_seed or match.id
+        if seed_salt is not None:
+            seed = seed_salt * 1_000_003 + match.id
+        jobs.append({
+            "match_id": match.id,
+            "seed": seed,
+            "home_name": match.home_team.name,
+            "away_name": match.away_team.name,
+            "rosters": {"home": rosters[match.home_team_id], "away": rosters[match.away_team_id]},
+        })
+    return jobs
+
+
+def apply_round_results(fixtures, results: Dict[int, dict], lineups: Dict[int, dict]) -> None:
+    """
+    Writes the results of one round: matches, championship tables,
+    ``processed`` flags and progress counters, each with a single bulk
+    statement.
+    """
+    now = timezone.now()
+    matches = []
+    deltas = defaultdict(lambda: dict.fromkeys(TEAM_STAT_FIELDS, 0))
+    for fixture in fixtures:
+        match = fixture.match
+        result = results[match.id]
+        match.home_score = result["home_score"]
+        match.away_score = result["away_score"]
+        match.status = 'finished'
+        match.processed = True
+        match.home_lineup = lineups[match.home_team_id]
+        match.away_lineup = lineups[match.away_team_id]
+        match.current_minute = result["minutes"]
+        match.started_at = match.started_at or now
+        match.last_minute_update = now
+        match.waiting_for_next_minute = False
+        match.markov_seed = result["seed"]
+        match.markov_token = result["token"]
+        match.markov_coefficients = result["coefficients"]
+        match.st_shoots = result["shots"]
+        match.st_fouls = result["fouls"]
+        match.st_possessions = result["possessions"]
+        matches.append(match)
+
+        for team_id, scored, conceded in (
+            (match.home_team_id, match.home_score, match.away_score),
+            (match.away_team_id, match.away_score, match.home_score),
+        ):
+            delta = deltas[(fixture.championship_id, team_id)]
+            delta['matches_played'] += 1
+            delta['goals_for'] += scored
+            delta['goals_against'] += conceded
+            if scored > conceded:
+                delta['wins'] += 1
+                delta['points'] += 3
+            elif scored < conceded:
+                delta['losses'] += 1
+            else:
+                delta['draws'] += 1
+                delta['points'] += 1
+
+    championship_ids = {fixture.championship_id for fixture in fixtures}
+    finished = Counter((fixture.championship.season_id, fixture.championship_id) for fixture in fixtures)
+    with transaction.atomic():
+        Match.objects.bulk_update(matches, MATCH_RESULT_FIELDS)
+        teams = list(
+            ChampionshipTeam.objects.select_for_update()
+            .filter(championship_id__in=championship_ids)
+            .order_by()
+        )
+        changed = []
+        for team in teams:
+            delta = deltas.get((team.championship_id, team.team_id))
+            if delta:
+                for field, value in delta.items():
+                    setattr(team, field, getattr(team, field) + value)
+                changed.append(team)
+        ChampionshipTeam.objects.bulk_update(changed, TEAM_STAT_FIELDS)
+        ChampionshipMatch.objects.filter(id__in=[fixture.id for fixture in fixtures]).update(processed=True)
+        record_finished_matches(finished)
+        for championship_id in championship_ids:
+            invalidate_standings(championship_id)
+        bump_championships(championship_ids)
+
+
+def simulate_season(
+    season,
+    workers: Optional[int] = None,
+    seed_salt: Optional[int] = None,
+    progress: Optional[Callable[[int, int, int], None]] = None,
+) -> dict:
+    """
+    Plays all scheduled championship matches of ``season``.  ``workers`` is
+    the pool size (``None``: one per CPU, ``0``: play in this process).
+    ``progress(round, matches_played, matches_skipped)`` is called after
+    each round.  Returns counters of the run.
+    """
+    fixtures = list(
+        ChampionshipMatch.objects
+        .filter(championship__season=season, match__status='scheduled', processed=False)
+        .select_related('championship', 'match', 'match__home_team', 'match__away_team')
+        .order_by('round', 'championship_id', 'match_day', 'match_id')
+    )
+    stats = {'rounds': 0, 'matches_played': 0, 'matches_skipped': 0, 'championships_finished': 0}
+    if not fixtures:
+        return stats
+
+    clubs = {}
+    for fixture in fixtures:
+        clubs[fixture.match.home_team_id] = fixture.match.home_team
+        clubs[fixture.match.away_team_id] = fixture.match.away_team
+    matrix = PlayerAttributeMatrix.load(Player.objects.filter(club_id__in=list(clubs)))
+
+    lineups, rosters = {}, {}
+    for club_id, club in clubs.items():
+        lineup = offline_lineup(matrix, club_id, club.lineup)
+        if lineup is None:
+            logger.warning("Club %s cannot field a lineup; its matches are skipped", club_id)
+            continue
+        lineups[club_id] = lineup
+        rosters[club_id] = build_match_rosters(
+            SimpleNamespace(home_lineup=lineup, away_lineup=None), matrix=matrix
+        )['home']
+
+    by_round = defaultdict(list)
+    for fixture in fixtures:
+        if fixture.match.home_team_id in lineups and fixture.match.away_team_id in lineups:
+            by_round[fixture.round].append(fixture)
+        else:
+            stats['matches_skipped'] += 1
+
+    Championship.objects.filter(season=season, status='pending').update(status='in_progress')
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    try:
+        for round_num in sorted(by_round):
+            round_fixtures = by_round[round_num]
+            jobs = _round_jobs(round_fixtures, rosters, seed_salt)
+            if pool is not None:
+                played = pool.map(simulate_markov_match, jobs, chunksize=POOL_CHUNK_SIZE)
+            else:
+                played = map(simulate_markov_match, jobs)
+            results = {result["match_id"]: result for result in played}
+            apply_round_results(round_fixtures, results, lineups)
+            stats['rounds'] += 1
+            stats['matches_played'] += len(round_fixtures)
+            if progress:
+                progress(round_num, stats['matches_played'], stats['matches_skipped'])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    stats['championships_finished'] = (
+        Championship.objects.filter(season=season, matches_finished__gte=models.F('matches_total'))
+        .exclude(status='finished')
+        .update(status='finished')
+    )
+    # Championship statuses changed with queryset updates (no signals)
+    bump_versions('championships')
+    return stats
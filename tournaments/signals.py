@@ -1,7 +1,10 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from clubs.models import Club
-from tournaments.models import Championship, ChampionshipTeam, ChampionshipMatch, Season
+from tournaments.models import Championship, ChampionshipTeam, ChampionshipMatch, League, Season
+from tournaments.progress import record_finished_matches, record_scheduled_matches
+from tournaments.standings import invalidate_standings, team_standing
+from tournaments.versions import bump_championships, bump_versions
 from matches.models import Match
 from django.db import transaction
 from django.db.models import Q
@@ -129,7 +132,11 @@ def handle_match_result(sender, instance, **kwargs):
             'match__away_team'
         ).filter(match=instance).first()
 
-        if not championship_match or championship_match.processed or instance.status != 'finished':
+        if not championship_match:
+            return
+        # Статус и счёт матча входят в ответы API чемпионата
+        bump_championships([championship_match.championship_id])
+        if championship_match.processed or instance.status != 'finished':
             return
 
         max_attempts = 3
@@ -175,8 +182,12 @@ def handle_match_result(sender, instance, **kwargs):
                     home_stats.save()
                     away_stats.save()
 
-                    # Проверяем завершение чемпионата
+                    # Счётчики прогресса чемпионата и сезона
                     championship = championship_match.championship
+                    record_finished_matches({(championship.season_id, championship.id): 1})
+                    championship.refresh_from_db(fields=['matches_total', 'matches_finished'])
+
+                    # Проверяем завершение чемпионата
                     if championship.is_completed and championship.status != 'finished':
                         championship.status = 'finished'
                         championship.save()
@@ -215,8 +226,11 @@ def update_team_league(sender, instance, **kwargs):
             with transaction.atomic():
                 team = instance.team
                 
-                # Получаем текущую позицию команды
-                position = instance.position
+                # Получаем текущую позицию команды (без кэша: строка только что изменилась)
+                standing = team_standing(instance.championship_id, instance.team_id, use_cache=False)
+                position = standing.rank if standing else None
+                if position is None:
+                    return
                 current_level = instance.championship.league.level
                 
                 # Определяем, нужно ли менять лигу
@@ -235,4 +249,64 @@ def update_team_league(sender, instance, **kwargs):
                     team.league = new_league
                     team.save()
         except Exception as e:
-            raise
\ No newline at end of file
+            raise
+
+@receiver(post_save, sender=ChampionshipTeam)
+@receiver(post_delete, sender=ChampionshipTeam)
+def invalidate_championship_standings(sender, instance, **kwargs):
+    """Сбрасывает кэш таблицы после применения результата или замены команды"""
+    invalidate_standings(instance.championship_id)
+    bump_championships([instance.championship_id])
+
+@receiver(post_save, sender=ChampionshipMatch)
+def count_scheduled_match(sender, instance, created, **kwargs):
+    """Учитывает новый матч в счётчиках чемпионата и сезона (bulk_create пересчитывает сам)"""
+    if created:
+        record_scheduled_matches({(instance.championship.season_id, instance.championship_id): 1})
+
+@receiver(post_save, sender=Season)
+@receiver(post_delete, sender=Season)
+def bump_season_versions(sender, instance, **kwargs):
+    """Сбрасывает версии ответов API со списком сезонов"""
+    bump_versions('seasons')
+
+@receiver(post_save, sender=League)
+@receiver(post_delete, sender=League)
+def bump_league_versions(sender, instance, **kwargs):
+    """Сбрасывает версии ответов API со списком лиг"""
+    bump_versions('leagues')
+
+@receiver(post_save, sender=Championship)
+@receiver(post_delete, sender=Championship)
+def bump_championship_versions(sender, instance, **kwargs):
+    """Сбрасывает версии ответов API со списком и с данными чемпионата"""
+    bump_versions('championships')
+    bump_championships([instance.id])
+
+# Поля клуба, которые попадают в ответы API чемпионатов
+CLUB_API_FIELDS = ('name',)
+
+@receiver(pre_save, sender=Club)
+def remember_club_api_fields(sender, instance, update_fields=None, **kwargs):
+    """Запоминает, меняются ли поля клуба, которые видны в API чемпионатов"""
+    instance._api_fields_changed = False
+    if instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(CLUB_API_FIELDS):
+        return
+    old = Club.objects.filter(pk=instance.pk).values(*CLUB_API_FIELDS).first()
+    instance._api_fields_changed = old is not None and any(
+        old[field] != getattr(instance, field) for field in CLUB_API_FIELDS
+    )
+
+@receiver(post_save, sender=Club)
+def bump_club_championships(sender, instance, created, **kwargs):
+    """Сбрасывает таблицы и версии чемпионатов клуба после переименования"""
+    if created or not getattr(instance, '_api_fields_changed', False):
+        return
+    championship_ids = list(
+        ChampionshipTeam.objects.filter(team=instance).values_list('championship_id', flat=True)
+    )
+    for championship_id in championship_ids:
+        invalidate_standings(championship_id)
+    bump_championships(championship_ids)
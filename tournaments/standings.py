@@ -0,0 +1,98 @@
+"""
+Championship standings.
+
+The table is ranked in the database with window functions: one query
+returns every ``ChampionshipTeam`` of a championship with its goal
+difference, its row in the table (``ROW_NUMBER()``) and its rank
+(``RANK()``, teams level on points, goal difference and goals scored
+share it).  The ranked rows are cached per championship and the cache is
+dropped after commit whenever a ``ChampionshipTeam`` row is saved or
+deleted, i.e. when a result is applied (see ``tournaments.signals``).
+
+Row attributes added to each ``ChampionshipTeam``:
+
+* ``goals_diff``       -- goals for minus goals against;
+* ``table_position``   -- 1-based row in the table (ties broken by team id);
+* ``rank``             -- ``RANK()`` over points, goal difference, goals for;
+* ``relegation_zone`` / ``promotion_zone`` -- by ``table_position``, the
+  same rows ``Championship.get_teams_for_relegation/promotion`` pick.
+"""
+from typing import List, Optional
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.functions import Rank, RowNumber
+
+from .models import ChampionshipTeam
+
+STANDINGS_CACHE_TIMEOUT = 24 * 60 * 60
+RELEGATION_PLACES = 2
+PROMOTION_PLACES = 2
+
+RANK_ORDER = (
+    models.F('points').desc(),
+    models.F('goals_diff').desc(),
+    models.F('goals_for').desc(),
+)
+TABLE_ORDER = RANK_ORDER + (models.F('team_id').asc(),)
+
+
+def standings_cache_key(championship_id: int) -> str:
+    return f"championship_standings:{championship_id}"
+
+
+def rank_teams(queryset):
+    """
+    Annotates ``ChampionshipTeam`` rows with ``goals_diff``,
+    ``table_position``, ``rank`` and ``teams_total``, each computed within
+    the row's championship, so one query can rank many championships.
+    """
+    partition = [models.F('championship_id')]
+    return (
+        queryset
+        .annotate(goals_diff=models.F('goals_for') - models.F('goals_against'))
+        .annotate(
+            table_position=models.Window(RowNumber(), partition_by=partition, order_by=TABLE_ORDER),
+            rank=models.Window(Rank(), partition_by=partition, order_by=RANK_ORDER),
+            teams_total=models.Window(models.Count('id'), partition_by=partition),
+        )
+    )
+
+
+def compute_standings(championship_id: int) -> List[ChampionshipTeam]:
+    """Ranked table of a championship, read with a single query."""
+    rows = list(
+        rank_teams(ChampionshipTeam.objects.filter(championship_id=championship_id))
+        .select_related('team')
+        .order_by('table_position')
+    )
+    relegation_cutoff = max(len(rows) - RELEGATION_PLACES + 1, 1)
+    promotion_cutoff = min(PROMOTION_PLACES, len(rows))
+    for row in rows:
+        row.relegation_zone = row.table_position >= relegation_cutoff
+        row.promotion_zone = row.table_position <= promotion_cutoff
+    return rows
+
+
+def get_standings(championship_id: int, use_cache: bool = True) -> List[ChampionshipTeam]:
+    """Cached ranked table; ``use_cache=False`` reads it fresh (and re-caches)."""
+    key = standings_cache_key(championship_id)
+    rows = cache.get(key) if use_cache else None
+    if rows is None:
+        rows = compute_standings(championship_id)
+        cache.set(key, rows, STANDINGS_CACHE_TIMEOUT)
+    return rows
+
+
+def team_standing(championship_id: int, team_id: int, use_cache: bool = True) -> Optional[ChampionshipTeam]:
+    """The team's row of the ranked table, or ``None``."""
+    for row in get_standings(championship_id, use_cache=use_cache):
+        if row.team_id == team_id:
+            return row
+    return None
+
+
+def invalidate_standings(championship_id: int) -> None:
+    """Drops the cached table once the current transaction commits."""
+    key = standings_cache_key(championship_id)
+    transaction.on_commit(lambda: cache.delete(key))
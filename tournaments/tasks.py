@@ -2,17 +2,19 @@
 
 import time
 import logging
-from typing import Optional, Iterable
+from typing import Dict, Optional, Iterable
 from celery import shared_task
 from django.utils import timezone
 from django.db import transaction, OperationalError
 from django.conf import settings
 from django.core.management import call_command
 from matches.models import Match, MatchEvent
-from matches.engines.markov_runtime import simulate_markov_minute
-from players.models import Player, get_player_line
+from matches.markov_minute import play_markov_minute
+from matches.roster import get_match_rosters, roster_names
 from clubs.models import Club
+from players.models import Player
 from .models import Season, Championship, League
+from .season_rollover import rollover_season
 import random
 from datetime import timedelta
 from django.core.exceptions import ObjectDoesNotExist
@@ -20,113 +22,19 @@ from django.core.exceptions import ObjectDoesNotExist
 logger = logging.getLogger("match_creation")
 
 
-ZONE_HINT_TO_FIELD = {
-    "DEF": "DEF-C",
-    "MID": "MID-C",
-    "FINAL": "AM-C",
-}
-ZONE_TEXT = {
-    "DEF": "the defensive third",
-    "MID": "midfield",
-    "FINAL": "the final third",
-}
-
-
-def _map_zone_from_markov(zone_hint: Optional[str], fallback: str) -> str:
-    if not zone_hint:
-        return fallback or "MID-C"
-    return ZONE_HINT_TO_FIELD.get(zone_hint.upper(), fallback or "MID-C")
-
-
-def _possession_indicator_from_markov(possession: Optional[str]) -> int:
-    if possession == "home":
-        return 1
-    if possession == "away":
-        return 2
-    return 0
-
-
-def _serialize_event_for_ws(event: MatchEvent) -> dict:
+def _serialize_event_for_ws(event: MatchEvent, names: Dict[int, str]) -> dict:
+    """WS payload of an event; player names come from the cached roster (``roster_names``)."""
     return {
         "id": event.id,
         "minute": event.minute,
         "event_type": event.event_type,
         "description": event.description,
         "personality_reason": event.personality_reason,
-        "player_name": f"{event.player.first_name} {event.player.last_name}" if event.player else "",
-        "related_player_name": f"{event.related_player.first_name} {event.related_player.last_name}" if event.related_player else "",
+        "player_name": names.get(event.player_id, "") if event.player_id else "",
+        "related_player_name": names.get(event.related_player_id, "") if event.related_player_id else "",
     }
 
 
-def _team_display(match: Match, side: Optional[str]) -> str:
-    if side == "home":
-        return match.home_team.name
-    if side == "away":
-        return match.away_team.name
-    return "Unknown team"
-
-
-def _zone_text(zone: Optional[str]) -> str:
-    if not zone:
-        return "midfield"
-    return ZONE_TEXT.get(zone.upper(), zone.lower())
-
-
-def _map_markov_event_to_match_event(match: Match, raw_event: dict) -> Optional[dict]:
-    label = (raw_event.get("label") or "").upper()
-    frm = (raw_event.get("from") or "").upper()
-    turnover = bool(raw_event.get("turnover"))
-    zone_label = _zone_text(raw_event.get("zone"))
-    
-    # If an individual player (actor) is part of the event, we use them
-    raw_actor_name = raw_event.get("actor_name")
-    raw_actor_id = raw_event.get("actor_id")
-    
-    # Fallback to team name if no player
-    team_actor = _team_display(match, raw_event.get("prev_possession") or raw_event.get("possession"))
-    actor_display = raw_actor_name if raw_actor_name else team_actor
-
-    result = {}
-    if raw_actor_id:
-        try:
-            result["player"] = Player.objects.get(pk=raw_actor_id)
-        except Player.DoesNotExist:
-            pass
-
-    if label == "SHOT:GOAL":
-        if raw_actor_name:
-            description = f"Goal! {raw_actor_name} scores for {team_actor} from {zone_label}!"
-        else:
-            description = f"Goal! {team_actor} score from {zone_label}."
-        result.update({"event_type": "goal", "description": description})
-        return result
-
-    if label in {"SHOT:MISS", "SHOT:BLOCK"}:
-        description = f"{actor_display} takes a shot from {zone_label} but misses the target."
-        result.update({"event_type": "shot_miss", "description": description})
-        return result
-
-    if frm == "FOUL":
-        description = f"Foul by {actor_display} in {zone_label}."
-        result.update({"event_type": "foul", "description": description})
-        return result
-        
-    if turnover:
-        winner_side = raw_event.get("possession")
-        winner_team = _team_display(match, winner_side)
-        description = f"Turnover! {winner_team} gain possession in {zone_label}."
-        result.update({"event_type": "interception", "description": description})
-        return result
-
-    # Generic open-play labels for observability (PASS/RETAIN/RECYCLE)
-    if label.startswith("PASS:") or label in {"RETAIN", "RECYCLE", "TURNOVER"}:
-        verb = "recycle possession" if label in {"RETAIN", "RECYCLE"} else "move the ball"
-        description = f"{actor_display} {verb} in {zone_label}."
-        result.update({"event_type": "info", "description": description})
-        return result
-    return None
-
-
 def _mark_match_error(match_id: int, reason: str) -> None:
     try:
         updated = Match.objects.filter(pk=match_id).update(
@@ -188,216 +96,11 @@ def simulate_active_matches(self):
                     logger.info(f"⏭️ Матч ID={match_locked.id} ждёт завершения текущей минуты, пропуск.")
                     continue
 
-                # --- Prepare Rosters for Runtime ---
-                # We need to transform the match lineup (dict of slot -> player info)
-                # into the format expected by markov_runtime:
-                # rosters = {
-                #   "home": {"GK": [...], "DEF": [...], "MID": [...], "FWD": [...]},
-                #   "away": {"GK": [...], ...}
-                # }
-
-                rosters_map = {"home": {}, "away": {}}
-                # Minimal stat set we pass to the runtime so ticks can use real attributes.
-                # Neutral defaults stay in engine; adding keys here is backward safe.
-                ROSTER_STAT_FIELDS = [
-                    # Core
-                    "overall_rating",
-                    "pace",
-                    "stamina",
-                    "morale",
-                    # Build-up and passing
-                    "passing",
-                    "vision",
-                    "dribbling",
-                    "work_rate",
-                    "flair",
-                    # Final third / finishing
-                    "finishing",
-                    "long_range",
-                    "accuracy",
-                    "heading",
-                    # Defense / press
-                    "tackling",
-                    "marking",
-                    "positioning",
-                    "strength",
-                    # Keeper
-                    "reflexes",
-                    "handling",
-                    "aerial",
-                    "command",
-                    "distribution",
-                    "one_on_one",
-                    "rebound_control",
-                    "shot_reading",
-                    # Crossing/width
-                    "crossing",
-                    # Optional/soft fields (may be None -> neutral defaults in engine)
-                    "ball_control",
-                    "balance",
-                    "aggression",
-                ]
-                # Fields that actually exist on Player and are needed to avoid extra DB hits.
-                _FETCH_FIELDS = [
-                    "id",
-                    "last_name",
-                    "position",
-                    "experience",
-                    "strength",
-                    "stamina",
-                    "pace",
-                    "positioning",
-                    "reflexes",
-                    "handling",
-                    "aerial",
-                    "command",
-                    "distribution",
-                    "one_on_one",
-                    "rebound_control",
-                    "shot_reading",
-                    "marking",
-                    "tackling",
-                    "work_rate",
-                    "passing",
-                    "crossing",
-                    "dribbling",
-                    "flair",
-                    "heading",
-                    "finishing",
-                    "long_range",
-                    "vision",
-                    "accuracy",
-                    "morale",
-                ]
-                
-                def _build_team_roster(team_side, lineup_data):
-                    # lineup_data: {'1': {'playerId': '101', ...}, ...} OR {'1': 101, ...}
-                    if not lineup_data: 
-                        return
-                    
-                    pids = []
-                    for slot, p_info in lineup_data.items():
-                        if isinstance(p_info, dict):
-                            pid = p_info.get('playerId')
-                        else:
-                            # Assume it's an ID directly (int or str) if not a dict
-                            pid = p_info
-                            
-                        if pid: 
-                            pids.append(pid)
-                    
-                    if not pids: 
-                        return
-
-                    # Bulk fetch players with optimized stats
-                    players_qs = Player.objects.only(*_FETCH_FIELDS).filter(id__in=pids)
-                    
-                    for p in players_qs:
-                        # Get line (GK, DEF, MID, FWD)
-                        line = get_player_line(p)
-                        
-                        # Build minimal stats dict for the engine
-                        stats = {"overall": p.overall_rating}
-                        for field in ROSTER_STAT_FIELDS:
-                            # Avoid reusing property name twice
-                            if field == "overall_rating":
-                                continue
-                            stats[field] = getattr(p, field, None)
-                        
-                        player_entry = {
-                            "id": p.id,
-                            "name": p.last_name,  # or full_name
-                            "stats": stats,
-                        }
-                        
-                        if line not in rosters_map[team_side]:
-                            rosters_map[team_side][line] = []
-                        rosters_map[team_side][line].append(player_entry)
-
-                _build_team_roster("home", match_locked.home_lineup)
-                _build_team_roster("away", match_locked.away_lineup)
-
-                seed_value = int(match_locked.markov_seed or match_locked.id)
-                result = simulate_markov_minute(
-                    seed=seed_value,
-                    token=match_locked.markov_token,
-                    home_name=match_locked.home_team.name,
-                    away_name=match_locked.away_team.name,
-                    rosters=rosters_map,
-                )
+                # --- Markov minute on the cached roster snapshot ---
+                rosters = get_match_rosters(match_locked)
+                result, created_events = play_markov_minute(match_locked, rosters=rosters)
                 minute_summary = result["minute_summary"]
-                counts = minute_summary.get("counts", {})
-                totals = minute_summary.get("score_total", {})
-
-                pass_events = 0
-
-                match_locked.markov_seed = seed_value
-                match_locked.markov_token = minute_summary.get("token")
-                match_locked.markov_coefficients = minute_summary.get("coefficients")
-                match_locked.markov_last_summary = minute_summary
-                match_locked.home_score = totals.get("home", match_locked.home_score)
-                match_locked.away_score = totals.get("away", match_locked.away_score)
-                match_locked.st_shoots += counts.get("shot", 0)
-                match_locked.st_fouls += counts.get("foul", 0)
-                match_locked.st_possessions += 1
-                match_locked.possession_indicator = _possession_indicator_from_markov(
-                    minute_summary.get("possession_end")
-                )
-                match_locked.current_zone = _map_zone_from_markov(
-                    minute_summary.get("zone_end"),
-                    match_locked.current_zone,
-                )
-                match_locked.last_minute_update = timezone.now()
-
-                reg_minutes = result.get("regulation_minutes", 90)
                 minute_number = minute_summary.get("minute", match_locked.current_minute)
-                match_locked.waiting_for_next_minute = True
-                if minute_number >= reg_minutes:
-                    match_locked.status = 'finished'
-                    match_locked.waiting_for_next_minute = False
-                    match_locked.current_minute = reg_minutes
-
-                match_locked.st_passes += pass_events
-                match_locked.save()
-
-                created_events = []
-
-                # 1. Global narrative (e.g. Kick-off)
-                for line in minute_summary.get("pure_narrative") or []:
-                    event = MatchEvent.objects.create(
-                        match=match_locked,
-                        minute=minute_number,
-                        event_type="info",
-                        description=line,
-                    )
-                    created_events.append(event)
-
-                # 2. Tick events (one per tick max)
-                for raw_event in minute_summary.get("events") or []:
-                    mapped = _map_markov_event_to_match_event(match_locked, raw_event)
-                    if mapped:
-                        event_kwargs = {
-                            "match": match_locked,
-                            "minute": minute_number,
-                            "event_type": mapped.get("event_type", "info"),
-                            "description": mapped.get("description", ""),
-                        }
-                        if mapped.get("player"):
-                           event_kwargs["player"] = mapped["player"]
-                        
-                        event = MatchEvent.objects.create(**event_kwargs)
-                        
-                        created_events.append(event)
-                        if mapped.get("stat") == "pass":
-                            pass_events += 1
-                    elif raw_event.get("narrative"):
-                        event = MatchEvent.objects.create(
-                            match=match_locked,
-                            minute=minute_number,
-                            event_type="info",
-                            description=raw_event["narrative"],
-                        )
-                        created_events.append(event)
 
                 processed += 1
                 possessing_team_id = None
@@ -407,6 +110,7 @@ def simulate_active_matches(self):
                     possessing_team_id = str(match_locked.away_team_id)
 
                 if channel_layer:
+                    names = roster_names(rosters)
                     message_payload = {
                         "type": "match_update",
                         "data": {
@@ -424,7 +128,7 @@ def simulate_active_matches(self):
                             "away_momentum": match_locked.away_momentum,
                             "current_zone": match_locked.current_zone,
                             "possessing_team_id": possessing_team_id,
-                            "events": [_serialize_event_for_ws(evt) for evt in created_events],
+                            "events": [_serialize_event_for_ws(evt, names) for evt in created_events],
                             "partial_update": True,
                             "markov_minute": minute_summary,
                         },
@@ -468,39 +172,16 @@ def check_season_end(self):
 
             is_end_date_passed = today > current_season.end_date
 
-            # ╨Я╤А╨╛╨▓╨╡╤А╤П╨╡╨╝, ╨▓╤Б╨╡ ╨╗╨╕ ╨╝╨░╤В╤З╨╕ ╤Б╨╡╨╖╨╛╨╜╨░ ╨╖╨░╨▓╨╡╤А╤И╨╡╨╜╤Л
-            all_matches_in_season = Match.objects.filter(
-                championshipmatch__championship__season=current_season
-            )
-            finished_matches_count = all_matches_in_season.filter(status='finished').count()
-            total_matches_count = all_matches_in_season.count() # ╨Ю╨▒╤Й╨╡╨╡ ╨║╨╛╨╗╨╕╤З╨╡╤Б╤В╨▓╨╛ ╨╝╨░╤В╤З╨╡╨╣ ╨▓ ╤Б╨╡╨╖╨╛╨╜╨╡
-
-            # ╨г╤Б╨╗╨╛╨▓╨╕╨╡ ╨╖╨░╨▓╨╡╤А╤И╨╡╨╜╨╕╤П: ╨┤╨░╤В╨░ ╨┐╤А╨╛╤И╨╗╨░ ╨Ш ╨▓╤Б╨╡ ╨╝╨░╤В╤З╨╕ ╤Б╤Л╨│╤А╨░╨╜╤Л (╨╕╨╗╨╕ ╨╜╨╡╤В ╨╝╨░╤В╤З╨╡╨╣)
-            all_matches_played = (total_matches_count == 0 or finished_matches_count == total_matches_count)
-
-            if is_end_date_passed and all_matches_played:
-                # ╨Э╨░ ╨▓╤Б╤П╨║╨╕╨╣ ╤Б╨╗╤Г╤З╨░╨╣ ╨╡╤Й╨╡ ╤А╨░╨╖ ╨┐╤А╨╛╨▓╨╡╤А╨╕╨╝ ╨╜╨╡╨╖╨░╨▓╨╡╤А╤И╨╡╨╜╨╜╤Л╨╡ ╨╝╨░╤В╤З╨╕ (╤Е╨╛╤В╤П all_matches_played ╨┤╨╛╨╗╨╢╨╜╨╛ ╨▒╤Л╨╗╨╛ ╤Н╤В╨╛ ╨┐╨╛╨║╤А╤Л╤В╤М)
-                unfinished_matches = Match.objects.filter(
-                    championshipmatch__championship__season=current_season,
-                    status__in=['scheduled', 'in_progress', 'paused'] # ╨Ф╨╛╨▒╨░╨▓╨╕╨╝ paused
-                ).count()
-
-                if unfinished_matches > 0:
-                    return f"Season {current_season.number} has {unfinished_matches} unfinished matches"
-
-                call_command('handle_season_transitions')
-
-                current_season.is_active = False
-                current_season.save()
-
-                call_command('create_new_season')
-
-                new_season = Season.objects.get(is_active=True)
-                championships = Championship.objects.filter(season=new_season)
-                total_teams = sum(c.teams.count() for c in championships)
+            # Progress counters are kept up to date as results are applied
+            # (see tournaments.progress), so this is a read of the season row
+            if is_end_date_passed and current_season.is_completed:
+                # Transitions, closing the season and the next season in one bulk pass
+                result = rollover_season(current_season)
                 return (
                     f"Season {current_season.number} ended. "
-                    f"New season {new_season.number} created."
+                    f"New season {result['season'].number} created "
+                    f"({result['clubs_moved']} clubs moved, {result['matches']} matches, "
+                    f"{result['timings']['total']:.1f}s)."
                 )
             else:
                  return f"Season {current_season.number} is still active"
@@ -541,14 +222,15 @@ def extract_player_ids_from_lineup(current_lineup):
 
 
 # --- ╨Ш╨б╨Я╨а╨Р╨Т╨Ы╨Х╨Э╨Э╨Р╨п ╨д╨г╨Э╨Ъ╨ж╨Ш╨п complete_lineup ---
-def complete_lineup(club: Club, current_lineup: dict):
+def complete_lineup(club: Club, current_lineup: dict, squad: Optional[Iterable[Player]] = None):
     """
     ╨Ф╨╛╨┐╨╛╨╗╨╜╤П╨╡╤В ╨┐╨╡╤А╨╡╨┤╨░╨╜╨╜╤Л╨╣ ╤Б╨╛╤Б╤В╨░╨▓ ╨┤╨╛ 11 ╨╕╨│╤А╨╛╨║╨╛╨▓, ╨╕╤Б╨┐╨╛╨╗╤М╨╖╤Г╤П ╤Б╤Г╤Й╨╡╤Б╤В╨▓╤Г╤О╤Й╨╕╤Е
     ╨╕ ╨┤╨╛╨▒╨░╨▓╨╗╤П╤П ╨╜╨╡╨┤╨╛╤Б╤В╨░╤О╤Й╨╕╤Е ╤Б╨╗╤Г╤З╨░╨╣╨╜╤Л╨╝ ╨╛╨▒╤А╨░╨╖╨╛╨╝ ╨▒╨╡╨╖ ╨┤╤Г╨▒╨╗╨╕╤А╨╛╨▓╨░╨╜╨╕╤П.
     ╨Т╨╛╨╖╨▓╤А╨░╤Й╨░╨╡╤В ╨┐╨╛╨╗╨╜╤Л╨╣ ╤Б╨╛╤Б╤В╨░╨▓ (╤Б╨╗╨╛╨▓╨░╤А╤М 0-10) ╨╕╨╗╨╕ None, ╨╡╤Б╨╗╨╕ ╨╜╨╡╨▓╨╛╨╖╨╝╨╛╨╢╨╜╨╛.
     ╨Ю╨╢╨╕╨┤╨░╨╡╤В current_lineup ╨▓ ╤Д╨╛╤А╨╝╨░╤В╨╡ {'0': {...}, '1': {...}, ...}.
     """
-    all_players_qs = club.player_set.all()
+    # squad: players of the club already loaded by the caller (see _load_squads)
+    all_players_qs = squad if squad is not None else club.player_set.all()
     all_players_map = {p.id: p for p in all_players_qs} # ╨б╨╗╨╛╨▓╨░╤А╤М ╨┤╨╗╤П ╨▒╤Л╤Б╤В╤А╨╛╨│╨╛ ╨┤╨╛╤Б╤В╤Г╨┐╨░ ╨┐╨╛ ID
     total_players_in_club = len(all_players_map)
 
@@ -662,6 +344,36 @@ def complete_lineup(club: Club, current_lineup: dict):
         return None # ╨Э╨╡ ╤Г╨┤╨░╨╗╨╛╤Б╤М ╤Б╨╛╨▒╤А╨░╤В╤М 11 ╨╕╨│╤А╨╛╨║╨╛╨▓ ╨╕╨╗╨╕ ╨║╨╗╤О╤З╨╕ ╨╜╨╡ 0-10
 
 
+def _is_full_lineup(lineup) -> bool:
+    return isinstance(lineup, dict) and len(lineup) >= 11 and all(str(i) in lineup for i in range(11))
+
+
+def _club_lineup_data(club: Club) -> dict:
+    data = club.lineup or {"lineup": {}, "tactic": "balanced"}
+    if not isinstance(data, dict) or 'lineup' not in data:
+        data = {"lineup": {}, "tactic": "balanced"}
+    return data
+
+
+def _load_squads(club_ids) -> dict:
+    """Players of all given clubs with one query: {club_id: [players]}."""
+    squads = {club_id: [] for club_id in club_ids}
+    if squads:
+        for player in Player.objects.filter(club_id__in=list(squads)):
+            squads[player.club_id].append(player)
+    return squads
+
+
+def _kickoff_lineup(club: Club, squads: dict):
+    """(lineup, tactic) for kickoff; the lineup is None when the club cannot field 11."""
+    data = _club_lineup_data(club)
+    lineup = data.get('lineup', {})
+    tactic = data.get('tactic', 'balanced')
+    if _is_full_lineup(lineup):
+        return lineup, tactic
+    return complete_lineup(club, lineup, squads.get(club.id, [])), tactic
+
+
 @shared_task(name='tournaments.start_scheduled_matches')
 def start_scheduled_matches(match_ids: Optional[Iterable[int]] = None):
     """
@@ -670,9 +382,26 @@ def start_scheduled_matches(match_ids: Optional[Iterable[int]] = None):
     """
     now = timezone.now()
 
-    matches_to_process = Match.objects.filter(status='scheduled', datetime__lte=now)
+    # Due matches come from the partial index on scheduled kickoffs, with
+    # both clubs in the same query; the squads of every club whose saved
+    # lineup needs completing are loaded with one more query
+    matches_to_process = (
+        Match.objects.filter(status='scheduled', datetime__lte=now)
+        .select_related('home_team', 'away_team')
+        .order_by('datetime', 'id')
+    )
     if match_ids:
         matches_to_process = matches_to_process.filter(id__in=match_ids)
+    matches_to_process = list(matches_to_process)
+
+    clubs = {}
+    for match in matches_to_process:
+        clubs[match.home_team_id] = match.home_team
+        clubs[match.away_team_id] = match.away_team
+    squads = _load_squads(
+        club_id for club_id, club in clubs.items()
+        if not _is_full_lineup(_club_lineup_data(club).get('lineup'))
+    )
 
     started_count = 0
     skipped_count = 0
@@ -685,59 +414,28 @@ def start_scheduled_matches(match_ids: Optional[Iterable[int]] = None):
                     skipped_count += 1
                     continue
 
-                final_home_lineup = None
-                final_away_lineup = None
-                home_tactic = 'balanced'
-                away_tactic = 'balanced'
-
-                home_data_from_club = match_locked.home_team.lineup or {"lineup": {}, "tactic": "balanced"}
-                if not isinstance(home_data_from_club, dict) or 'lineup' not in home_data_from_club:
-                    home_data_from_club = {"lineup": {}, "tactic": "balanced"}
-
-                home_lineup_from_club = home_data_from_club.get('lineup', {})
-                home_tactic = home_data_from_club.get('tactic', 'balanced')
-
-                if isinstance(home_lineup_from_club, dict) and len(home_lineup_from_club) >= 11 and all(str(i) in home_lineup_from_club for i in range(11)):
-                    final_home_lineup = home_lineup_from_club
-                else:
-                    completed_home = complete_lineup(match_locked.home_team, home_lineup_from_club)
-                    if completed_home is None:
-                        skipped_count += 1
-                        continue
-                    final_home_lineup = completed_home
-
-                away_data_from_club = match_locked.away_team.lineup or {"lineup": {}, "tactic": "balanced"}
-                if not isinstance(away_data_from_club, dict) or 'lineup' not in away_data_from_club:
-                    away_data_from_club = {"lineup": {}, "tactic": "balanced"}
-
-                away_lineup_from_club = away_data_from_club.get('lineup', {})
-                away_tactic = away_data_from_club.get('tactic', 'balanced')
-
-                if isinstance(away_lineup_from_club, dict) and len(away_lineup_from_club) >= 11 and all(str(i) in away_lineup_from_club for i in range(11)):
-                    final_away_lineup = away_lineup_from_club
-                else:
-                    completed_away = complete_lineup(match_locked.away_team, away_lineup_from_club)
-                    if completed_away is None:
-                        skipped_count += 1
-                        continue
-                    final_away_lineup = completed_away
-
-                if final_home_lineup and final_away_lineup:
-                    match_locked.home_lineup = final_home_lineup
-                    match_locked.home_tactic = home_tactic
-                    match_locked.away_lineup = final_away_lineup
-                    match_locked.away_tactic = away_tactic
-                    match_locked.status = 'in_progress'
-                    now_ts = timezone.now()
-                    match_locked.started_at = now_ts
-                    match_locked.last_minute_update = now_ts
-                    match_locked.waiting_for_next_minute = False
-                    match_locked.save()
-                    started_count += 1
-                else:
+                final_home_lineup, home_tactic = _kickoff_lineup(clubs[match_locked.home_team_id], squads)
+                if final_home_lineup is None:
                     skipped_count += 1
                     continue
 
+                final_away_lineup, away_tactic = _kickoff_lineup(clubs[match_locked.away_team_id], squads)
+                if final_away_lineup is None:
+                    skipped_count += 1
+                    continue
+
+                match_locked.home_lineup = final_home_lineup
+                match_locked.home_tactic = home_tactic
+                match_locked.away_lineup = final_away_lineup
+                match_locked.away_tactic = away_tactic
+                match_locked.status = 'in_progress'
+                now_ts = timezone.now()
+                match_locked.started_at = now_ts
+                match_locked.last_minute_update = now_ts
+                match_locked.waiting_for_next_minute = False
+                match_locked.save()
+                started_count += 1
+
         except Match.DoesNotExist:
             skipped_count += 1
         except OperationalError:
@@ -4,6 +4,10 @@ from django.utils import timezone
 from django.db import models, transaction
 import calendar
 
+import numpy as np
+
+from .round_robin import schedule_errors, schedule_matches
+
 def check_consecutive_matches(schedule: List[Tuple], team, is_home: bool) -> int:
     """
     Проверяет количество последовательных домашних или гостевых матчей для команды.
@@ -49,151 +53,157 @@ def validate_schedule_balance(schedule: List[Tuple], teams: List) -> Dict:
 
     return balance
 
-def generate_league_schedule(championship) -> List[Tuple]:
+def generate_league_schedule(championship, teams=None) -> List[Tuple]:
     """
-    Генерирует сбалансированное расписание матчей по принципу кругового турнира.
+    Генерирует сбалансированное расписание двойного кругового турнира для
+    любого числа команд (при нечётном числе команда по очереди пропускает
+    тур). Возвращает кортежи (тур, номер матча в туре, хозяева, гости).
+    Команды можно передать заранее загруженными (teams), иначе они
+    читаются из чемпионата.
     """
-    from .models import Championship  # Импорт внутри функции
-    
-    teams = list(championship.teams.all())
-    if len(teams) != 16:
-        raise ValueError(f"Требуется ровно 16 команд, сейчас: {len(teams)}")
-    
-    n = len(teams)
-    rounds = n - 1
+    teams = list(championship.teams.all()) if teams is None else list(teams)
+    if len(teams) < 2:
+        raise ValueError(f"Требуется минимум 2 команды, сейчас: {len(teams)}")
+
     schedule = []
-    
-    # Создаем массив с номерами команд
-    team_numbers = list(range(n))
-    
-    # Генерируем матрицу встреч
-    matches = []
-    for round_num in range(rounds):
-        round_matches = []
-        for i in range(n // 2):
-            home = team_numbers[i]
-            away = team_numbers[n - i - 1]
-            # Чередуем домашние и выездные матчи
-            if (i + round_num) % 2 == 0:
-                round_matches.append((home, away))
-            else:
-                round_matches.append((away, home))
-        matches.append(round_matches)
-        # Ротация команд
-        team_numbers = [team_numbers[0]] + team_numbers[-1:] + team_numbers[1:-1]
-    
-    # Создаем расписание для первого и второго кругов
-    for half in range(2):
-        for round_num in range(rounds):
-            actual_round = round_num + 1 + half * rounds
-            round_matches = matches[round_num]
-            for match_num, (home_idx, away_idx) in enumerate(round_matches):
-                if half == 1:
-                    # Во втором круге меняем хозяев и гостей
-                    home_idx, away_idx = away_idx, home_idx
-                home_team = teams[home_idx]
-                away_team = teams[away_idx]
-                schedule.append((actual_round, match_num + 1, home_team, away_team))
-    
+    match_num = 0
+    previous_round = None
+    for round_num, home_idx, away_idx in schedule_matches(len(teams)).tolist():
+        match_num = match_num + 1 if round_num == previous_round else 1
+        previous_round = round_num
+        schedule.append((round_num, match_num, teams[home_idx], teams[away_idx]))
     return schedule
 
-def create_championship_matches(championship) -> None:
+SCHEDULE_BATCH_SIZE = 1000
+
+
+def add_championship_teams(championship, teams) -> int:
     """
-    Создает матчи чемпионата на основе сгенерированного расписания.
+    Добавляет команды в чемпионат одной вставкой в промежуточную таблицу
+    (вместо championship.teams.add по одной команде). Уже добавленные
+    команды пропускаются. Возвращает число переданных команд.
+    """
+    from .models import ChampionshipTeam  # Импорт внутри функции
+    from .standings import invalidate_standings  # Импорт внутри функции
+    from .versions import bump_championships  # Импорт внутри функции
+
+    rows = [ChampionshipTeam(championship=championship, team=team) for team in teams]
+    ChampionshipTeam.objects.bulk_create(rows, batch_size=SCHEDULE_BATCH_SIZE, ignore_conflicts=True)
+    # bulk_create не посылает сигналы, кэш таблицы и версию ответов API сбрасываем сами
+    invalidate_standings(championship.id)
+    bump_championships([championship.id])
+    return len(rows)
+
+
+def _round_match_time(championship):
+    match_time = championship.match_time
+    if championship.league.level == 2:
+        match_time = (
+            datetime.combine(datetime.min, match_time) -
+            timedelta(hours=2)
+        ).time()
+    return match_time
+
+
+def _schedule_fixtures(championship, teams=None) -> List[Tuple]:
+    """
+    Несохранённые пары (Match, ChampionshipMatch) по расписанию чемпионата:
+    один тур в день начиная с championship.start_date.
     """
     from .models import ChampionshipMatch  # Импорт внутри функции
     from matches.models import Match  # Импорт внутри функции
-    
+
+    match_time = _round_match_time(championship)
+    fixtures = []
+    for round_num, day, home_team, away_team in generate_league_schedule(championship, teams):
+        match_date = championship.start_date + timedelta(days=round_num - 1)
+        match = Match(
+            home_team=home_team,
+            away_team=away_team,
+            datetime=timezone.make_aware(datetime.combine(match_date, match_time)),
+            status='scheduled'
+        )
+        fixtures.append((match, ChampionshipMatch(
+            championship=championship,
+            round=round_num,
+            match_day=match_date.day
+        )))
+    return fixtures
+
+
+def create_season_matches(championships, teams_by_championship=None) -> int:
+    """
+    Создает матчи для нескольких чемпионатов (например, всех лиг сезона)
+    пакетными вставками: сначала все Match, затем все ChampionshipMatch.
+    Прежние матчи этих чемпионатов удаляются, счётчики прогресса их сезонов
+    пересчитываются. teams_by_championship ({id чемпионата: [команды]})
+    избавляет от запроса команд на чемпионат. Возвращает число матчей.
+    """
+    from .models import ChampionshipMatch  # Импорт внутри функции
+    from .progress import reconcile_progress  # Импорт внутри функции
+    from .versions import bump_championships  # Импорт внутри функции
+    from matches.models import Match  # Импорт внутри функции
+
+    championships = list(championships)
     with transaction.atomic():
-        ChampionshipMatch.objects.filter(championship=championship).delete()
-
-        schedule = generate_league_schedule(championship)
-        matches_by_round = {}
-        
-        # Группируем матчи по турам
-        for round_num, day, home_team, away_team in schedule:
-            if round_num not in matches_by_round:
-                matches_by_round[round_num] = []
-            matches_by_round[round_num].append((day, home_team, away_team))
-            
-        current_date = championship.start_date
-
-        # Создаем матчи
-        for round_num in sorted(matches_by_round.keys()):
-            match_time = championship.match_time
-            if championship.league.level == 2:
-                match_time = (
-                    datetime.combine(datetime.min, match_time) - 
-                    timedelta(hours=2)
-                ).time()
-
-            match_datetime = timezone.make_aware(
-                datetime.combine(current_date, match_time)
-            )
-
-            for day, home_team, away_team in matches_by_round[round_num]:
-                match = Match.objects.create(
-                    home_team=home_team,
-                    away_team=away_team,
-                    datetime=match_datetime,
-                    status='scheduled'
-                )
-
-                ChampionshipMatch.objects.create(
-                    championship=championship,
-                    match=match,
-                    round=round_num,
-                    match_day=current_date.day
-                )
-
-            current_date += timedelta(days=1)
+        Match.objects.filter(championshipmatch__championship__in=championships).delete()
+        ChampionshipMatch.objects.filter(championship__in=championships).delete()
+
+        fixtures = []
+        for championship in championships:
+            teams = (teams_by_championship or {}).get(championship.id)
+            fixtures.extend(_schedule_fixtures(championship, teams))
+
+        # На PostgreSQL bulk_create возвращает id, их и берут ChampionshipMatch
+        Match.objects.bulk_create([match for match, _ in fixtures], batch_size=SCHEDULE_BATCH_SIZE)
+        for match, championship_match in fixtures:
+            championship_match.match = match
+        ChampionshipMatch.objects.bulk_create(
+            [championship_match for _, championship_match in fixtures],
+            batch_size=SCHEDULE_BATCH_SIZE
+        )
+        reconcile_progress({championship.season_id for championship in championships}, fix=True)
+        bump_championships(championship.id for championship in championships)
+    return len(fixtures)
 
-def validate_championship_schedule(championship) -> bool:
+
+def create_championship_matches(championship) -> None:
     """
-    Проверяет корректность расписания чемпионата.
+    Создает матчи чемпионата на основе сгенерированного расписания.
     """
-    from .models import Championship  # Импорт внутри функции
-    
-    matches = championship.championshipmatch_set.select_related('match')
-    teams = list(championship.teams.all())
+    create_season_matches([championship])
 
-    # Проверка количества матчей
-    expected_matches = len(teams) * (len(teams) - 1)
-    if matches.count() != expected_matches:
+def validate_championship_schedule(championship) -> bool:
+    """
+    Проверяет корректность расписания чемпионата одним запросом: число
+    матчей, пары соперников, баланс домашних и гостевых игр и серии
+    (см. tournaments.round_robin.schedule_errors).
+    """
+    from .models import ChampionshipTeam  # Импорт внутри функции
+
+    members = ChampionshipTeam.objects.filter(championship=models.OuterRef('championship'))
+    rows = list(
+        championship.championshipmatch_set
+        .order_by()
+        .annotate(
+            team_count=models.Subquery(
+                members.values('championship').annotate(total=models.Count('id')).values('total')
+            ),
+            home_member=models.Exists(members.filter(team=models.OuterRef('match__home_team'))),
+            away_member=models.Exists(members.filter(team=models.OuterRef('match__away_team'))),
+        )
+        .values_list('round', 'match__home_team_id', 'match__away_team_id',
+                     'team_count', 'home_member', 'away_member')
+    )
+    if not rows:
         return False
 
-    # Проверка баланса матчей
-    team_matches = {team: {'home': 0, 'away': 0} for team in teams}
-    for match in matches:
-        team_matches[match.match.home_team]['home'] += 1
-        team_matches[match.match.away_team]['away'] += 1
-
-    for team, stats in team_matches.items():
-        if stats['home'] != (len(teams) - 1) or stats['away'] != (len(teams) - 1):
-            return False
-
-    # Проверка последовательности матчей
-    for team in teams:
-        team_schedule = list(matches.filter(
-            models.Q(match__home_team=team) | models.Q(match__away_team=team)
-        ).order_by('round'))
-
-        home_streak = 0
-        away_streak = 0
-        max_home_streak = 0
-        max_away_streak = 0
-
-        for match in team_schedule:
-            if match.match.home_team == team:
-                home_streak += 1
-                away_streak = 0
-                max_home_streak = max(max_home_streak, home_streak)
-            else:
-                away_streak += 1
-                home_streak = 0
-                max_away_streak = max(max_away_streak, away_streak)
-
-        if max_home_streak > 2 or max_away_streak > 2:
-            return False
-
-    return True
\ No newline at end of file
+    team_count = rows[0][3]
+    if not all(row[4] and row[5] for row in rows):
+        return False
+    data = np.array([row[:3] for row in rows], dtype=np.int64)
+    team_ids = np.unique(data[:, 1:])
+    if len(team_ids) != team_count:
+        return False
+    matches = np.column_stack([data[:, 0], np.searchsorted(team_ids, data[:, 1:])])
+    return not schedule_errors(matches, team_count)
@@ -0,0 +1,127 @@
+"""
+Version stamps for the tournament read APIs.
+
+Each resource has an integer stamp in the cache:
+
+* ``seasons``, ``leagues``, ``championships`` -- the lists, bumped when a
+  row is saved or deleted, on season rollover and on bulk status changes;
+* ``championship:<id>`` -- one championship's table and fixtures, bumped
+  when a result is applied, a match of it is saved or its fixtures are
+  regenerated.
+
+``versioned_json`` builds the ETag of a response from the stamps of the
+resources it depends on.  A request whose ``If-None-Match`` matches gets
+a 304; otherwise the serialised body is served from the cache under a key
+that includes the stamps, so a bump makes every older body unreachable
+and nothing needs to be deleted.  Serving either costs two cache reads
+and no queries.
+
+A missing stamp (cache flush, eviction) starts again from the current
+time in milliseconds, so a restarted stamp never repeats an old ETag.
+"""
+import hashlib
+import time
+from functools import wraps
+from typing import Callable, Iterable, List
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+
+VERSION_CACHE_TIMEOUT = None  # stamps do not expire
+RESPONSE_CACHE_TIMEOUT = 10 * 60
+
+
+def version_cache_key(resource: str) -> str:
+    return f"api_version:{resource}"
+
+
+def championship_resource(championship_id: int) -> str:
+    return f"championship:{championship_id}"
+
+
+def _initial_stamp() -> int:
+    return int(time.time() * 1000)
+
+
+def get_versions(resources: Iterable[str]) -> List[int]:
+    """Current stamps of ``resources`` (missing ones are started) with one cache read."""
+    keys = [version_cache_key(resource) for resource in resources]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        if key not in found:
+            # add() keeps a stamp another process has just started
+            cache.add(key, _initial_stamp(), VERSION_CACHE_TIMEOUT)
+            found[key] = cache.get(key)
+        versions.append(found[key])
+    return versions
+
+
+def _bump(keys: List[str]) -> None:
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_stamp(), VERSION_CACHE_TIMEOUT)
+
+
+def bump_versions(*resources: str) -> None:
+    """Bumps the stamps of ``resources`` once the current transaction commits."""
+    keys = [version_cache_key(resource) for resource in resources]
+    if keys:
+        transaction.on_commit(lambda: _bump(keys))
+
+
+def bump_championships(championship_ids: Iterable[int]) -> None:
+    bump_versions(*(championship_resource(championship_id) for championship_id in set(championship_ids)))
+
+
+def _etag(name: str, versions: List[int]) -> str:
+    return '"{}-{}"'.format(name, "-".join(str(version) for version in versions))
+
+
+def _if_none_match(request) -> List[str]:
+    header = request.headers.get("If-None-Match", "")
+    # Weak validators (W/"...") match too: the body is the same JSON
+    return [tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()]
+
+
+def _response_cache_key(name: str, etag: str, request) -> str:
+    query = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+    return f"api_response:{name}:{etag}:{query}"
+
+
+def versioned_json(resources: Callable[..., Iterable[str]]):
+    """
+    Conditional GET and a cached body for a JSON view whose payload depends
+    only on ``resources(request, **view_kwargs)`` and the query string.
+    Only 200 responses are cached.
+    """
+    def decorator(view):
+        name = view.__name__
+
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            etag = _etag(name, get_versions(resources(request, **kwargs)))
+            if etag in _if_none_match(request):
+                response = HttpResponseNotModified()
+            else:
+                key = _response_cache_key(name, etag, request)
+                body = cache.get(key)
+                if body is not None:
+                    response = HttpResponse(body, content_type="application/json")
+                else:
+                    response = view(request, *args, **kwargs)
+                    if response.status_code != 200:
+                        return response
+                    cache.set(key, response.content, RESPONSE_CACHE_TIMEOUT)
+            response["ETag"] = etag
+            # Clients keep the body but revalidate it on every request
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapped
+
+    return decorator
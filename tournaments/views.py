@@ -13,6 +13,7 @@ from django.db import models
 from django.db.models import Count
 from django_countries import countries
 from .models import Championship, Season, League
+from .standings import get_standings
 
 class ChampionshipListView(LoginRequiredMixin, ListView):
     model = Championship
@@ -102,15 +103,7 @@ class ChampionshipDetailView(LoginRequiredMixin, DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        standings_qs = (
-            self.object.championshipteam_set
-            .select_related('team')
-            .annotate(goals_diff=models.F('goals_for') - models.F('goals_against'))
-            .order_by('-points', '-goals_diff', '-goals_for')
-        )
-        standings = list(standings_qs)
-        for idx, row in enumerate(standings, start=1):
-            row.table_position = idx
+        standings = get_standings(self.object.id)
         context['standings'] = standings
         context['has_standings'] = bool(standings)
 
@@ -198,12 +191,7 @@ class MyChampionshipView(LoginRequiredMixin, DetailView):
         user_club = self.request.user.club
 
         # Get standings
-        context['standings'] = championship.championshipteam_set.select_related(
-            'team'
-        ).order_by(
-            '-points', 
-            '-goals_for'
-        )
+        context['standings'] = get_standings(championship.id)
 
         # Get team matches for display
         context['team_matches'] = championship.championshipmatch_set.filter(
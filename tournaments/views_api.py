@@ -4,7 +4,7 @@ from datetime import datetime, timedelta
 from functools import wraps
 from typing import Iterable
 
-from django.db.models import F, Prefetch
+from django.db.models import Prefetch
 from django.http import Http404, JsonResponse
 from django.utils import timezone
 from django.views.decorators.http import require_GET
@@ -16,6 +16,8 @@ from .models import (
     League,
     Season,
 )
+from .standings import get_standings
+from .versions import championship_resource, versioned_json
 
 
 def _login_required_json(view):
@@ -75,23 +77,20 @@ def _team_to_dict(team: ChampionshipTeam) -> dict:
     }
 
 
-def _standing_to_dict(team: ChampionshipTeam, position: int, total: int) -> dict:
-    relegation_cutoff = max(total - 1, 1)
-    promotion_cutoff = min(2, total)
-    goal_diff = team.goals_for - team.goals_against
+def _standing_to_dict(team: ChampionshipTeam) -> dict:
     return {
         "team": _team_to_dict(team),
-        "position": position,
+        "position": team.table_position,
         "matches_played": team.matches_played,
         "wins": team.wins,
         "draws": team.draws,
         "losses": team.losses,
         "goals_for": team.goals_for,
         "goals_against": team.goals_against,
-        "goal_diff": goal_diff,
+        "goal_diff": team.goals_diff,
         "points": team.points,
-        "is_relegation_zone": position >= relegation_cutoff,
-        "is_promotion_zone": position <= promotion_cutoff,
+        "is_relegation_zone": team.relegation_zone,
+        "is_promotion_zone": team.promotion_zone,
     }
 
 
@@ -145,6 +144,7 @@ def _championship_with_related() -> Iterable[Championship]:
 
 @require_GET
 @_login_required_json
+@versioned_json(lambda request: ["seasons"])
 def season_list(request):
     seasons = Season.objects.all().order_by("-start_date")
     return JsonResponse([_season_to_dict(season) for season in seasons], safe=False)
@@ -152,6 +152,7 @@ def season_list(request):
 
 @require_GET
 @_login_required_json
+@versioned_json(lambda request: ["leagues"])
 def league_list(request):
     qs = League.objects.all().order_by("country", "level")
     if country := request.GET.get("country"):
@@ -161,6 +162,7 @@ def league_list(request):
 
 @require_GET
 @_login_required_json
+@versioned_json(lambda request: ["championships", "seasons", "leagues"])
 def championship_list(request):
     qs = _championship_with_related().order_by("league__level", "league__name")
 
@@ -178,33 +180,14 @@ def championship_list(request):
 
 @require_GET
 @_login_required_json
+@versioned_json(lambda request, pk: ["championships", "seasons", "leagues", championship_resource(pk)])
 def championship_detail(request, pk: int):
     try:
-        championship = (
-            _championship_with_related()
-            .prefetch_related(
-                Prefetch(
-                    "championshipteam_set",
-                    queryset=ChampionshipTeam.objects.select_related("team").annotate(
-                        goal_diff=F("goals_for") - F("goals_against")
-                    ),
-                )
-            )
-            .get(pk=pk)
-        )
+        championship = _championship_with_related().get(pk=pk)
     except Championship.DoesNotExist as exc:
         raise Http404("Championship not found") from exc
 
-    standings_qs = sorted(
-        championship.championshipteam_set.all(),
-        key=lambda team: (team.points, team.goals_for - team.goals_against, team.goals_for),
-        reverse=True,
-    )
-    total = len(standings_qs)
-    standings = [
-        _standing_to_dict(team, index + 1, total)
-        for index, team in enumerate(standings_qs)
-    ]
+    standings = [_standing_to_dict(team) for team in get_standings(championship.id)]
 
     payload = {
         "championship": _championship_to_summary(championship),
@@ -215,6 +198,7 @@ def championship_detail(request, pk: int):
 
 @require_GET
 @_login_required_json
+@versioned_json(lambda request, pk: ["championships", championship_resource(pk)])
 def championship_matches(request, pk: int):
     try:
         championship = _championship_with_related().get(pk=pk)
@@ -247,12 +231,6 @@ def my_championship(request):
         championship = (
             _championship_with_related()
             .prefetch_related(
-                Prefetch(
-                    "championshipteam_set",
-                    queryset=ChampionshipTeam.objects.select_related("team").annotate(
-                        goal_diff=F("goals_for") - F("goals_against")
-                    ),
-                ),
                 Prefetch(
                     "championshipmatch_set",
                     queryset=ChampionshipMatch.objects.select_related(
@@ -267,16 +245,7 @@ def my_championship(request):
     except Championship.DoesNotExist as exc:
         raise Http404("Championship not found for your club") from exc
 
-    standings_qs = sorted(
-        championship.championshipteam_set.all(),
-        key=lambda team: (team.points, team.goals_for - team.goals_against, team.goals_for),
-        reverse=True,
-    )
-    total = len(standings_qs)
-    standings = [
-        _standing_to_dict(team, index + 1, total)
-        for index, team in enumerate(standings_qs)
-    ]
+    standings = [_standing_to_dict(team) for team in get_standings(championship.id)]
 
     club_row = next((row for row in standings if row["team"]["id"] == club.id), None)
     club_position = club_row["position"] if club_row else None
@@ -0,0 +1,250 @@
+"""
+World bootstrap.
+
+Builds a whole football world -- leagues, bot clubs, squads, the season,
+its championships and fixtures -- from a plan held in memory:
+
+1. ``plan_world`` decides every league and club up front: two (or more)
+   divisions of ``LEAGUE_TEAMS`` clubs per country and unique club names
+   drawn against one read of the existing names (no ``exists()`` per
+   candidate);
+2. ``build_world`` writes the plan in dependency order with bulk inserts:
+   leagues, clubs in batches of ``CLUB_BATCH_SIZE`` (no per-club
+   ``save()``/``full_clean()``, the plan only holds valid bot clubs),
+   squads through ``players.generation.bulk_create_players`` (vectorised
+   stats, one preloaded name index for the whole run), then
+   ``season_rollover.start_season`` for the season, championships and
+   fixtures.
+
+Each batch commits on its own, so progress is visible while a large world
+is written and a failure leaves the batches written so far.  ``progress``
+is called after every batch and ``build_world`` returns rows and seconds
+per stage.
+"""
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from django.db import transaction
+from django_countries import countries as all_countries
+from faker import Faker
+
+from clubs.models import Club
+from players.generation import PlayerSpec, bulk_create_players
+from players.names import NameIndex
+
+from .models import League, Season
+from .season_rollover import LEAGUE_TEAMS, SEASON_DAYS, start_season
+
+CLUB_BATCH_SIZE = 2000
+# Clubs whose squads are generated and inserted per batch
+SQUAD_CLUB_BATCH_SIZE = 500
+MAX_NAME_ATTEMPTS = 100
+
+TOP_LEAGUES = [
+    ('GB', 'Premier League', 'Championship'),
+    ('ES', 'La Liga', 'La Liga 2'),
+    ('IT', 'Serie A', 'Serie B'),
+    ('DE', 'Bundesliga', '2. Bundesliga'),
+    ('FR', 'Ligue 1', 'Ligue 2'),
+    ('PT', 'Primeira Liga', 'Liga Portugal 2'),
+    ('GR', 'Super League', 'Super League 2'),
+    ('RU', 'Premier League', 'First League'),
+    ('AR', 'Primera División', 'Primera Nacional'),
+    ('BR', 'Série A', 'Série B'),
+]
+
+# (position, players, player classes in turn)
+SQUAD_TEMPLATE = (
+    ('Goalkeeper', 3, (1, 2, 3)),
+    ('Right Back', 2, (2, 3)),
+    ('Center Back', 4, (1, 2, 3, 4)),
+    ('Left Back', 2, (2, 3)),
+    ('Defensive Midfielder', 2, (2, 3)),
+    ('Central Midfielder', 3, (1, 2, 3)),
+    ('Attacking Midfielder', 2, (2, 3)),
+    ('Right Midfielder', 2, (2, 3)),
+    ('Left Midfielder', 2, (2, 3)),
+    ('Center Forward', 3, (1, 2, 3)),
+)
+
+TEAM_NAMES = (
+    'United', 'City', 'Athletic', 'Rovers', 'Wanderers',
+    'Rangers', 'Dynamo', 'Sporting', 'Real', 'Inter',
+    'Academy', 'Warriors', 'Legion', 'Phoenix', 'Union',
+)
+TEAM_SUFFIXES = ('FC', 'CF', 'SC', 'AF')
+
+
+class WorldBootstrapError(Exception):
+    """The world cannot be built on top of the current data."""
+
+
+@dataclass
+class WorldPlan:
+    leagues: List[League]
+    clubs: List[Club]
+    squad: List[tuple] = field(default_factory=list)
+
+    @property
+    def players_total(self) -> int:
+        return len(self.clubs) * len(self.squad)
+
+
+def squad_slots() -> List[tuple]:
+    """(position, player_class) of every player of a generated squad."""
+    return [
+        (position, classes[idx % len(classes)])
+        for position, count, classes in SQUAD_TEMPLATE
+        for idx in range(count)
+    ]
+
+
+def world_countries(count: Optional[int] = None) -> List[str]:
+    """The ``TOP_LEAGUES`` countries first, then the others by code."""
+    codes = [code for code, _, _ in TOP_LEAGUES]
+    if count is None:
+        return codes
+    top = set(codes)
+    codes += [code for code, _ in all_countries if code not in top]
+    if count > len(codes):
+        raise WorldBootstrapError(f"Only {len(codes)} countries are available")
+    return codes[:count]
+
+
+def league_name(country: str, level: int) -> str:
+    for code, div1, div2 in TOP_LEAGUES:
+        if code == country and level <= 2:
+            return f"{country} {div1 if level == 1 else div2}"
+    return f"{country} Division {level}"
+
+
+class ClubNameGenerator:
+    """Unique club names against the names already taken (read once)."""
+
+    def __init__(self, taken: Sequence[str] = (), seed=None):
+        self.taken = set(taken)
+        self.random = random.Random(seed)
+        self.fake = Faker(['en_GB'])
+        if seed is not None:
+            self.fake.seed_instance(seed)
+
+    def next(self) -> str:
+        for _ in range(MAX_NAME_ATTEMPTS):
+            city = self.fake.city()
+            name = self.random.choice([
+                f"{city} {self.random.choice(TEAM_NAMES)}",
+                f"{self.random.choice(TEAM_NAMES)} {city}",
+                f"{city} {self.random.choice(TEAM_SUFFIXES)}",
+            ])
+            if name not in self.taken:
+                self.taken.add(name)
+                return name
+        # Huge worlds run out of city combinations: number the last draw
+        number = 2
+        while f"{name} {number}" in self.taken:
+            number += 1
+        name = f"{name} {number}"
+        self.taken.add(name)
+        return name
+
+
+def plan_world(countries: Sequence[str], divisions: int = 2, seed=None) -> WorldPlan:
+    """
+    Plans ``divisions`` leagues of ``LEAGUE_TEAMS`` bot clubs for each
+    country.  Raises ``WorldBootstrapError`` if one of the leagues or an
+    active season already exists.
+    """
+    if divisions < 1:
+        raise WorldBootstrapError("A world needs at least one division")
+    existing = League.objects.filter(country__in=countries, level__lte=divisions)
+    if existing.exists():
+        raise WorldBootstrapError(f"Leagues already exist: {', '.join(map(str, existing[:5]))}")
+    if Season.objects.filter(is_active=True).exists():
+        raise WorldBootstrapError("An active season already exists")
+
+    names = ClubNameGenerator(Club.objects.values_list('name', flat=True), seed=seed)
+    leagues, clubs = [], []
+    for country in countries:
+        for level in range(1, divisions + 1):
+            league = League(
+                name=league_name(country, level),
+                country=country,
+                level=level,
+                max_teams=LEAGUE_TEAMS,
+                foreign_players_limit=5,
+            )
+            leagues.append(league)
+            clubs.extend(
+                Club(name=names.next(), country=country, league=league, is_bot=True)
+                for _ in range(LEAGUE_TEAMS)
+            )
+    return WorldPlan(leagues=leagues, clubs=clubs, squad=squad_slots())
+
+
+def _squad_specs(clubs: Sequence[Club], squad: Sequence[tuple]) -> List[PlayerSpec]:
+    # Generated players of classes 1-4 start at 17, as in the starter squads
+    return [
+        PlayerSpec(club=club, position=position, player_class=player_class, age=17)
+        for club in clubs
+        for position, player_class in squad
+    ]
+
+
+def build_world(
+    plan: WorldPlan,
+    seed=None,
+    start_date=None,
+    days: int = SEASON_DAYS,
+    progress: Optional[Callable[[str, int, int], None]] = None,
+) -> Dict[str, dict]:
+    """
+    Writes ``plan``: leagues, clubs, squads, then the season with its
+    championships and fixtures.  ``progress(stage, done, total)`` is called
+    after each batch.  Returns ``{stage: {'rows', 'seconds'}}``.
+    """
+    stats = {}
+
+    def report(stage, done, total):
+        if progress:
+            progress(stage, done, total)
+
+    started = time.monotonic()
+    with transaction.atomic():
+        League.objects.bulk_create(plan.leagues)
+    stats['leagues'] = {'rows': len(plan.leagues), 'seconds': time.monotonic() - started}
+    report('leagues', len(plan.leagues), len(plan.leagues))
+
+    started = time.monotonic()
+    for start in range(0, len(plan.clubs), CLUB_BATCH_SIZE):
+        with transaction.atomic():
+            Club.objects.bulk_create(plan.clubs[start:start + CLUB_BATCH_SIZE])
+        report('clubs', min(start + CLUB_BATCH_SIZE, len(plan.clubs)), len(plan.clubs))
+    stats['clubs'] = {'rows': len(plan.clubs), 'seconds': time.monotonic() - started}
+
+    started = time.monotonic()
+    # One snapshot of the taken names for every batch; each batch reserves
+    # the names it draws in it
+    name_index = NameIndex.load()
+    players = 0
+    for batch_no, start in enumerate(range(0, len(plan.clubs), SQUAD_CLUB_BATCH_SIZE)):
+        specs = _squad_specs(plan.clubs[start:start + SQUAD_CLUB_BATCH_SIZE], plan.squad)
+        batch_seed = None if seed is None else seed + batch_no
+        with transaction.atomic():
+            created = bulk_create_players(specs, seed=batch_seed, name_index=name_index)
+        players += len(created)
+        report('players', players, plan.players_total)
+    stats['players'] = {'rows': players, 'seconds': time.monotonic() - started}
+
+    started = time.monotonic()
+    with transaction.atomic():
+        season = start_season(start_date=start_date, days=days)
+    stats['season'] = {
+        'rows': season['matches'],
+        'seconds': time.monotonic() - started,
+        'number': season['season'].number,
+        'championships': len(season['championships']),
+    }
+    report('season', season['matches'], season['matches'])
+    return stats
@@ -10,6 +10,7 @@ from django.utils import timezone
 from django.views.decorators.http import require_GET, require_http_methods, require_POST
 
 from clubs.models import Club
+from core.pagination import CursorError, cursor_for, keyset_payload
 from players.models import Player
 from tournaments.models import Season
 from transfers.forms import TransferListingForm, TransferOfferForm
@@ -193,7 +194,6 @@ def _build_history_response(request: HttpRequest, history_qs: QuerySet) -> JsonR
     allowed = {"-transfer_date", "transfer_date"}
     if ordering not in allowed:
         ordering = "-transfer_date"
-    history_qs = history_qs.order_by(ordering, "id")
 
     try:
         page = max(int(request.GET.get("page", "1") or 1), 1)
@@ -206,18 +206,7 @@ def _build_history_response(request: HttpRequest, history_qs: QuerySet) -> JsonR
         page_size = 20
     page_size = max(1, min(page_size, 100))
 
-    page_obj, paginator = _paginate_queryset(history_qs, page, page_size)
-    results = [_serialize_history(entry) for entry in page_obj]
-
-    return JsonResponse(
-        {
-            "results": results,
-            "count": paginator.count,
-            "page": page_obj.number,
-            "page_size": page_size,
-            "total_pages": paginator.num_pages,
-        }
-    )
+    return _paginated_response(request, history_qs, (ordering, "id"), page, page_size, _serialize_history)
 
 
 def _parse_json_body(request: HttpRequest) -> Dict[str, Any]:
@@ -235,6 +224,32 @@ def _paginate_queryset(qs: QuerySet, page: int, page_size: int):
     return page_obj, paginator
 
 
+def _paginated_response(request: HttpRequest, qs: QuerySet, keys, page: int, page_size: int, serialize) -> JsonResponse:
+    """
+    Page of ``qs`` ordered by ``keys`` (ending with ``id``).  With a
+    ``cursor`` parameter (empty for the first page) it is a keyset page
+    without ``COUNT(*)``/``OFFSET``; otherwise a numbered page, which also
+    carries the ``next_cursor`` to switch over.
+    """
+    if "cursor" in request.GET:
+        try:
+            return JsonResponse(keyset_payload(request, qs, keys, page_size, serialize))
+        except CursorError as exc:
+            return JsonResponse({"detail": str(exc)}, status=400)
+
+    page_obj, paginator = _paginate_queryset(qs.order_by(*keys), page, page_size)
+    return JsonResponse(
+        {
+            "results": [serialize(entry) for entry in page_obj],
+            "count": paginator.count,
+            "page": page_obj.number,
+            "page_size": page_size,
+            "total_pages": paginator.num_pages,
+            "next_cursor": cursor_for(page_obj[-1], keys) if page_obj.has_next() else None,
+        }
+    )
+
+
 @require_http_methods(["GET", "POST"])
 def transfer_listings_list(request: HttpRequest) -> JsonResponse:
     if request.method == "POST":
@@ -290,10 +305,16 @@ def transfer_listings_list(request: HttpRequest) -> JsonResponse:
         listings = listings.filter(club_id=club_id)
 
     ordering = request.GET.get("ordering") or "expires_at"
-    allowed_ordering = {"expires_at", "-expires_at", "asking_price", "-asking_price"}
+    allowed_ordering = {
+        "expires_at": "expires_at",
+        "-expires_at": "-expires_at",
+        "asking_price": "asking_price",
+        "-asking_price": "-asking_price",
+        "overall_rating": "player__overall_rating",
+        "-overall_rating": "-player__overall_rating",
+    }
     if ordering not in allowed_ordering:
         ordering = "expires_at"
-    listings = listings.order_by(ordering)
 
     try:
         page = max(int(request.GET.get("page", "1") or 1), 1)
@@ -306,19 +327,14 @@ def transfer_listings_list(request: HttpRequest) -> JsonResponse:
         page_size = 30
     page_size = max(1, min(page_size, 100))
 
-    page_obj, paginator = _paginate_queryset(listings, page, page_size)
     user_club = _get_user_club(request.user)
-
-    results = [_listing_summary(listing, user_club) for listing in page_obj]
-
-    return JsonResponse(
-        {
-            "results": results,
-            "count": paginator.count,
-            "page": page_obj.number,
-            "page_size": page_size,
-            "total_pages": paginator.num_pages,
-        }
+    return _paginated_response(
+        request,
+        listings,
+        (allowed_ordering[ordering], "id"),
+        page,
+        page_size,
+        lambda listing: _listing_summary(listing, user_club),
     )
 
 
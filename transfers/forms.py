@@ -20,7 +20,7 @@ class TransferListingForm(forms.ModelForm):
         
         if self.club:
             # Ограничиваем выбор игроков только игроками данного клуба
-            self.fields['player'].queryset = Player.objects.filter(club=self.club)
+            self.fields['player'].queryset = Player.objects.filter(club=self.club).order_by(*Player.NAME_ORDERING)
             
             # Устанавливаем минимальную цену для каждого игрока
             self.fields['player'].widget.attrs.update({
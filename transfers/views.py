@@ -208,7 +208,7 @@ def club_transfers(request):
         club=user_club
     ).exclude(
         id__in=active_listings.values_list('player__id', flat=True)
-    )
+    ).order_by(*Player.NAME_ORDERING)
     
     # Получаем предложения по активным листингам клуба
     pending_offers = TransferOffer.objects.filter(